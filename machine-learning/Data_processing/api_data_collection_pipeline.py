@@ -14,6 +14,14 @@ Key Learning Outcomes:
 3. Pagination handling (critical for large datasets)
 4. Defensive programming for unreliable API responses
 5. Creating clean, ML-ready datasets
+6. Concurrent, rate-limited collection with asyncio
+7. Connection reuse through a shared, pooled HTTP session
+8. Resumable crawls backed by an on-disk page cache
+9. Streaming records to disk in typed batches
+10. Columnar extraction: each typed column built once over all pages
+11. Retries with backoff and adaptive rate limiting
+12. Raw-response archive and offline replay
+13. Per-stage latency / throughput metrics (JSON + Prometheus export)
 
 IMPORTANT:
 ----------
@@ -26,11 +34,27 @@ Use environment variables or config files instead.
 # 1. IMPORT LIBRARIES
 # =========================
 
+import sys
+import os
+
+# ========== PATH SETUP (MUST COME FIRST) ==========
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import asyncio
+import json
 import time
-import requests
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
 import numpy as np
 
+from Data_processing.crawl_metrics import CrawlMetrics, timed_get
+from Data_processing.http_session import connection_stats, get_session
+from Data_processing.page_cache import PageCache, cached_get
+from Data_processing.record_sinks import RecordSink
+from Data_processing.response_archive import ResponseArchive, canonical_url
+from Data_processing.rate_limiting import AdaptiveController, report_dead_letters
+
 
 # =========================
 # 2. GLOBAL CONFIGURATION
@@ -47,12 +71,37 @@ PARAMS = {
 
 REQUEST_DELAY = 0.3  # polite API usage
 
+MAX_IN_FLIGHT = 8  # concurrent requests in async mode
+
+CACHE_DIR = "cache/tmdb_pages"  # raw page checkpoints
+
+ARCHIVE_PATH = "archive/tmdb_top_rated"  # append-only raw response archive
+
+METRICS_PATH = "tmdb_crawl_metrics.json"
+
+# Output schema: field -> pandas dtype (missing fields default to NaN)
+MOVIE_SCHEMA = {
+    "id": "Int64",
+    "title": "string",
+    "overview": "string",
+    "release_date": "string",
+    "popularity": "float64",
+    "vote_average": "float64",
+    "vote_count": "Int64",
+}
+
 
 # =========================
 # 3. HELPER FUNCTION
 # =========================
 
-def fetch_page(page: int) -> dict:
+def fetch_page(
+    page: int,
+    base_url: str = BASE_URL,
+    cache: PageCache = None,
+    archive: ResponseArchive = None,
+    metrics: CrawlMetrics = None,
+) -> dict:
     """
     Fetches a single page of results from the TMDB API.
 
@@ -60,6 +109,14 @@ def fetch_page(page: int) -> dict:
     ----------
     page : int
         Page number to fetch
+    base_url : str
+        Endpoint to query (override to point at a local stub server)
+    cache : PageCache, optional
+        Checkpoint store; cached pages are served from disk
+    archive : ResponseArchive, optional
+        Every downloaded body is also appended to this archive
+    metrics : CrawlMetrics, optional
+        Receives ttfb / download / parse timings and status codes
 
     Returns
     -------
@@ -74,10 +131,33 @@ def fetch_page(page: int) -> dict:
     params = PARAMS.copy()
     params["page"] = page
 
-    response = requests.get(BASE_URL, params=params, timeout=10)
-    response.raise_for_status()
-
-    return response.json()
+    if cache is not None:
+        body = cached_get(
+            get_session(),
+            cache,
+            base_url,
+            params,
+            page,
+            archive=archive,
+            metrics=metrics,
+        )
+    else:
+        response = timed_get(
+            get_session(), base_url, metrics, params=params, timeout=10
+        )
+        response.raise_for_status()
+        body = response.content
+
+        if archive is not None:
+            archive.append(
+                canonical_url(base_url, params), body, meta={"page": page}
+            )
+
+    if metrics is None:
+        return json.loads(body)
+
+    with metrics.timer("parse"):
+        return json.loads(body)
 
 
 # =========================
@@ -99,22 +179,89 @@ def extract_movie_fields(movie: dict) -> dict:
         Cleaned movie features
     """
 
+    return {field: movie.get(field, np.nan) for field in MOVIE_SCHEMA}
+
+
+def _typed_column(values: list, dtype: str):
+    """
+    One schema column as a typed pandas array, built in a single call.
+
+    Numeric columns go through `pd.to_numeric` (JSON nulls / junk -> NaN),
+    everything else through `pd.array`.
+    """
+    if pd.api.types.pandas_dtype(dtype).kind in "iuf":
+        numeric = pd.to_numeric(pd.Series(values, dtype=object), errors="coerce")
+        return numeric.astype(dtype).array
+    return pd.array(values, dtype=dtype)
+
+
+def extract_movie_columns(movies: list, schema: dict = MOVIE_SCHEMA) -> dict:
+    """
+    Extracts all collected movies into typed columns.
+
+    Instead of one dict per movie (and the slow list-of-dicts DataFrame
+    constructor), every schema field is gathered into one list over all
+    movies and converted once. Missing fields become NA.
+
+    Parameters
+    ----------
+    movies : list
+        Raw movie JSON objects (the `results` of every page)
+    schema : dict
+        Field -> pandas dtype mapping
+
+    Returns
+    -------
+    dict
+        Field -> typed pandas array, all of length len(movies)
+    """
+
     return {
-        "id": movie.get("id", np.nan),
-        "title": movie.get("title", np.nan),
-        "overview": movie.get("overview", np.nan),
-        "release_date": movie.get("release_date", np.nan),
-        "popularity": movie.get("popularity", np.nan),
-        "vote_average": movie.get("vote_average", np.nan),
-        "vote_count": movie.get("vote_count", np.nan),
+        field: _typed_column([movie.get(field) for movie in movies], dtype)
+        for field, dtype in schema.items()
     }
 
 
+def movies_frame(result_pages: list, schema: dict = MOVIE_SCHEMA) -> pd.DataFrame:
+    """
+    Builds the typed movie DataFrame from the raw results of every page.
+
+    Columns are built once, at the end, over all pages; per-page array
+    building costs more than it saves on 20-row pages.
+
+    Parameters
+    ----------
+    result_pages : list
+        Each page's `results` list, in page order
+    schema : dict
+        Field -> pandas dtype mapping
+
+    Returns
+    -------
+    pd.DataFrame
+        Movie dataset with one column per schema field
+    """
+
+    movies = [movie for results in result_pages for movie in results]
+    return pd.DataFrame(extract_movie_columns(movies, schema))
+
+
 # =========================
 # 5. PAGINATION PIPELINE
 # =========================
 
-def collect_movies(start_page: int = 1, end_page: int = 5) -> pd.DataFrame:
+def collect_movies(
+    start_page: int = 1,
+    end_page: int = 5,
+    base_url: str = BASE_URL,
+    max_in_flight: int = None,
+    requests_per_second: float = None,
+    cache: PageCache = None,
+    sink: RecordSink = None,
+    controller: AdaptiveController = None,
+    archive: ResponseArchive = None,
+    metrics: CrawlMetrics = None,
+) -> pd.DataFrame:
     """
     Collects movie data across multiple API pages.
 
@@ -124,45 +271,336 @@ def collect_movies(start_page: int = 1, end_page: int = 5) -> pd.DataFrame:
         First page to fetch
     end_page : int
         Last page to fetch (inclusive)
+    base_url : str
+        Endpoint to query
+    max_in_flight : int, optional
+        If given, pages are fetched concurrently in async mode with at
+        most this many requests in flight (see `collect_movies_async`)
+    requests_per_second : float, optional
+        Rate limit for async mode (defaults to 1 / REQUEST_DELAY)
+    cache : PageCache, optional
+        Checkpoint store; pages already cached cost no network request,
+        so a crashed crawl resumes from the first missing page
+    sink : RecordSink, optional
+        If given, records are streamed to the sink page by page instead
+        of being accumulated in memory
+    controller : AdaptiveController, optional
+        Retry / rate controller; pages that exhaust their retries end up
+        in `controller.dead_letters` (one is created if not given)
+    archive : ResponseArchive, optional
+        Raw-response archive every downloaded page is appended to
+    metrics : CrawlMetrics, optional
+        Per-stage timings, bytes, status codes and throughput of the
+        crawl; export with `metrics.to_json()` / `metrics.to_prometheus()`
 
     Returns
     -------
-    pd.DataFrame
-        Consolidated movie dataset
+    pd.DataFrame or None
+        Consolidated movie dataset, typed by MOVIE_SCHEMA
+        (None when a sink is used)
     """
 
-    records = []
+    if cache is not None:
+        report_resume_point(cache, start_page, end_page, base_url)
+
+    if max_in_flight is not None:
+        return asyncio.run(
+            collect_movies_async(
+                start_page,
+                end_page,
+                base_url=base_url,
+                max_in_flight=max_in_flight,
+                requests_per_second=requests_per_second,
+                cache=cache,
+                sink=sink,
+                controller=controller,
+                archive=archive,
+                metrics=metrics,
+            )
+        )
+
+    if controller is None:
+        controller = AdaptiveController(rate=1 / REQUEST_DELAY)
+
+    result_pages = []
+    if metrics is not None:
+        metrics.attach(get_session())
 
     for page in range(start_page, end_page + 1):
         print(f"[INFO] Fetching page {page}")
-
-        try:
-            data = fetch_page(page)
-            results = data.get("results", [])
-        except Exception as e:
-            print(f"[ERROR] Page {page} failed: {e}")
+        from_disk = cache is not None and cache.is_fresh(base_url, PARAMS, page)
+
+        data = controller.call(
+            page,
+            fetch_page,
+            page,
+            base_url,
+            cache,
+            archive,
+            metrics,
+            paced=not from_disk,
+        )
+        if data is None:
             continue
 
-        for movie in results:
-            records.append(extract_movie_fields(movie))
+        emit_page(data.get("results", []), sink, result_pages, metrics)
+
+    report_dead_letters(controller)
+    if metrics is not None:
+        metrics.finish()
+
+    if sink is not None:
+        sink.flush()
+        return None
+
+    return movies_frame(result_pages)
+
+
+def emit_page(
+    results: list,
+    sink: RecordSink,
+    result_pages: list,
+    metrics: CrawlMetrics = None,
+) -> None:
+    """
+    Extracts one page of results into `sink` (records) or, without a
+    sink, keeps the raw results in `result_pages` for `movies_frame`.
+    """
+    start = time.perf_counter()
 
-        time.sleep(REQUEST_DELAY)
+    if sink is not None:
+        sink.write_many(extract_movie_fields(movie) for movie in results)
+    else:
+        result_pages.append(results)
 
-    return pd.DataFrame(records)
+    if metrics is not None:
+        metrics.observe("extract", time.perf_counter() - start)
+        metrics.record_page(len(results))
+
+
+def report_resume_point(
+    cache: PageCache,
+    start_page: int,
+    end_page: int,
+    base_url: str = BASE_URL,
+) -> int:
+    """
+    Logs and returns the first page of the range that is not cached yet.
+    """
+    pages = range(start_page, end_page + 1)
+    done = cache.first_missing([(base_url, PARAMS, page) for page in pages])
+
+    if done == len(pages):
+        print(f"[INFO] All {done} pages found in cache")
+    elif done > 0:
+        print(f"[INFO] Resuming from page {pages[done]} ({done} pages cached)")
+
+    return start_page + done
+
+
+# =========================
+# 6. ASYNC PAGINATION PIPELINE
+# =========================
+
+async def collect_movies_async(
+    start_page: int = 1,
+    end_page: int = 5,
+    base_url: str = BASE_URL,
+    max_in_flight: int = MAX_IN_FLIGHT,
+    requests_per_second: float = None,
+    cache: PageCache = None,
+    sink: RecordSink = None,
+    controller: AdaptiveController = None,
+    archive: ResponseArchive = None,
+    metrics: CrawlMetrics = None,
+) -> pd.DataFrame:
+    """
+    Collects movie data across multiple API pages concurrently.
+
+    A bounded pool of workers keeps up to `max_in_flight` requests on the
+    network at once, while a token bucket replaces the fixed sleep and
+    enforces the average request rate. The adaptive controller retries
+    failures, backs off on throttling and scales concurrency back up when
+    latency is healthy. Results are reassembled in page order, so the
+    output matches `collect_movies`.
+
+    Parameters
+    ----------
+    start_page : int
+        First page to fetch
+    end_page : int
+        Last page to fetch (inclusive)
+    base_url : str
+        Endpoint to query
+    max_in_flight : int
+        Maximum number of concurrent requests
+    requests_per_second : float, optional
+        Average request rate (defaults to 1 / REQUEST_DELAY)
+    cache : PageCache, optional
+        Checkpoint store; cached pages skip the rate limiter entirely
+    sink : RecordSink, optional
+        If given, records are streamed to the sink in page order as soon
+        as every earlier page has arrived
+    controller : AdaptiveController, optional
+        Retry / rate / concurrency controller (one is created from
+        `requests_per_second` and `max_in_flight` if not given)
+    archive : ResponseArchive, optional
+        Raw-response archive every downloaded page is appended to
+    metrics : CrawlMetrics, optional
+        Per-stage timings, bytes, status codes and throughput of the crawl
+
+    Returns
+    -------
+    pd.DataFrame or None
+        Consolidated movie dataset, typed by MOVIE_SCHEMA
+        (None when a sink is used)
+    """
+
+    if requests_per_second is None:
+        requests_per_second = 1 / REQUEST_DELAY
+
+    if controller is None:
+        controller = AdaptiveController(
+            rate=requests_per_second, max_concurrency=max_in_flight
+        )
+
+    result_pages = []
+    if metrics is not None:
+        metrics.attach(get_session())
+
+    # requests is blocking, so each fetch runs on a dedicated thread pool
+    # sized to the in-flight limit rather than the loop's shared default
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+
+        async def fetch_results(page: int) -> tuple:
+            print(f"[INFO] Fetching page {page}")
+            from_disk = cache is not None and cache.is_fresh(base_url, PARAMS, page)
+
+            data = await controller.call_async(
+                page,
+                fetch_page,
+                page,
+                base_url,
+                cache,
+                archive,
+                metrics,
+                executor=executor,
+                paced=not from_disk,
+            )
+            return page, None if data is None else data.get("results", [])
+
+        tasks = [
+            asyncio.ensure_future(fetch_results(page))
+            for page in range(start_page, end_page + 1)
+        ]
+
+        # pages finish out of order; hold each one back until every earlier
+        # page has been emitted so the output stays in page order
+        finished = {}
+        next_page = start_page
+
+        for task in asyncio.as_completed(tasks):
+            page, results = await task
+            finished[page] = results
+
+            while next_page in finished:
+                results = finished.pop(next_page)
+                if results is not None:
+                    emit_page(results, sink, result_pages, metrics)
+                next_page += 1
+
+    report_dead_letters(controller)
+    if metrics is not None:
+        metrics.finish()
+
+    if sink is not None:
+        sink.flush()
+        return None
+
+    return movies_frame(result_pages)
 
 
 # =========================
-# 6. MAIN EXECUTION
+# 7. OFFLINE REPLAY
+# =========================
+
+def replay_movies(
+    archive: ResponseArchive,
+    start_page: int = 1,
+    end_page: int = 5,
+    base_url: str = BASE_URL,
+    at: float = None,
+) -> pd.DataFrame:
+    """
+    Re-runs the extraction pipeline over archived pages, without network.
+
+    Parameters
+    ----------
+    archive : ResponseArchive
+        Archive written by a previous crawl
+    start_page : int
+        First page to replay
+    end_page : int
+        Last page to replay (inclusive)
+    base_url : str
+        Endpoint the pages were fetched from
+    at : float, optional
+        Replay the crawl as it was at this Unix time (default: newest)
+
+    Returns
+    -------
+    pd.DataFrame
+        Movie dataset, typed by MOVIE_SCHEMA
+    """
+
+    result_pages = []
+    missing = []
+
+    for page in range(start_page, end_page + 1):
+        url = canonical_url(base_url, dict(PARAMS, page=page))
+        body = archive.get(url, at)
+        if body is None:
+            missing.append(page)
+            continue
+        results = json.loads(body).get("results", [])
+        result_pages.append(results)
+
+    if missing:
+        print(f"[WARN] {len(missing)} page(s) not in archive: {missing}")
+
+    return movies_frame(result_pages)
+
+
+# =========================
+# 8. MAIN EXECUTION
 # =========================
 
 if __name__ == "__main__":
 
-    df = collect_movies(start_page=1, end_page=428)
+    cache = PageCache(CACHE_DIR, evict_after=7 * 24 * 3600)
+    cache.evict()
+
+    metrics = CrawlMetrics("tmdb_top_rated")
+
+    with ResponseArchive(ARCHIVE_PATH) as archive:
+        df = collect_movies(
+            start_page=1,
+            end_page=428,
+            max_in_flight=MAX_IN_FLIGHT,
+            cache=cache,
+            archive=archive,
+            metrics=metrics,
+        )
 
     print("\n[INFO] Dataset preview:")
     print(df.head())
 
     print("\n[INFO] Dataset shape:", df.shape)
+    print("[INFO] HTTP connections:", connection_stats())
+
+    metrics.to_json(METRICS_PATH)
+    print("\n[INFO] Crawl metrics (Prometheus format):")
+    print(metrics.to_prometheus())
 
     # Save dataset for ML workflows
     df.to_csv("movies_top_rated.csv", index=False)
@@ -0,0 +1,323 @@
+"""
+File: crawl_metrics.py
+Author: Khyati Sharma
+
+Purpose:
+--------
+Instrumentation for the collection pipelines.
+
+Without numbers we cannot tell whether `REQUEST_DELAY`, parsing or the
+server is the bottleneck of a crawl. `CrawlMetrics` collects:
+
+1. Per-stage latency histograms: dns, connect, ttfb, download, parse, extract
+2. Bytes transferred (as read from the wire)
+3. Responses and errors by HTTP status code / exception type
+4. Pages and records per second
+
+and exports them as JSON or Prometheus text at the end of a run.
+"""
+
+# =========================
+# 1. IMPORT LIBRARIES
+# =========================
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+
+# =========================
+# 2. GLOBAL CONFIGURATION
+# =========================
+
+STAGES = ("dns", "connect", "ttfb", "download", "parse", "extract")
+
+# Histogram bucket upper bounds in seconds (Prometheus-style)
+DEFAULT_BUCKETS = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+# =========================
+# 3. HISTOGRAM
+# =========================
+
+class Histogram:
+    """
+    Fixed-bucket latency histogram.
+
+    Parameters
+    ----------
+    buckets : tuple
+        Sorted bucket upper bounds in seconds; values above the last one
+        fall into the implicit +Inf bucket
+    """
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value: float) -> None:
+        i = 0
+        while i < len(self.buckets) and value > self.buckets[i]:
+            i += 1
+        self.counts[i] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Approximate quantile: upper bound of the bucket containing it."""
+        if self.count == 0:
+            return None
+        target = q * self.count
+        seen = 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= target:
+                return bound
+        return self.max
+
+    def cumulative(self) -> list:
+        """(upper_bound, cumulative_count) pairs, ending with +Inf."""
+        pairs = []
+        total = 0
+        for bound, n in zip(self.buckets + (float("inf"),), self.counts):
+            total += n
+            pairs.append((bound, total))
+        return pairs
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": {
+                ("+Inf" if bound == float("inf") else str(bound)): n
+                for bound, n in self.cumulative()
+            },
+        }
+
+
+# =========================
+# 4. CRAWL METRICS
+# =========================
+
+class CrawlMetrics:
+    """
+    Thread-safe metrics surface for one crawl.
+
+    Parameters
+    ----------
+    name : str
+        Crawl name, used as the `crawl` label in Prometheus output
+    buckets : tuple
+        Histogram bucket bounds shared by all stages
+    """
+
+    def __init__(self, name: str = "crawl", buckets: tuple = DEFAULT_BUCKETS):
+        self.name = name
+        self.stages = {stage: Histogram(buckets) for stage in STAGES}
+        self.statuses = {}
+        self.errors = {}
+        self.bytes = 0
+        self.pages = 0
+        self.records = 0
+        self.started = time.monotonic()
+        self.finished = None
+
+        self._buckets = buckets
+        self._lock = threading.Lock()
+        self._sessions = []
+
+    # ---------- recording ----------
+
+    def observe(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            if stage not in self.stages:
+                self.stages[stage] = Histogram(self._buckets)
+            self.stages[stage].observe(seconds)
+
+    @contextmanager
+    def timer(self, stage: str):
+        """Times the enclosed block into `stage`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def record_response(self, status: int, nbytes: int) -> None:
+        with self._lock:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            self.bytes += nbytes
+
+    def record_error(self, kind) -> None:
+        """Counts a failed request by status code or exception type name."""
+        with self._lock:
+            self.errors[kind] = self.errors.get(kind, 0) + 1
+
+    def record_page(self, n_records: int) -> None:
+        with self._lock:
+            self.pages += 1
+            self.records += n_records
+
+    def attach(self, session) -> None:
+        """
+        Receives DNS / connect timings from a session built by
+        `http_session.create_session`.
+        """
+        session.connection_stats.add_listener(self._on_connect)
+        self._sessions.append(session)
+
+    def _on_connect(self, dns_seconds: float, connect_seconds: float) -> None:
+        self.observe("dns", dns_seconds)
+        self.observe("connect", connect_seconds)
+
+    def finish(self) -> None:
+        """Stops the throughput clock and detaches from sessions."""
+        self.finished = time.monotonic()
+        for session in self._sessions:
+            session.connection_stats.remove_listener(self._on_connect)
+        self._sessions = []
+
+    # ---------- export ----------
+
+    @property
+    def elapsed(self) -> float:
+        end = self.finished if self.finished is not None else time.monotonic()
+        return max(end - self.started, 1e-9)
+
+    def error_rate(self) -> float:
+        """Share of requests that failed (status >= 400 or no response)."""
+        no_response = sum(
+            n for kind, n in self.errors.items() if not isinstance(kind, int)
+        )
+        failed = no_response + sum(
+            n for status, n in self.statuses.items() if status >= 400
+        )
+        total = no_response + sum(self.statuses.values())
+        return failed / total if total else 0.0
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "crawl": self.name,
+                "elapsed_seconds": round(self.elapsed, 3),
+                "pages": self.pages,
+                "records": self.records,
+                "pages_per_second": round(self.pages / self.elapsed, 3),
+                "records_per_second": round(self.records / self.elapsed, 3),
+                "bytes": self.bytes,
+                "responses_by_status": {str(k): v for k, v in self.statuses.items()},
+                "errors": {str(k): v for k, v in self.errors.items()},
+                "error_rate": round(self.error_rate(), 4),
+                "stages": {
+                    stage: hist.as_dict()
+                    for stage, hist in self.stages.items() if hist.count
+                },
+            }
+
+    def to_json(self, path: str = None) -> str:
+        """Returns the metrics as JSON, optionally also writing them to `path`."""
+        text = json.dumps(self.to_dict(), indent=2)
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+        return text
+
+    def to_prometheus(self) -> str:
+        """Returns the metrics in the Prometheus text exposition format."""
+        crawl = f'crawl="{self.name}"'
+        lines = [
+            "# HELP crawl_stage_seconds Per-page latency of each crawl stage.",
+            "# TYPE crawl_stage_seconds histogram",
+        ]
+
+        with self._lock:
+            for stage, hist in self.stages.items():
+                if not hist.count:
+                    continue
+                labels = f'{crawl},stage="{stage}"'
+                for bound, total in hist.cumulative():
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'crawl_stage_seconds_bucket{{{labels},le="{le}"}} {total}')
+                lines.append(f"crawl_stage_seconds_sum{{{labels}}} {hist.sum}")
+                lines.append(f"crawl_stage_seconds_count{{{labels}}} {hist.count}")
+
+            lines += [
+                "# HELP crawl_responses_total HTTP responses by status code.",
+                "# TYPE crawl_responses_total counter",
+            ]
+            for status, n in sorted(self.statuses.items()):
+                lines.append(f'crawl_responses_total{{{crawl},status="{status}"}} {n}')
+
+            lines += [
+                "# HELP crawl_errors_total Failed requests by status code or exception.",
+                "# TYPE crawl_errors_total counter",
+            ]
+            for kind, n in sorted(self.errors.items(), key=lambda item: str(item[0])):
+                lines.append(f'crawl_errors_total{{{crawl},kind="{kind}"}} {n}')
+
+            lines += [
+                "# TYPE crawl_bytes_total counter",
+                f"crawl_bytes_total{{{crawl}}} {self.bytes}",
+                "# TYPE crawl_pages_total counter",
+                f"crawl_pages_total{{{crawl}}} {self.pages}",
+                "# TYPE crawl_records_total counter",
+                f"crawl_records_total{{{crawl}}} {self.records}",
+                "# TYPE crawl_records_per_second gauge",
+                f"crawl_records_per_second{{{crawl}}} {self.records / self.elapsed:.3f}",
+                "# TYPE crawl_error_rate gauge",
+                f"crawl_error_rate{{{crawl}}} {self.error_rate():.4f}",
+            ]
+
+        return "\n".join(lines) + "\n"
+
+
+# =========================
+# 5. INSTRUMENTED GET
+# =========================
+
+def timed_get(session, url: str, metrics: CrawlMetrics = None, **kwargs):
+    """
+    `session.get` that records ttfb, download time, bytes and status codes.
+
+    The body is streamed so that time-to-first-byte (headers received,
+    `response.elapsed`) and download time are measured separately. The
+    returned response has its content fully read.
+    """
+    if metrics is None:
+        return session.get(url, **kwargs)
+
+    try:
+        response = session.get(url, stream=True, **kwargs)
+    except Exception as e:
+        metrics.record_error(type(e).__name__)
+        raise
+
+    metrics.observe("ttfb", response.elapsed.total_seconds())
+
+    with metrics.timer("download"):
+        content = response.content
+
+    # wire bytes (before gzip/brotli decoding) when urllib3 exposes them
+    raw_tell = getattr(response.raw, "tell", None)
+    wire_bytes = raw_tell() if callable(raw_tell) else 0
+    metrics.record_response(response.status_code, wire_bytes or len(content))
+
+    if response.status_code >= 400:
+        metrics.record_error(response.status_code)
+
+    return response
@@ -2,19 +2,88 @@
 File: csv_datahandling.py
 Purpose: Advanced CSV handling for real ML projects
 Author: Khyati Sharma
+
+Chunked mode (clean_csv_chunked) streams files larger than RAM: every
+step runs per chunk with explicit dtypes, duplicates are tracked across
+chunks by row digest, and output is appended chunk by chunk. It is not
+identical to main(); see its docstring.
 """
 
+import numpy as np
 import pandas as pd
 
 
+CHUNK_SIZE = 100_000        # rows per chunk in chunked mode
+OUTPUT_PATH = "cleaned_data.csv"
+
+
 # Load dataset
-def load_data(path):
-    """Load CSV file"""
-    df = pd.read_csv(path)
+def load_data(path, dtypes=None, chunksize=None):
+    """
+    Load CSV file
+
+    With chunksize, returns an iterator of DataFrame chunks instead
+    """
+    if chunksize:
+        return pd.read_csv(path, dtype=dtypes, chunksize=chunksize)
+
+    df = pd.read_csv(path, dtype=dtypes)
     print("\nDataset loaded successfully")
     return df
 
 
+def infer_dtypes(path, sample_rows=10_000):
+    """
+    Explicit dtypes from a sample of the file, so every chunk gets the
+    same types (nullable ints / booleans, since later rows may be empty)
+    """
+    sample = pd.read_csv(path, nrows=sample_rows)
+
+    dtypes = {}
+    for col, dtype in sample.dtypes.items():
+        if pd.api.types.is_bool_dtype(dtype):
+            dtypes[col] = "boolean"
+        elif pd.api.types.is_integer_dtype(dtype):
+            dtypes[col] = "Int64"
+        elif pd.api.types.is_float_dtype(dtype):
+            dtypes[col] = "float64"
+        else:
+            dtypes[col] = "string"
+    return dtypes
+
+
+def _parse_column(values, dtype):
+    """Text values -> dtype; raises ValueError / TypeError if they do not fit"""
+    if dtype == "boolean":
+        parsed = values.str.lower().map({"true": True, "false": False})
+        if parsed.isna().sum() != values.isna().sum():
+            raise ValueError("not a boolean column")
+        return parsed.astype("boolean")
+    return pd.to_numeric(values).astype(dtype)
+
+
+def cast_chunk(chunk, dtypes):
+    """
+    Casts a chunk read as text (dtype=str) to `dtypes`
+
+    A column whose values do not fit (e.g. "n/a" in an Int64 column after
+    the sampled rows) falls back to "string", the original text, and
+    `dtypes` is updated so later chunks keep it as text too
+    """
+    for col in chunk.columns:
+        dtype = dtypes.get(col, "string")
+        try:
+            if dtype == "string":
+                chunk[col] = chunk[col].astype("string")
+            else:
+                chunk[col] = _parse_column(chunk[col], dtype)
+        except (ValueError, TypeError):
+            print(f"\nColumn '{col}' does not fit {dtype}, kept as text from here on")
+            dtypes[col] = "string"
+            chunk[col] = chunk[col].astype("string")
+    return chunk
+
+
 # Basic exploration
 def explore_data(df):
     print("\nShape:", df.shape)
@@ -26,27 +95,59 @@ def explore_data(df):
 
 
 # Handle missing values
-def handle_missing(df):
+def handle_missing(df, text_only=False, verbose=True):
     """
     Fill or drop missing values
+
+    text_only=True fills only text columns, so numeric dtypes stay
+    numeric (needed when chunks must keep the same dtypes)
     """
-    print("\nMissing values before:")
-    print(df.isnull().sum())
+    if verbose:
+        print("\nMissing values before:")
+        print(df.isnull().sum())
+
+    if text_only:
+        text_cols = df.select_dtypes(include=["object", "string"]).columns
+        df = df.fillna({col: "Unknown" for col in text_cols})
+    else:
+        df = df.fillna("Unknown")   # simple strategy
 
-    df = df.fillna("Unknown")   # simple strategy
-    print("\nMissing values after:")
-    print(df.isnull().sum())
+    if verbose:
+        print("\nMissing values after:")
+        print(df.isnull().sum())
 
     return df
 
 
+def row_digests(df):
+    """64-bit hash of every row's values (index ignored)"""
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
 # Remove duplicates
-def remove_duplicates(df):
+def remove_duplicates(df, seen=None, verbose=True):
+    """
+    Drop duplicate rows
+
+    seen: running set of row digests shared across chunks; rows already
+    seen in an earlier chunk are dropped too, and new digests are added
+    """
     before = df.shape[0]
-    df = df.drop_duplicates()
+
+    if seen is None:
+        df = df.drop_duplicates()
+    else:
+        keep = np.zeros(before, dtype=bool)
+        for i, digest in enumerate(row_digests(df).tolist()):
+            if digest not in seen:
+                seen.add(digest)
+                keep[i] = True
+        df = df[keep]
+
     after = df.shape[0]
 
-    print(f"\nDuplicates removed: {before-after}")
+    if verbose:
+        print(f"\nDuplicates removed: {before-after}")
     return df
 
 
@@ -73,12 +174,64 @@ def create_feature(df):
 
 
 # Export cleaned data
-def save_clean_data(df):
-    df.to_csv("cleaned_data.csv", index=False)
-    print("\nCleaned dataset saved!")
+def save_clean_data(df, path=OUTPUT_PATH, append=False):
+    """
+    append=True adds rows to an existing file (no header), for chunks
+    """
+    df.to_csv(path, index=False, mode="a" if append else "w", header=not append)
+    if not append:
+        print("\nCleaned dataset saved!")
+
+
+# Chunked pipeline
+def clean_csv_chunked(path, output_path=OUTPUT_PATH, dtypes=None, chunksize=CHUNK_SIZE, text_columns=("skills",)):
+    """
+    Cleans a CSV one chunk at a time
+
+    Differs from main() in three ways:
+    - only text columns are filled with "Unknown"; missing numbers stay
+      missing, so every chunk keeps the same dtypes
+    - duplicates are removed before filling, so two rows that differ only
+      by a missing vs. "Unknown" text value are both kept
+    - dtypes come from the first rows of the file (infer_dtypes) unless
+      given; a column whose later values do not fit is kept as text from
+      that chunk on (see cast_chunk), and duplicates across that switch
+      are not detected
+
+    Peak memory depends on chunksize, not on the file size (plus the
+    running set of 64-bit row digests used to remove duplicates across
+    the whole file, one entry per distinct row).
+    """
+    dtypes = dict(dtypes) if dtypes else infer_dtypes(path)
+    seen = set()
+    rows_in = rows_out = 0
+
+    for i, chunk in enumerate(load_data(path, str, chunksize)):
+        rows_in += len(chunk)
+        chunk = cast_chunk(chunk, dtypes)
+
+        chunk = remove_duplicates(chunk, seen, verbose=False)
+        chunk = handle_missing(chunk, text_only=True, verbose=False)
+
+        for col in text_columns:
+            if col in chunk.columns:
+                chunk = clean_text_column(chunk, col)
+
+        chunk = create_feature(chunk)
+
+        save_clean_data(chunk, output_path, append=i > 0)
+        rows_out += len(chunk)
+
+    print(f"\nChunked cleaning done: {rows_in} rows in, {rows_out} rows out, "
+          f"{rows_in - rows_out} duplicates removed")
+    return rows_out
+
 
+def main(chunked=False):
+    if chunked:
+        clean_csv_chunked("jobs.csv")   # for files larger than memory
+        return
 
-def main():
     df = load_data("jobs.csv")   # replace with your real dataset
 
     explore_data(df)
@@ -0,0 +1,317 @@
+"""
+File: dataset_cache.py
+Author: Khyati Sharma
+
+Purpose:
+--------
+Shared dataset loader: parse each CSV once, then reload it from a typed
+columnar copy.
+
+Every training / EDA script calls `pd.read_csv` on the same few files
+in `Datasets/`, re-parsing text on every run. `read_csv_cached` parses a
+file once, stores the resulting DataFrame as an uncompressed Feather
+(Arrow IPC) file keyed by the source file's content hash, and serves
+later loads from that file instead of parsing text.
+
+Round trip:
+-----------
+- Column names (including the integer names of header=None) and the
+  index (index_col=...) are kept: both are recorded in the manifest and
+  restored after loading
+- Missing values in object (text) columns come back as NaN, as from
+  pd.read_csv
+- The Feather file is memory-mapped, which saves reading it into a
+  buffer first; building the DataFrame still copies the data once
+  (pandas gets ordinary, writable arrays)
+- Frames whose column / index names are not str / int / float / bool /
+  None (e.g. MultiIndex headers), or that Arrow cannot store (e.g. an
+  object column mixing ints and strings), are not cached: read_csv is
+  used
+
+Staleness check:
+----------------
+1. Size + modification time unchanged since the copy was built -> use it
+2. Otherwise the source is re-hashed; same hash -> use it (file touched)
+3. Different hash -> re-parse and replace the copy
+
+Without pyarrow the loader simply falls back to `pd.read_csv`.
+
+Readers not migrated:
+---------------------
+- eda/eda_movies_dataset.py expects an IMDB-style CSV (title_year,
+  budget, gross, ...) that is not in Datasets/
+"""
+
+# =========================
+# 1. IMPORT LIBRARIES
+# =========================
+
+import hashlib
+import json
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # caching is optional
+    pa = None
+    feather = None
+
+
+# =========================
+# 2. GLOBAL CONFIGURATION
+# =========================
+
+CACHE_DIRNAME = ".dataset_cache"  # created next to the source file
+HASH_BLOCK = 1 << 20               # bytes read per hashing step
+
+
+# =========================
+# 3. KEYS & MANIFEST
+# =========================
+
+def file_hash(path: str) -> str:
+    """SHA-256 of a file's contents, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _options_key(read_csv_kwargs: dict) -> str:
+    """Short hash of the read_csv options (different options, different copy)."""
+    text = json.dumps(read_csv_kwargs, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:8]
+
+
+def _cache_paths(path: str, options_key: str, cache_dir: str = None) -> tuple:
+    cache_dir = cache_dir or os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIRNAME)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    manifest = os.path.join(cache_dir, f"{stem}-{options_key}.json")
+    return cache_dir, stem, manifest
+
+
+def _read_manifest(manifest_path: str) -> dict:
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json_atomic(path: str, data: dict) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
+# =========================
+# 4. FRAME LAYOUT
+# =========================
+
+_NAME_TYPES = (str, int, float, bool, type(None))
+
+
+def _frame_layout(df: pd.DataFrame) -> dict:
+    """
+    Column names, index names and text columns of a frame, as JSON,
+    or None if a name cannot be stored
+    """
+    default_index = (
+        isinstance(df.index, pd.RangeIndex)
+        and df.index.start == 0
+        and df.index.step == 1
+        and df.index.name is None
+    )
+    index_names = [] if default_index else list(df.index.names)
+    columns = list(df.columns)
+
+    if isinstance(df.columns, pd.MultiIndex):
+        return None
+    if not all(isinstance(name, _NAME_TYPES) for name in columns + index_names):
+        return None
+
+    return {
+        "columns": columns,
+        "index_names": index_names,
+        "text_columns": [i for i, dtype in enumerate(df.dtypes) if dtype == object],
+    }
+
+
+def _to_storage(df: pd.DataFrame, layout: dict) -> pd.DataFrame:
+    """Index levels become leading columns; columns get positional names"""
+    if layout["index_names"]:
+        df = df.reset_index()
+    else:
+        df = df.reset_index(drop=True)
+    df.columns = [f"c{i}" for i in range(df.shape[1])]
+    return df
+
+
+def _from_storage(df: pd.DataFrame, layout: dict) -> pd.DataFrame:
+    """Inverse of _to_storage"""
+    n_index = len(layout["index_names"])
+
+    for i in layout["text_columns"]:
+        col = df.columns[n_index + i]
+        df[col] = df[col].where(df[col].notna(), np.nan)   # Arrow nulls -> NaN
+
+    if n_index:
+        df = df.set_index(list(df.columns[:n_index]))
+        df.index.names = layout["index_names"]
+    df.columns = layout["columns"]
+    return df
+
+
+# =========================
+# 5. CACHED LOADER
+# =========================
+
+def cached_copy(path: str, cache_dir: str = None, **read_csv_kwargs) -> tuple:
+    """
+    Path of an up-to-date Feather copy of a CSV, building it if needed.
+
+    Parameters
+    ----------
+    path : str
+        Source CSV file
+    cache_dir : str, optional
+        Where copies live (default: `.dataset_cache` next to the CSV)
+    **read_csv_kwargs
+        Passed to `pd.read_csv` when the copy is (re)built
+
+    Returns
+    -------
+    (str, dict)
+        Feather file path and frame layout (see _frame_layout), or
+        (None, None) if this frame cannot be cached
+    """
+    cache_file, layout, _ = _cached_copy(path, cache_dir, read_csv_kwargs)
+    return cache_file, layout
+
+
+def _cached_copy(path: str, cache_dir: str, read_csv_kwargs: dict) -> tuple:
+    """cached_copy that also returns the frame it parsed (None when the copy was up to date)"""
+    options_key = _options_key(read_csv_kwargs)
+    cache_dir, stem, manifest_path = _cache_paths(path, options_key, cache_dir)
+
+    stat = os.stat(path)
+    manifest = _read_manifest(manifest_path)
+
+    cache_ok = manifest is not None and "layout" in manifest and (   # no layout: older manifest
+        manifest["cache_file"] is None or os.path.exists(manifest["cache_file"])
+    )
+    if cache_ok:
+        if manifest["size"] == stat.st_size and manifest["mtime_ns"] == stat.st_mtime_ns:
+            return manifest["cache_file"], manifest["layout"], None
+
+        source_hash = file_hash(path)
+        if source_hash == manifest["source_hash"]:
+            manifest["mtime_ns"] = stat.st_mtime_ns
+            _write_json_atomic(manifest_path, manifest)
+            return manifest["cache_file"], manifest["layout"], None
+    else:
+        source_hash = file_hash(path)
+
+    # ---- (re)build ----
+    os.makedirs(cache_dir, exist_ok=True)
+    cache_file = os.path.join(cache_dir, f"{stem}-{options_key}-{source_hash[:16]}.feather")
+
+    df = pd.read_csv(path, **read_csv_kwargs)
+    layout = _frame_layout(df)
+    if layout is None:
+        # remembered in the manifest, so later loads go straight to read_csv
+        logging.warning(f"{path}: column / index names cannot be cached, using read_csv")
+        cache_file = None
+    else:
+        tmp = f"{cache_file}.tmp"
+        try:
+            feather.write_feather(_to_storage(df, layout), tmp, compression="uncompressed")  # uncompressed -> mappable
+            os.replace(tmp, cache_file)
+        except OSError as e:
+            logging.warning(f"{path}: cannot write cached copy ({e}), using read_csv")
+            return None, None, df
+        except (pa.ArrowException, ValueError) as e:
+            # e.g. an object column mixing ints and strings, or an index
+            # name clashing with a column; remembered in the manifest like
+            # an uncacheable layout
+            logging.warning(f"{path}: Arrow cannot store this frame ({e}), using read_csv")
+            cache_file, layout = None, None
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    if manifest is not None and manifest["cache_file"] not in (None, cache_file):
+        try:
+            os.remove(manifest["cache_file"])  # copy of an older version
+        except OSError:
+            pass
+
+    _write_json_atomic(manifest_path, {
+        "source": os.path.abspath(path),
+        "source_hash": source_hash,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "read_csv_kwargs": json.loads(json.dumps(read_csv_kwargs, default=str)),
+        "cache_file": cache_file,
+        "layout": layout,
+    })
+    return cache_file, layout, df
+
+
+def read_csv_cached(path: str, cache_dir: str = None, **read_csv_kwargs) -> pd.DataFrame:
+    """
+    Replacement for `pd.read_csv(path, **kwargs)` (see "Round trip" in
+    the module docstring for what is preserved).
+
+    The first call parses the CSV and stores a typed Feather copy; later
+    calls load that copy instead of parsing text. A change to the CSV
+    (new content hash) or to the read options triggers a rebuild.
+
+    Parameters
+    ----------
+    path : str
+        Source CSV file
+    cache_dir : str, optional
+        Where copies live (default: `.dataset_cache` next to the CSV)
+    **read_csv_kwargs
+        Options for `pd.read_csv` (part of the cache key)
+
+    Returns
+    -------
+    pd.DataFrame
+        Same data and dtypes as `pd.read_csv` would return
+    """
+    if feather is None:
+        return pd.read_csv(path, **read_csv_kwargs)
+
+    cache_file, layout, df = _cached_copy(path, cache_dir, read_csv_kwargs)
+    if df is not None:
+        return df   # just parsed while (re)building the copy
+    if cache_file is None:
+        return pd.read_csv(path, **read_csv_kwargs)
+
+    table = feather.read_table(cache_file, memory_map=True)
+    return _from_storage(table.to_pandas(), layout)
+
+
+def clear_cache(path: str, cache_dir: str = None) -> int:
+    """
+    Deletes every cached copy (and manifest) of a CSV; returns files removed.
+    """
+    cache_dir, stem, _ = _cache_paths(path, "", cache_dir)
+    if not os.path.isdir(cache_dir):
+        return 0
+
+    removed = 0
+    for name in os.listdir(cache_dir):
+        if name.startswith(f"{stem}-"):
+            os.remove(os.path.join(cache_dir, name))
+            removed += 1
+    return removed
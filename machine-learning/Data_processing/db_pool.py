@@ -0,0 +1,318 @@
+"""
+File: db_pool.py
+Author: Khyati Sharma
+
+Purpose:
+--------
+Reusable database connections for `sql_handling`.
+
+Opening a MySQL connection (TCP + auth + database selection) costs far
+more than a small query. Workers that serve many `fetch_filtered` calls
+should borrow an already open connection instead of reconnecting.
+
+Key Features:
+-------------
+1. DB settings from environment variables instead of hardcoded credentials
+2. Bounded, thread-safe connection pool with pre-ping validation
+3. Context-managed connections and cursors (always returned / closed)
+4. Batched-transaction mode: many CRUD calls share a single commit
+5. Lazily created, per-process shared pool (safe after fork)
+"""
+
+# =========================
+# 1. IMPORT LIBRARIES
+# =========================
+
+import logging
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+import mysql.connector
+
+
+# =========================
+# 2. GLOBAL CONFIGURATION
+# =========================
+
+DB_CONFIG = {
+    "host": os.environ.get("MYSQL_HOST", "localhost"),
+    "port": int(os.environ.get("MYSQL_PORT", "3306")),
+    "user": os.environ.get("MYSQL_USER", "root"),
+    "password": os.environ.get("MYSQL_PASSWORD", ""),
+    "database": os.environ.get("MYSQL_DATABASE", "abc"),
+    "auth_plugin": "mysql_native_password",
+}
+
+POOL_SIZE = int(os.environ.get("MYSQL_POOL_SIZE", "5"))
+POOL_TIMEOUT = 30  # seconds to wait for a free connection
+
+
+def connect(**overrides):
+    """
+    Opens one MySQL connection from DB_CONFIG (plus overrides)
+    """
+    return mysql.connector.connect(**{**DB_CONFIG, **overrides})
+
+
+# =========================
+# 3. CONNECTION HELPERS
+# =========================
+
+def raw_connection(conn):
+    """
+    The driver connection behind a transaction proxy (or `conn` itself)
+    """
+    return getattr(conn, "raw_connection", conn)
+
+
+def is_sqlite(conn) -> bool:
+    return isinstance(raw_connection(conn), sqlite3.Connection)
+
+
+def ping(conn) -> bool:
+    """
+    True if the connection still answers (pre-ping before reuse)
+    """
+    try:
+        if is_sqlite(conn):
+            conn.execute("SELECT 1")
+        else:
+            conn.ping(reconnect=False)
+        return True
+    except Exception:
+        return False
+
+
+@contextmanager
+def managed_cursor(conn, **kwargs):
+    """
+    Cursor that is closed when the block exits
+    """
+    cur = conn.cursor(**kwargs)
+    try:
+        yield cur
+    finally:
+        cur.close()
+
+
+# =========================
+# 4. BATCHED TRANSACTIONS
+# =========================
+
+class DeferredCommitConnection:
+    """
+    Connection proxy whose commit() is a no-op.
+
+    Functions that commit after every statement (update_record,
+    delete_record, bulk_insert, ...) can be called through it; the real
+    commit happens once, when `transaction` exits. Callbacks registered
+    with `on_finish` run after that commit, or after the rollback.
+    """
+
+    def __init__(self, conn):
+        self.raw_connection = conn
+        self.deferred_commits = 0
+        self._finish_callbacks = []
+
+    def commit(self):
+        self.deferred_commits += 1
+
+    def on_finish(self, callback):
+        """
+        Runs callback() once the transaction has committed or rolled back
+        """
+        self._finish_callbacks.append(callback)
+
+    def finish(self):
+        callbacks, self._finish_callbacks = self._finish_callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def __getattr__(self, name):
+        return getattr(self.raw_connection, name)
+
+
+@contextmanager
+def transaction(conn):
+    """
+    Batched-transaction mode: every commit inside the block is deferred
+    to a single commit at the end, or rolled back on error
+
+    Example:
+        with transaction(conn) as tx:
+            update_record(tx, "department", "HR", "Human Resources")
+            delete_record(tx, "salary < 20000")
+    """
+    tx = DeferredCommitConnection(conn)
+    try:
+        yield tx
+    except Exception:
+        conn.rollback()
+        raise
+    else:
+        conn.commit()
+        logging.info(f"Transaction committed ({tx.deferred_commits} statements batched)")
+    finally:
+        tx.finish()
+
+
+# =========================
+# 5. CONNECTION POOL
+# =========================
+
+class ConnectionPool:
+    """
+    Bounded pool of open connections.
+
+    Parameters
+    ----------
+    size : int
+        Maximum number of connections open at once
+    factory : callable
+        Opens a new connection (default: `connect`)
+    pre_ping : bool
+        Validate idle connections before handing them out; dead ones are
+        replaced transparently
+    timeout : float
+        Seconds to wait for a free connection before raising TimeoutError
+    """
+
+    def __init__(self, size=POOL_SIZE, factory=connect, pre_ping=True, timeout=POOL_TIMEOUT):
+        self.size = size
+        self.factory = factory
+        self.pre_ping = pre_ping
+        self.timeout = timeout
+
+        self._idle = queue.LifoQueue()  # most recently used first: warmest socket
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self.opened = 0
+        self.reused = 0
+        self.replaced = 0
+
+    def acquire(self):
+        """
+        Borrows a connection (waits while `size` are already in use)
+        """
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError(f"No free connection within {self.timeout}s")
+
+        try:
+            while True:
+                try:
+                    conn = self._idle.get_nowait()
+                except queue.Empty:
+                    break
+
+                if not self.pre_ping or ping(conn):
+                    with self._lock:
+                        self.reused += 1
+                    return conn
+
+                with self._lock:
+                    self.replaced += 1
+                self._close_quietly(conn)
+
+            conn = self.factory()
+            with self._lock:
+                self.opened += 1
+            return conn
+
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, conn):
+        """
+        Returns a connection; uncommitted work is rolled back
+        """
+        try:
+            if self._closed:
+                self._close_quietly(conn)
+                return
+            try:
+                conn.rollback()
+            except Exception:
+                self._close_quietly(conn)
+                return
+            self._idle.put(conn)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        """
+        Borrowed connection, returned to the pool when the block exits
+        """
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        """
+        Closes idle connections; borrowed ones are closed on release
+        """
+        self._closed = True
+        while True:
+            try:
+                self._close_quietly(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def stats(self):
+        return {
+            "size": self.size,
+            "idle": self._idle.qsize(),
+            "opened": self.opened,
+            "reused": self.reused,
+            "replaced": self.replaced,
+        }
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """
+    Process-wide shared pool, created on first use.
+
+    A forked worker gets a fresh pool instead of the parent's sockets.
+    """
+    global _pool, _pool_pid
+
+    if _pool is None or _pool_pid != os.getpid():
+        with _pool_lock:
+            if _pool is None or _pool_pid != os.getpid():
+                _pool = ConnectionPool()
+                _pool_pid = os.getpid()
+    return _pool
+
+
+def configure_pool(**kwargs):
+    """
+    Replaces the shared pool with `ConnectionPool(**kwargs)`
+    """
+    global _pool, _pool_pid
+
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.close()
+        _pool = ConnectionPool(**kwargs)
+        _pool_pid = os.getpid()
+    return _pool
@@ -0,0 +1,268 @@
+"""
+File: http_session.py
+Author: Khyati Sharma
+
+Purpose:
+--------
+Shared, connection-pooled HTTP session for the data collection pipelines.
+
+Calling the module-level `requests.get` opens a brand new TCP (and TLS)
+connection for every page. On large crawls that handshake is most of the
+per-page latency. A single `requests.Session` backed by a tuned
+`HTTPAdapter` keeps connections alive and reuses them across pages.
+
+Key Features:
+-------------
+1. Configurable pool size and per-host connection limit
+2. HTTP keep-alive plus TCP keep-alive on pooled sockets
+3. gzip / deflate (and brotli, when installed) negotiation
+4. Counters for connections opened vs. reused
+5. DNS / connect timings reported to listeners (e.g. CrawlMetrics)
+"""
+
+# =========================
+# 1. IMPORT LIBRARIES
+# =========================
+
+import socket
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+try:  # urllib3 only decodes brotli when one of these is installed
+    import brotli  # noqa: F401
+    BROTLI_AVAILABLE = True
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        BROTLI_AVAILABLE = True
+    except ImportError:
+        BROTLI_AVAILABLE = False
+
+
+# =========================
+# 2. GLOBAL CONFIGURATION
+# =========================
+
+POOL_CONNECTIONS = 10  # number of hosts to keep a pool for
+POOL_MAXSIZE = 10      # max open connections per host
+POOL_BLOCK = True      # wait for a free connection instead of exceeding the limit
+
+ACCEPT_ENCODING = "gzip, deflate, br" if BROTLI_AVAILABLE else "gzip, deflate"
+
+SOCKET_OPTIONS = HTTPConnection.default_socket_options + [
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
+
+
+# =========================
+# 3. CONNECTION COUNTERS
+# =========================
+
+class ConnectionStats:
+    """
+    Thread-safe counters for requests sent and connections opened.
+
+    Every request that did not need a new connection reused a pooled one,
+    so `reused = requests - opened`.
+
+    Listeners registered with `add_listener` are called as
+    `listener(dns_seconds, connect_seconds)` for every new connection.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.opened = 0
+        self.listeners = []
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def record_open(self) -> None:
+        with self._lock:
+            self.opened += 1
+
+    def record_connect(self, dns_seconds: float, connect_seconds: float) -> None:
+        for listener in list(self.listeners):
+            listener(dns_seconds, connect_seconds)
+
+    def add_listener(self, listener) -> None:
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener) -> None:
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    @property
+    def reused(self) -> int:
+        return max(self.requests - self.opened, 0)
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "connections_opened": self.opened,
+            "connections_reused": self.reused,
+        }
+
+
+def _timed_connection_class(base, stats: ConnectionStats):
+    """
+    Subclass of a urllib3 connection class that times DNS and connect.
+
+    DNS is timed with an explicit lookup right before connecting; the
+    connect time then covers TCP + TLS (the resolver answer is normally
+    cached by then).
+    """
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            socket.getaddrinfo(self.host, self.port, type=socket.SOCK_STREAM)
+        except OSError:
+            pass  # the real connect below raises the proper error
+        resolved = time.perf_counter()
+
+        base.connect(self)
+        stats.record_connect(resolved - start, time.perf_counter() - resolved)
+
+    return type(f"Timed{base.__name__}", (base,), {"connect": connect})
+
+
+def _counting_pool_classes(stats: ConnectionStats) -> dict:
+    """
+    Builds urllib3 pool classes that report every new connection (and
+    its DNS / connect timings) to `stats`.
+    """
+
+    def pool_class(name, base):
+        def _new_conn(self):
+            stats.record_open()
+            return base._new_conn(self)
+
+        return type(name, (base,), {
+            "_new_conn": _new_conn,
+            "ConnectionCls": _timed_connection_class(base.ConnectionCls, stats),
+        })
+
+    return {
+        "http": pool_class("CountingHTTPConnectionPool", HTTPConnectionPool),
+        "https": pool_class("CountingHTTPSConnectionPool", HTTPSConnectionPool),
+    }
+
+
+# =========================
+# 4. POOLED ADAPTER
+# =========================
+
+class PooledAdapter(HTTPAdapter):
+    """
+    HTTPAdapter with TCP keep-alive sockets and connection counters.
+    """
+
+    def __init__(self, stats: ConnectionStats, **kwargs):
+        self.stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        pool_kwargs.setdefault("socket_options", SOCKET_OPTIONS)
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+        self.poolmanager.pool_classes_by_scheme = _counting_pool_classes(self.stats)
+
+    def send(self, request, **kwargs):
+        self.stats.record_request()
+        return super().send(request, **kwargs)
+
+
+# =========================
+# 5. SESSION FACTORY
+# =========================
+
+def create_session(
+    pool_connections: int = POOL_CONNECTIONS,
+    pool_maxsize: int = POOL_MAXSIZE,
+    pool_block: bool = POOL_BLOCK,
+    headers: dict = None,
+) -> requests.Session:
+    """
+    Creates a keep-alive session with a bounded connection pool.
+
+    Parameters
+    ----------
+    pool_connections : int
+        Number of per-host pools to cache
+    pool_maxsize : int
+        Maximum connections kept open to a single host
+    pool_block : bool
+        If True, requests wait for a free connection rather than opening
+        more than `pool_maxsize` connections to one host
+    headers : dict, optional
+        Extra default headers for every request
+
+    Returns
+    -------
+    requests.Session
+        Session whose `connection_stats` attribute holds the counters
+    """
+
+    stats = ConnectionStats()
+    session = requests.Session()
+
+    adapter = PooledAdapter(
+        stats,
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=pool_block,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    session.headers.update({
+        "Accept-Encoding": ACCEPT_ENCODING,
+        "Connection": "keep-alive",
+    })
+    if headers:
+        session.headers.update(headers)
+
+    session.connection_stats = stats
+    return session
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    Returns the process-wide shared session, creating it on first use.
+    """
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+
+def configure_session(**kwargs) -> requests.Session:
+    """
+    Replaces the shared session with one built from `create_session(**kwargs)`.
+    """
+    global _session
+
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = create_session(**kwargs)
+    return _session
+
+
+def connection_stats() -> dict:
+    """Returns the shared session's opened/reused connection counters."""
+    return get_session().connection_stats.as_dict()
@@ -2,17 +2,69 @@
 File: json_handling.py
 Purpose: Production-style JSON preprocessing pipeline
 Author: Khyati Sharma
+
+Streaming mode (stream_json) reads JSON Lines / record arrays (plain or
+gzip) incrementally: records are decoded one at a time, projected to the
+requested fields and yielded as typed DataFrame chunks, so memory
+depends on the chunk size, not on the file size.
+
+Flattening (flatten_json / flatten_records) scatters decoded records
+straight into per-field column buffers following a schema: nested dicts
+become dotted columns, list fields become flat values + offsets, with no
+DataFrame -> dict round-trip.
 """
 
+import sys
+import os
+
+# ========== PATH SETUP (MUST COME FIRST) ==========
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import gzip
+import json
+import warnings
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import chain, islice
+
+import numpy as np
 import pandas as pd
 import logging
 
+from Data_processing.list_columns import ListColumn, extract_list_columns
+from feature_engineering.encoding import EncoderRegistry
+
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:  # pandas < 2.2
+    from pandas._libs.tslibs.parsing import guess_datetime_format
+
 logging.basicConfig(level=logging.INFO)
 
 
+CHUNK_SIZE = 10_000         # records per chunk in streaming mode
+BLOCK_SIZE = 1 << 20        # characters read from the file per step
+ENCODERS_PATH = "datasets/encoders.npz"
+SCHEMA_SAMPLE = 1_000       # records used to infer a flattening schema
+DATETIME_SAMPLE = 1_000     # values used to infer / check a datetime format
+DATETIME_MIN_MATCH = 0.99   # share of the sample a format must parse
+
+# column -> inferred datetime format (None = no single format fits)
+DATETIME_FORMATS = {}
+
+
 # ---------------- LOAD ----------------
-def load_json(file_path):
-    """Load JSON file safely"""
+def load_json(file_path, columns=None, dtypes=None, chunksize=None):
+    """
+    Load JSON file safely
+
+    With chunksize, returns an iterator of typed DataFrame chunks instead
+    (see stream_json)
+    """
+    if chunksize:
+        return stream_json(file_path, columns, dtypes, chunksize)
+
     try:
         df = pd.read_json(file_path)
         logging.info("JSON loaded successfully")
@@ -22,6 +74,176 @@ def load_json(file_path):
         return None
 
 
+# ---------------- STREAMING ----------------
+def open_json(file_path):
+    """Open a JSON file as text, gunzipping it if it is gzip-compressed"""
+    with open(file_path, "rb") as f:
+        compressed = f.read(2) == b"\x1f\x8b"
+
+    if compressed:
+        return gzip.open(file_path, "rt", encoding="utf-8")
+    return open(file_path, "r", encoding="utf-8")
+
+
+def iter_json_records(file_path, block_size=BLOCK_SIZE):
+    """
+    Yield the records of a JSON Lines file or of a top-level JSON array,
+    one at a time
+
+    The file is read in blocks and each record is decoded with
+    JSONDecoder.raw_decode as soon as it is complete, so only the current
+    block (plus one partial record) is held in memory
+    """
+    decoder = json.JSONDecoder()
+    in_array = None
+
+    with open_json(file_path) as f:
+        buf, pos, eof = "", 0, False
+
+        while True:
+            # skip whitespace and the commas between array items
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+
+            if pos == len(buf):
+                if eof:
+                    return
+                buf, pos = f.read(block_size), 0
+                eof = not buf
+                continue
+
+            if in_array is None:
+                in_array = buf[pos] == "["
+                if in_array:
+                    pos += 1
+                    continue
+
+            if in_array and buf[pos] == "]":
+                return
+
+            try:
+                record, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                # record continues in the next block
+                more = f.read(block_size)
+                eof = not more
+                buf, pos = buf[pos:] + more, 0
+                continue
+
+            yield record
+            pos = end
+
+
+def _chunk_dtype(series):
+    """dtype of a chunk column from the types of its values (None: no values)"""
+    values = series.dropna()
+    if len(values) == 0:
+        return None
+    if pd.api.types.is_bool_dtype(values):
+        return "boolean"
+    if pd.api.types.is_integer_dtype(values):
+        return "Int64"
+    if pd.api.types.is_float_dtype(values):
+        # ints with missing values arrive as float64
+        integral = (values % 1 == 0).all() and values.abs().max() < 2**53
+        return "Int64" if integral else "float64"
+    return _value_dtype(values.tolist())
+
+
+def infer_json_dtypes(df):
+    """
+    Explicit dtypes from a chunk (nullable ints / booleans, lists and
+    dicts and mixed types stay object); None for columns with no values
+    """
+    return {col: _chunk_dtype(df[col]) for col in df.columns}
+
+
+def _join_dtypes(current, chunk):
+    """
+    Narrowest dtype for values of both dtypes: Int64 + float64 ->
+    float64, any other mix -> object (values kept as they are)
+    """
+    if chunk is None or chunk == current:
+        return current
+    if {current, chunk} == {"Int64", "float64"}:
+        return "float64"
+    return "object"
+
+
+def widen_json_dtypes(df, dtypes):
+    """
+    Casts a chunk to the inferred `dtypes`, widening a column's dtype
+    when the types of this chunk's values do not match it (checked
+    before casting, so e.g. True never turns into 1 in an Int64 column
+    and "3" never into 3.0 in a float64 one; see _join_dtypes)
+
+    `dtypes` is updated in place, so later chunks start from the wider
+    type; earlier chunks keep the type they were yielded with
+    """
+    for col in df.columns:
+        current = dtypes.get(col)
+        chunk = _chunk_dtype(df[col])
+        dtype = chunk if current is None else _join_dtypes(current, chunk)
+        if dtype is None:
+            continue   # no values seen yet
+
+        if current is not None and dtype != current:
+            logging.warning(f"stream_json: column '{col}' widened from {current} to {dtype}")
+        df[col] = df[col].astype(dtype)
+        dtypes[col] = dtype
+    return df
+
+
+def stream_json(file_path, columns=None, dtypes=None, chunksize=CHUNK_SIZE):
+    """
+    Yield typed DataFrame chunks of a JSON Lines / record-array file
+
+    columns: fields to keep (missing ones become NA); other fields are
+    dropped record by record, before the chunk is built
+    dtypes: explicit column dtypes, applied to every chunk as given. If
+    None they are inferred from the first chunk and widened when a later
+    chunk's values do not match (see widen_json_dtypes), so a column's
+    dtype can change between chunks; pass dtypes to get the same dtypes
+    everywhere
+
+    A column-oriented document (pandas' default to_json) is a single
+    JSON value and cannot be streamed; write it with
+    orient="records", lines=True instead
+    """
+    batch = []
+    inferred = {} if dtypes is None else None
+
+    def build(batch):
+        nonlocal columns
+        if columns is None:
+            df = pd.DataFrame(batch)
+            columns = list(df.columns)
+        else:
+            df = pd.DataFrame.from_records(batch, columns=columns)
+
+        if inferred is not None:
+            return widen_json_dtypes(df, inferred)
+        return df.astype({c: t for c, t in dtypes.items() if c in df.columns})
+
+    for record in iter_json_records(file_path):
+        if not isinstance(record, dict):
+            raise ValueError(f"Expected JSON objects as records, got {type(record).__name__}")
+
+        if columns is None:
+            batch.append(record)
+        else:
+            batch.append(tuple(record.get(c) for c in columns))
+
+        if len(batch) >= chunksize:
+            yield build(batch)
+            batch = []
+
+    if batch:
+        yield build(batch)
+
+
 # ---------------- EDA ----------------
 def basic_eda(df):
     logging.info("Performing EDA")
@@ -34,13 +256,25 @@ def basic_eda(df):
 
 
 # ---------------- LIST HANDLING ----------------
-def handle_list_columns(df):
-    """Convert list columns to string"""
-    if "ingredients" in df.columns:
-        df["ingredients"] = df["ingredients"].apply(
-            lambda x: ", ".join(x) if isinstance(x, list) else x
-        )
-        logging.info("List columns processed")
+def handle_list_columns(df, sep=", "):
+    """
+    Convert every list column to a delimited string
+
+    Lists are stored as values + offsets (ListColumn) and joined
+    vectorized; use extract_list_columns(df) directly to keep the list
+    structure (lengths, explode, multi-hot) for models. A plain value in
+    a list column is treated as a one-element list; missing cells keep
+    their original value
+    """
+    lists = extract_list_columns(df)
+    for col, column in lists.items():
+        joined = column.join(sep).to_numpy()
+        missing = ~column.valid
+        joined[missing] = df[col].to_numpy()[missing]
+        df[col] = joined
+
+    if lists:
+        logging.info(f"List columns processed: {list(lists)}")
     return df
 
 
@@ -64,11 +298,20 @@ def memory_profile(df):
 
 
 # ---------------- CHUNK PROCESS ----------------
-def chunk_processing(df, size=10000):
+def chunk_processing(source, size=CHUNK_SIZE, columns=None):
+    """
+    source: a DataFrame, or a JSON file path to stream from disk
+    (only one chunk is in memory at a time)
+    """
     logging.info("Processing in chunks")
-    for i in range(0, len(df), size):
-        chunk = df.iloc[i:i + size]
-        print(f"Chunk {i//size + 1} -> {chunk.shape}")
+
+    if isinstance(source, pd.DataFrame):
+        chunks = (source.iloc[i:i + size] for i in range(0, len(source), size))
+    else:
+        chunks = stream_json(source, columns, chunksize=size)
+
+    for i, chunk in enumerate(chunks):
+        print(f"Chunk {i + 1} -> {chunk.shape}")
 
 
 # ---------------- COMPRESSION ----------------
@@ -81,33 +324,336 @@ def compress_json(df, output_file):
 
 
 # ---------------- ENCODING ----------------
-def encode_categorical(df):
-    """Encode categorical columns"""
-    encoders = {}
+def encode_categorical(df, encoders=None):
+    """
+    Encode categorical columns
 
-    for col in df.select_dtypes(include="object").columns:
-        df[col] = df[col].astype("category")
-        encoders[col] = dict(enumerate(df[col].cat.categories))
-        df[col] = df[col].cat.codes
+    encoders: an EncoderRegistry fitted earlier (e.g. loaded with
+    EncoderRegistry.load at serving time); columns it already knows keep
+    their mapping, unseen values get the reserved code -1. Codes use the
+    smallest int dtype that fits (int8 / int16 / ...)
+    """
+    encoders = encoders or EncoderRegistry()
+    columns = df.select_dtypes(include=["object", "string"]).columns
+
+    encoders.fit(df, columns)
+    df = encoders.transform(df, columns)
 
     logging.info("Categorical encoding completed")
     return df, encoders
 
 
+# ---------------- FLATTEN ----------------
+_EMPTY = {}
+
+
+def _value_dtype(values):
+    """dtype for a field from its Python values (None = missing)"""
+    types = {type(v) for v in values if v is not None}
+    if not types:
+        return "object"
+    if types == {bool}:
+        return "boolean"
+    if types == {int}:
+        return "Int64"
+    if types <= {int, float}:
+        return "float64"
+    if types == {str}:
+        return "string"
+    return "object"
+
+
+def infer_flat_schema(records):
+    """
+    Flat schema {dotted path: dtype} from sample records
+
+    Nested dicts become dotted paths (as in pd.json_normalize); fields
+    holding lists get a "list[<element dtype>]" dtype
+    """
+    seen = {}
+
+    def walk(obj, prefix):
+        for key, value in obj.items():
+            if isinstance(value, dict):
+                walk(value, f"{prefix}{key}.")
+            else:
+                seen.setdefault(f"{prefix}{key}", []).append(value)
+
+    for record in records:
+        walk(record, "")
+
+    # a field that is null in some records and a dict in others is nested
+    parents = {path.rsplit(".", i)[0] for path in seen for i in range(1, path.count(".") + 1)}
+
+    schema = {}
+    for path, values in seen.items():
+        if path in parents and all(v is None for v in values):
+            continue
+
+        lists = [v for v in values if isinstance(v, list)]
+        if lists and len(lists) == sum(v is not None for v in values):
+            schema[path] = f"list[{_value_dtype(chain.from_iterable(lists))}]"
+        else:
+            schema[path] = _value_dtype(values)
+    return schema
+
+
+def _compile_schema(schema):
+    """Nested {key: subtree or field index} tree mirroring the records"""
+    tree = {}
+    for i, path in enumerate(schema):
+        *parents, leaf = path.split(".")
+        node = tree
+        for key in parents:
+            node = node.setdefault(key, {})
+            if not isinstance(node, dict):
+                raise ValueError(f"Schema field '{path}' is nested under a scalar field")
+        if leaf in node:
+            raise ValueError(f"Schema field '{path}' is both a scalar and a nested field")
+        node[leaf] = i
+    return tree
+
+
+def _typed_array(values, dtype):
+    if dtype == "float64":
+        return np.array(values, dtype="float64")   # None -> NaN
+    if dtype == "object":
+        return pd.Series(values, dtype="object").to_numpy()
+    return pd.array(values, dtype=dtype)
+
+
+class FlatTable:
+    """
+    Columnar result of flattening: scalar fields as typed arrays, list
+    fields as ListColumn (flat values + offsets)
+    """
+
+    def __init__(self, schema, columns, lists, rows):
+        self.schema = schema
+        self.columns = columns
+        self.lists = lists
+        self.rows = rows
+
+    def to_frame(self, lists=True):
+        """DataFrame in schema order; list fields as list cells (or left out)"""
+        data = {}
+        for name in self.schema:
+            if name in self.columns:
+                data[name] = self.columns[name]
+            elif lists:
+                data[name] = self.lists[name].to_lists()
+        return pd.DataFrame(data, index=pd.RangeIndex(self.rows))
+
+
+def flatten_records(records, schema=None, sample_size=SCHEMA_SAMPLE):
+    """
+    Flatten an iterable of (nested) dict records into a FlatTable
+
+    schema: {dotted path: dtype}, list fields as "list[<dtype>]";
+    inferred from the first sample_size records if None. Fields outside
+    the schema are ignored, missing ones become NA (missing cells of a
+    ListColumn); a plain value in a list field is a one-element list
+    """
+    records = iter(records)
+    if schema is None:
+        head = list(islice(records, sample_size))
+        schema = infer_flat_schema(head)
+        records = chain(head, records)
+
+    tree = _compile_schema(schema)
+    dtypes = list(schema.values())
+    buffers = [[] for _ in dtypes]
+    offsets = {i: array("q", [0]) for i, t in enumerate(dtypes) if t.startswith("list[")}
+    valid = {i: bytearray() for i in offsets}
+
+    def scatter(node, obj):
+        for key, sub in node.items():
+            value = obj.get(key)
+            if type(sub) is dict:
+                scatter(sub, value if isinstance(value, dict) else _EMPTY)
+            elif sub in offsets:
+                buf = buffers[sub]
+                if isinstance(value, list):
+                    buf.extend(value)
+                elif value is not None:
+                    buf.append(value)
+                valid[sub].append(value is not None)
+                offsets[sub].append(len(buf))
+            else:
+                buffers[sub].append(value)
+
+    rows = 0
+    for record in records:
+        scatter(tree, record)
+        rows += 1
+
+    columns, lists = {}, {}
+    for i, (name, dtype) in enumerate(schema.items()):
+        if i in offsets:
+            values = _typed_array(buffers[i], dtype[len("list["):-1])
+            lists[name] = ListColumn(
+                values,
+                np.frombuffer(offsets[i], dtype=np.int64),
+                name,
+                np.frombuffer(valid[i], dtype=bool),
+            )
+        else:
+            columns[name] = _typed_array(buffers[i], dtype)
+        buffers[i] = None   # release the Python objects as we go
+
+    return FlatTable(schema, columns, lists, rows)
+
+
+def flatten_json(file_path, schema=None, sample_size=SCHEMA_SAMPLE):
+    """Flatten a JSON Lines / record-array file (see flatten_records)"""
+    return flatten_records(iter_json_records(file_path), schema, sample_size)
+
+
+def _missing(value):
+    """True for None / NaN / NA cells (containers are never missing)"""
+    return not isinstance(value, (dict, list, tuple, np.ndarray)) and pd.isna(value)
+
+
+def flatten_frame(df):
+    """
+    Flatten the dict / list columns of a DataFrame one column at a time;
+    other columns are kept as they are
+
+    As in pd.json_normalize, scalar cells of a dict column are kept in a
+    column named after it; scalar cells of a list column become
+    one-element lists
+    """
+    schema, columns, lists = {}, {}, {}
+
+    for col in df.columns:
+        sample = df[col].dropna()
+        if len(sample) == 0 or not isinstance(sample.iloc[0], (dict, list)):
+            schema[col] = str(df[col].dtype)
+            columns[col] = df[col].to_numpy()
+            continue
+
+        cells = [None if _missing(v) else v for v in df[col].tolist()]
+
+        if isinstance(sample.iloc[0], list):
+            elements = chain.from_iterable(
+                v if isinstance(v, list) else (v,) for v in cells if v is not None
+            )
+            flat = flatten_records(({col: v} for v in cells), {col: f"list[{_value_dtype(elements)}]"})
+        else:
+            scalars = [None if isinstance(v, dict) else v for v in cells]
+            if any(v is not None for v in scalars):
+                schema[col] = _value_dtype(scalars)
+                columns[col] = _typed_array(scalars, schema[col])
+            # every cell is in memory already: infer dict keys from all of them
+            flat = flatten_records(
+                ({col: v if isinstance(v, dict) else None} for v in cells), sample_size=len(cells)
+            )
+        schema.update(flat.schema)
+        columns.update(flat.columns)
+        lists.update(flat.lists)
+
+    return FlatTable(schema, columns, lists, len(df))
+
+
 # ---------------- NORMALIZE ----------------
 def normalize_nested_json(df, output_file):
-    nested_df = pd.json_normalize(df.to_dict("records"))
+    """
+    Flatten nested dict columns to dotted columns and save as JSON Lines
+
+    Works column by column (flatten_frame) instead of converting every
+    row to a dict for pd.json_normalize
+    """
+    nested_df = flatten_frame(df).to_frame()
     nested_df.to_json(output_file, orient="records", lines=True)
     logging.info("Nested JSON flattened & saved")
     return nested_df
 
 
 # ---------------- DATETIME ----------------
-def convert_datetime(df, cols):
-    for col in cols:
-        if col in df.columns:
-            df[col] = pd.to_datetime(df[col], errors="coerce")
-    logging.info("Datetime conversion done")
+def _format_match(sample, fmt):
+    """Share of sample values that parse with fmt"""
+    parsed = pd.to_datetime(sample, format=fmt, errors="coerce")
+    return parsed.notna().mean()
+
+
+def infer_datetime_format(series, sample_size=DATETIME_SAMPLE):
+    """
+    Single strftime format for a column of date strings, or None
+
+    Formats are guessed for a few sampled values (month-first and
+    day-first), and the one that parses the largest share of the sample
+    wins if it reaches DATETIME_MIN_MATCH
+    """
+    sample = series.dropna()
+    sample = sample.sample(min(sample_size, len(sample)), random_state=0).astype(str)
+    if sample.empty:
+        return None
+
+    guesses = Counter()
+    with warnings.catch_warnings():
+        # trying both orders makes pandas warn that a guessed format
+        # ignores dayfirst; the formats are checked against the sample below
+        warnings.simplefilter("ignore", UserWarning)
+        for value in sample.iloc[:20]:
+            for dayfirst in (False, True):
+                fmt = guess_datetime_format(value, dayfirst=dayfirst)
+                if fmt:
+                    guesses[fmt] += 1
+
+    best, best_match = None, 0.0
+    for fmt, _ in guesses.most_common():
+        match = _format_match(sample, fmt)
+        if match > best_match:
+            best, best_match = fmt, match
+
+    return best if best_match >= DATETIME_MIN_MATCH else None
+
+
+def cached_datetime_format(series, col):
+    """
+    Format for a column from DATETIME_FORMATS, inferring it on first use
+    (or again when the cached one stops matching the data)
+    """
+    if col in DATETIME_FORMATS:
+        fmt = DATETIME_FORMATS[col]
+        sample = series.dropna().iloc[:DATETIME_SAMPLE].astype(str)
+        if fmt is None or sample.empty or _format_match(sample, fmt) >= DATETIME_MIN_MATCH:
+            return fmt
+
+    DATETIME_FORMATS[col] = infer_datetime_format(series)
+    return DATETIME_FORMATS[col]
+
+
+def parse_datetime(values, fmt):
+    """Parse one column with a fixed format (None = pandas' own inference)"""
+    if fmt is None:
+        return pd.to_datetime(values, errors="coerce")
+    return pd.to_datetime(values, format=fmt, errors="coerce")
+
+
+def convert_datetime(df, cols, workers=None, executor="thread"):
+    """
+    Parse date columns with a cached format per column
+
+    Independent columns are parsed concurrently: executor="thread"
+    (no copies) or "process" (columns are sent to worker processes,
+    worth it for very large columns); workers=1 parses sequentially
+    """
+    cols = [col for col in cols if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col])]
+    formats = {col: cached_datetime_format(df[col], col) for col in cols}
+
+    if workers == 1 or len(cols) <= 1:
+        parsed = {col: parse_datetime(df[col], formats[col]) for col in cols}
+    else:
+        pool_cls = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+        with pool_cls(max_workers=workers or len(cols)) as pool:
+            futures = {col: pool.submit(parse_datetime, df[col], formats[col]) for col in cols}
+            parsed = {col: future.result() for col, future in futures.items()}
+
+    for col, values in parsed.items():
+        df[col] = values
+
+    logging.info(f"Datetime conversion done: {formats}")
     return df
 
 
@@ -131,9 +677,13 @@ def main():
 
     chunk_processing(df)
 
+    # streaming alternative for JSON Lines files larger than memory
+    # chunk_processing("datasets/train_nested.json", columns=["id", "cuisine"])
+
     compress_json(df, "datasets/train_compressed.json")
 
     df, encoders = encode_categorical(df)
+    encoders.save(ENCODERS_PATH)    # reuse at inference: EncoderRegistry.load(ENCODERS_PATH)
 
     nested_df = normalize_nested_json(df, "datasets/train_nested.json")
 
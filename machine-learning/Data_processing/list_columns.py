@@ -0,0 +1,260 @@
+"""
+File: list_columns.py
+Author: Khyati Sharma
+
+Purpose:
+--------
+Columnar storage and vectorized operations for list-valued features
+(e.g. the `ingredients` of a recipe).
+
+A list column is kept Arrow-style as one flat `values` array plus an
+int64 `offsets` array of length n_rows + 1: row i is
+values[offsets[i]:offsets[i + 1]]. A boolean `valid` mask marks missing
+cells (None / NaN), which are kept apart from empty lists. Every
+operation works on these arrays with numpy / pandas (or pyarrow compute
+when installed) instead of calling Python code once per row.
+
+Key Features:
+-------------
+1. Build from list cells (one pass) or from delimited strings
+2. Lengths, explode (row id + value), join back to delimited strings
+3. Multi-hot encoding, dense or sparse CSR (offsets are the CSR indptr)
+4. Works for any list-typed DataFrame column
+"""
+
+# =========================
+# 1. IMPORT LIBRARIES
+# =========================
+
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # pyarrow only speeds up join()
+    pa = None
+    pc = None
+
+
+# =========================
+# 2. LIST COLUMN
+# =========================
+
+class ListColumn:
+    """
+    A column of lists stored as flat values + offsets.
+
+    Parameters
+    ----------
+    values : array-like
+        All list elements, row after row
+    offsets : array-like of int
+        n_rows + 1 positions into `values`, starting at 0
+    name : str, optional
+        Column name used by to_series / explode
+    valid : array-like of bool, optional
+        False for missing cells (default: every cell present); a missing
+        cell has no values
+    """
+
+    def __init__(self, values, offsets, name: str = None, valid=None):
+        self.values = values
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.name = name
+
+        if self.offsets.ndim != 1 or len(self.offsets) == 0 or self.offsets[0] != 0:
+            raise ValueError("offsets must be a 1-D array starting at 0")
+        if self.offsets[-1] != len(values):
+            raise ValueError(f"offsets end at {self.offsets[-1]}, but there are {len(values)} values")
+
+        if valid is None:
+            valid = np.ones(len(self.offsets) - 1, dtype=bool)
+        self.valid = np.asarray(valid, dtype=bool)
+        if len(self.valid) != len(self.offsets) - 1:
+            raise ValueError("valid must have one entry per row")
+
+    # ---------- construction ----------
+
+    @classmethod
+    def from_lists(cls, cells, name: str = None) -> "ListColumn":
+        """
+        Builds a list column from list cells
+
+        None / NaN cells are marked missing (valid=False); any other
+        non-list value becomes a one-element list
+        """
+        lists, valid = [], []
+        for cell in cells:
+            if isinstance(cell, (list, tuple, np.ndarray)):
+                lists.append(cell)
+                valid.append(True)
+            elif pd.isna(cell):
+                lists.append(())
+                valid.append(False)
+            else:
+                lists.append((cell,))
+                valid.append(True)
+
+        lengths = np.fromiter(map(len, lists), dtype=np.int64, count=len(lists))
+        offsets = np.zeros(len(lists) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+
+        flat = list(chain.from_iterable(lists))
+        values = pd.Series(flat, dtype=None if flat else object).to_numpy()
+        return cls(values, offsets, name, np.array(valid, dtype=bool))
+
+    @classmethod
+    def from_strings(cls, series: pd.Series, sep: str = ", ") -> "ListColumn":
+        """
+        Builds a list column from delimited strings ("salt, water, ...")
+        """
+        return cls.from_lists(series.str.split(sep, regex=False), series.name)
+
+    # ---------- basic properties ----------
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int):
+        return self.values[self.offsets[i]:self.offsets[i + 1]]
+
+    @property
+    def nbytes(self) -> int:
+        values = self.values.nbytes if hasattr(self.values, "nbytes") else 0
+        return int(values + self.offsets.nbytes)
+
+    def lengths(self) -> np.ndarray:
+        """Number of elements in every row"""
+        return np.diff(self.offsets)
+
+    def row_ids(self) -> np.ndarray:
+        """Row number of every element in `values`"""
+        return np.repeat(np.arange(len(self)), self.lengths())
+
+    def with_values(self, values) -> "ListColumn":
+        """
+        Same row structure with transformed values, e.g.
+        col.with_values(pd.Series(col.values).str.lower().to_numpy())
+        """
+        return ListColumn(values, self.offsets, self.name, self.valid)
+
+    # ---------- conversions ----------
+
+    def explode(self, index=None) -> pd.Series:
+        """
+        One entry per element, indexed by its row (or by `index[row]`);
+        unlike Series.explode, empty lists and missing cells produce no entry
+        """
+        rows = self.row_ids()
+        if index is not None:
+            rows = np.asarray(index)[rows]
+        return pd.Series(self.values, index=rows, name=self.name)
+
+    def join(self, sep: str = ", ") -> pd.Series:
+        """
+        Delimited string per row (empty string for empty lists, None for
+        missing cells)
+        """
+        n = len(self)
+
+        if pa is not None:
+            values = pa.array(self.values).cast(pa.string())
+            lists = pa.LargeListArray.from_arrays(pa.array(self.offsets), values)
+            out = pc.binary_join(lists, sep).to_numpy(zero_copy_only=False).astype(object)
+        else:
+            # numpy fallback: concatenate "value + sep" per row with one
+            # reduceat (no per-row Python calls), then strip the trailing sep
+            out = np.full(n, "", dtype=object)
+            non_empty = self.lengths() > 0
+            if non_empty.any():
+                pieces = pd.Series(self.values).astype(str).to_numpy(dtype=object) + sep
+                joined = np.add.reduceat(pieces, self.offsets[:-1][non_empty])
+                out[non_empty] = pd.Series(joined).str.slice(0, -len(sep) or None).to_numpy()
+
+        out[~self.valid] = None
+        return pd.Series(out, name=self.name)
+
+    def to_lists(self) -> list:
+        """Python list per row, None for missing cells (for export / display)"""
+        values = np.asarray(self.values, dtype=object)
+        return [
+            values[a:b].tolist() if ok else None
+            for a, b, ok in zip(self.offsets[:-1], self.offsets[1:], self.valid)
+        ]
+
+    def to_series(self, index=None) -> pd.Series:
+        """Object Series of Python lists, like the original column"""
+        return pd.Series(self.to_lists(), index=index, name=self.name, dtype=object)
+
+    # ---------- encoding ----------
+
+    def multi_hot(self, vocabulary=None, sparse: bool = False, dtype=np.uint8):
+        """
+        Multi-hot matrix: one row per list, one column per vocabulary term
+        (missing cells give all-zero rows)
+
+        Parameters
+        ----------
+        vocabulary : array-like, optional
+            Terms to encode (column order); default: sorted unique values.
+            Values outside the vocabulary are ignored
+        sparse : bool
+            Return a scipy CSR matrix instead of a dense numpy array
+        dtype : numpy dtype
+            Matrix dtype
+
+        Returns
+        -------
+        (matrix, vocabulary)
+        """
+        if vocabulary is None:
+            codes, vocabulary = pd.factorize(self.values, sort=True)
+        else:
+            vocabulary = pd.Index(vocabulary)
+            codes = vocabulary.get_indexer(self.values)
+        vocabulary = np.asarray(vocabulary)
+
+        rows = self.row_ids()
+        known = codes >= 0
+        rows, codes = rows[known], codes[known]
+
+        if sparse:
+            from scipy.sparse import csr_matrix
+
+            indptr = np.zeros(len(self) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(rows, minlength=len(self)), out=indptr[1:])
+            matrix = csr_matrix((np.ones(len(codes), dtype=dtype), codes, indptr),
+                                shape=(len(self), len(vocabulary)))
+            matrix.sum_duplicates()
+            matrix.data[:] = 1      # repeated terms in a row count once
+            return matrix, vocabulary
+
+        matrix = np.zeros((len(self), len(vocabulary)), dtype=dtype)
+        matrix[rows, codes] = 1
+        return matrix, vocabulary
+
+
+# =========================
+# 3. DATAFRAME HELPERS
+# =========================
+
+def is_list_column(series: pd.Series) -> bool:
+    """True if the first non-null value of an object column is a list"""
+    if series.dtype != object:
+        return False
+    sample = series.dropna()
+    return len(sample) > 0 and isinstance(sample.iloc[0], (list, tuple, np.ndarray))
+
+
+def extract_list_columns(df: pd.DataFrame) -> dict:
+    """
+    {column: ListColumn} for every list-valued column of a DataFrame
+    """
+    return {
+        col: ListColumn.from_lists(df[col].tolist(), name=col)
+        for col in df.columns
+        if is_list_column(df[col])
+    }
@@ -0,0 +1,344 @@
+"""
+File: page_cache.py
+Author: Khyati Sharma
+
+Purpose:
+--------
+On-disk checkpoint store for paginated crawls.
+
+Both collection pipelines keep records in memory until the very end, so
+a crash at page 300 used to throw away 299 pages of work. This cache
+persists every raw response as soon as it arrives, keyed by
+(endpoint, params, page).
+
+Key Features:
+-------------
+1. Re-running a crawl serves already-seen pages from disk (no network)
+2. Resume from the first page that has not been fetched yet
+3. Conditional re-fetch with ETag / Last-Modified once an entry is stale
+4. Eviction by entry age and by total cache size
+"""
+
+# =========================
+# 1. IMPORT LIBRARIES
+# =========================
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+from Data_processing.crawl_metrics import timed_get
+from Data_processing.response_archive import IGNORED_PARAMS, canonical_url
+
+
+# =========================
+# 2. PAGE CACHE
+# =========================
+
+class PageCache:
+    """
+    Directory-backed cache of raw HTTP responses.
+
+    Each entry is stored as two files: `<key>.body` (raw bytes) and
+    `<key>.json` (metadata). The metadata file is written last, so an
+    entry only counts as present once it has been fully persisted.
+
+    Parameters
+    ----------
+    cache_dir : str
+        Directory holding the cache (created if missing)
+    max_age : float, optional
+        Seconds after which an entry is revalidated with the server
+        (None = entries never go stale)
+    evict_after : float, optional
+        Seconds after which `evict` deletes an entry
+    max_bytes : int, optional
+        Total body size `evict` trims the cache down to
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_age: float = None,
+        evict_after: float = None,
+        max_bytes: int = None,
+    ):
+        self.cache_dir = cache_dir
+        self.max_age = max_age
+        self.evict_after = evict_after
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    # ---------- keys & paths ----------
+
+    @staticmethod
+    def make_key(endpoint: str, params: dict = None, page: int = None) -> str:
+        """Stable hash of (endpoint, params, page)."""
+        params = {
+            k: v for k, v in (params or {}).items()
+            if k not in IGNORED_PARAMS and k != "page"
+        }
+        raw = json.dumps([endpoint, params, page], sort_keys=True, default=str)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _paths(self, key: str) -> tuple:
+        folder = os.path.join(self.cache_dir, key[:2])
+        return (
+            os.path.join(folder, f"{key}.body"),
+            os.path.join(folder, f"{key}.json"),
+        )
+
+    @staticmethod
+    def _atomic_write(path: str, data: bytes) -> None:
+        """Writes via a temp file + rename so a crash never leaves half a file."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    # ---------- reads ----------
+
+    def get_meta(self, endpoint: str, params: dict = None, page: int = None):
+        """Returns the metadata dict of an entry, or None if absent."""
+        _, meta_path = self._paths(self.make_key(endpoint, params, page))
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def get(self, endpoint: str, params: dict = None, page: int = None):
+        """
+        Returns (body, meta) for an entry, or None if absent.
+        """
+        meta = self.get_meta(endpoint, params, page)
+        if meta is None:
+            return None
+
+        body_path, _ = self._paths(meta["key"])
+        try:
+            with open(body_path, "rb") as f:
+                return f.read(), meta
+        except FileNotFoundError:
+            return None
+
+    def contains(self, endpoint: str, params: dict = None, page: int = None) -> bool:
+        return self.get_meta(endpoint, params, page) is not None
+
+    def is_fresh(self, endpoint: str, params: dict = None, page: int = None) -> bool:
+        """True if the entry exists and does not need revalidation."""
+        return self._fresh(self.get_meta(endpoint, params, page))
+
+    def _fresh(self, meta) -> bool:
+        if meta is None:
+            return False
+        if self.max_age is None:
+            return True
+        return time.time() - meta["fetched_at"] < self.max_age
+
+    def first_missing(self, keys: list) -> int:
+        """
+        Returns the index of the first (endpoint, params, page) tuple in
+        `keys` that is not cached, or len(keys) if all of them are.
+
+        This is the resume point of a crawl: everything before it is the
+        run of last good pages.
+        """
+        for i, key in enumerate(keys):
+            if not self.contains(*key):
+                return i
+        return len(keys)
+
+    # ---------- writes ----------
+
+    def put(
+        self,
+        endpoint: str,
+        params: dict,
+        page: int,
+        body: bytes,
+        headers: dict = None,
+    ) -> dict:
+        """
+        Stores a raw response body together with its validators.
+
+        Returns
+        -------
+        dict
+            Metadata written for the entry
+        """
+        headers = headers or {}
+        key = self.make_key(endpoint, params, page)
+        body_path, meta_path = self._paths(key)
+
+        meta = {
+            "key": key,
+            "endpoint": endpoint,
+            "page": page,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+            "size": len(body),
+        }
+
+        self._atomic_write(body_path, body)
+        self._atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+        return meta
+
+    def touch(self, meta: dict) -> None:
+        """Marks an entry as freshly validated (after a 304 response)."""
+        meta = dict(meta, fetched_at=time.time())
+        _, meta_path = self._paths(meta["key"])
+        self._atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+
+    # ---------- eviction ----------
+
+    def _entries(self) -> list:
+        entries = []
+        for folder, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+                try:
+                    with open(os.path.join(folder, name), "r", encoding="utf-8") as f:
+                        entries.append(json.load(f))
+                except (OSError, json.JSONDecodeError):
+                    continue
+        return entries
+
+    def _delete(self, key: str) -> None:
+        for path in reversed(self._paths(key)):  # metadata first
+            if os.path.exists(path):
+                os.remove(path)
+
+    def total_bytes(self) -> int:
+        return sum(meta["size"] for meta in self._entries())
+
+    def evict(self, older_than: float = None, max_bytes: int = None) -> int:
+        """
+        Deletes entries older than `older_than` seconds, then the oldest
+        remaining entries until the cache holds at most `max_bytes`.
+        Defaults come from `evict_after` / `max_bytes` given at construction.
+
+        Returns
+        -------
+        int
+            Number of entries removed
+        """
+        older_than = self.evict_after if older_than is None else older_than
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+
+        entries = sorted(self._entries(), key=lambda m: m["fetched_at"])
+        now = time.time()
+        removed = 0
+
+        if older_than is not None:
+            keep = []
+            for meta in entries:
+                if now - meta["fetched_at"] > older_than:
+                    self._delete(meta["key"])
+                    removed += 1
+                else:
+                    keep.append(meta)
+            entries = keep
+
+        if max_bytes is not None:
+            total = sum(meta["size"] for meta in entries)
+            for meta in entries:
+                if total <= max_bytes:
+                    break
+                self._delete(meta["key"])
+                total -= meta["size"]
+                removed += 1
+
+        return removed
+
+
+# =========================
+# 3. CACHED FETCH
+# =========================
+
+def cached_get(
+    session,
+    cache: PageCache,
+    endpoint: str,
+    params: dict = None,
+    page: int = None,
+    headers: dict = None,
+    timeout: float = 10,
+    archive=None,
+    metrics=None,
+) -> bytes:
+    """
+    GETs `endpoint`, going through `cache`.
+
+    - fresh entry           -> served from disk, no request is made
+    - stale entry           -> conditional request; a 304 reuses the body
+    - missing entry / 200   -> response stored, then returned
+
+    Parameters
+    ----------
+    session : requests.Session
+        Session used for network requests
+    cache : PageCache
+        Checkpoint store
+    endpoint : str
+        URL to request
+    params : dict, optional
+        Query parameters (including `page` if the API needs it)
+    page : int, optional
+        Page number used in the cache key
+    headers : dict, optional
+        Extra request headers
+    archive : ResponseArchive, optional
+        Every body actually downloaded (200) is also appended here
+    metrics : CrawlMetrics, optional
+        Receives ttfb / download timings, bytes and status codes
+
+    Returns
+    -------
+    bytes
+        Raw response body
+    """
+
+    cached = cache.get(endpoint, params, page)
+
+    if cached is not None and cache._fresh(cached[1]):
+        return cached[0]
+
+    request_headers = dict(headers or {})
+    if cached is not None:
+        meta = cached[1]
+        if meta.get("etag"):
+            request_headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            request_headers["If-Modified-Since"] = meta["last_modified"]
+
+    response = timed_get(
+        session,
+        endpoint,
+        metrics,
+        params=params,
+        headers=request_headers,
+        timeout=timeout,
+    )
+
+    if response.status_code == 304 and cached is not None:
+        cache.touch(cached[1])
+        return cached[0]
+
+    response.raise_for_status()
+    cache.put(endpoint, params, page, response.content, response.headers)
+    if archive is not None:
+        archive.append(
+            canonical_url(endpoint, params), response.content, meta={"page": page}
+        )
+    return response.content
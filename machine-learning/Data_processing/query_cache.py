@@ -0,0 +1,256 @@
+"""
+File: query_cache.py
+Author: Khyati Sharma
+
+Purpose:
+--------
+In-memory result cache for repeated read queries (`fetch_filtered`).
+
+Feature jobs run the same handful of filters thousands of times a day.
+Each result is kept as read-only column buffers, so a hit rebuilds the
+DataFrame from memory without another round trip to the database. Every
+hit gets its own copy, so callers can modify it like a fresh result.
+
+Key Features:
+-------------
+1. Keys: database + normalized SQL + parameters
+2. LRU eviction bounded by memory (bytes), not by entry count
+3. Per-table invalidation, called by every write in `sql_handling`
+   (deferred to the end of a batched transaction)
+4. Hit / miss / eviction statistics
+5. Reads inside a batched transaction bypass the cache, so
+   uncommitted rows are never cached
+"""
+
+# =========================
+# 1. IMPORT LIBRARIES
+# =========================
+
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+
+import pandas as pd
+
+from Data_processing.db_pool import DeferredCommitConnection, is_sqlite, raw_connection
+
+
+# =========================
+# 2. GLOBAL CONFIGURATION
+# =========================
+
+MAX_CACHE_BYTES = 256 * 1024 * 1024  # memory budget of the shared cache
+
+# quoted literals are kept as-is; whitespace anywhere else is collapsed
+_SQL_TOKENS = re.compile(r"""('(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|`[^`]*`)|\s+""")
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    Collapses whitespace outside string literals, so formatting
+    differences map to the same cache key
+    """
+    return _SQL_TOKENS.sub(lambda m: m.group(1) or " ", sql).strip()
+
+
+def database_id(conn):
+    """
+    Identifies the database behind a connection, so pooled connections
+    to the same database share cache entries (a MySQL connection's id is
+    fixed on first use; switch databases with a new connection, not USE)
+    """
+    conn = raw_connection(conn)
+
+    if is_sqlite(conn):
+        path = conn.execute("PRAGMA database_list").fetchone()[2]
+        return ("sqlite", path or id(conn))  # in-memory DBs are per connection
+
+    # mysql.connector's `database` property runs SELECT DATABASE(), so the
+    # id is computed once per connection and stored on it
+    ident = getattr(conn, "_query_cache_id", None)
+    if ident is None:
+        ident = (
+            "mysql",
+            getattr(conn, "server_host", None),
+            getattr(conn, "server_port", None),
+            getattr(conn, "database", None),
+        )
+        try:
+            conn._query_cache_id = ident
+        except AttributeError:  # connection type without instance attributes
+            pass
+    return ident
+
+
+def params_key(params) -> tuple:
+    """
+    Hashable form of query parameters: named params (dict) keep their
+    values as sorted (name, value) pairs, positional ones become a tuple.
+    Unhashable values raise TypeError instead of producing a wrong key
+    """
+    if params is None:
+        return ()
+    if isinstance(params, Mapping):
+        key = ("named", tuple(sorted(params.items())))
+    else:
+        key = ("positional", tuple(params))
+
+    try:
+        hash(key)
+    except TypeError as e:
+        raise TypeError(f"Query params cannot be used as a cache key: {e}") from None
+    return key
+
+
+# =========================
+# 3. COLUMNAR ENTRIES
+# =========================
+
+class CachedResult:
+    """
+    A query result stored as read-only column buffers.
+    """
+
+    def __init__(self, df: pd.DataFrame, tables: tuple):
+        self.tables = tables
+        self.columns = list(df.columns)
+        self.buffers = []
+
+        for col in self.columns:
+            series = df[col]
+            if pd.api.types.is_extension_array_dtype(series.dtype):
+                values = series.array.copy()  # Int64, string, ...
+            else:
+                values = series.to_numpy().copy()
+                values.flags.writeable = False
+            self.buffers.append(values)
+
+        self.nbytes = int(df.memory_usage(index=False, deep=True).sum())
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Independent, writable DataFrame built from the cached buffers
+        (copied, so edits never reach the cache or other hits)
+        """
+        return pd.DataFrame(dict(zip(self.columns, self.buffers)), copy=True)
+
+
+# =========================
+# 4. QUERY CACHE
+# =========================
+
+class QueryCache:
+    """
+    Thread-safe LRU cache of query results.
+
+    Parameters
+    ----------
+    max_bytes : int
+        Memory budget; least recently used results are evicted beyond it.
+        A single result larger than the budget is never cached.
+    """
+
+    def __init__(self, max_bytes: int = MAX_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def usable(conn) -> bool:
+        """
+        False inside a batched transaction: its reads may see uncommitted
+        rows, which must not be cached
+        """
+        return not isinstance(conn, DeferredCommitConnection)
+
+    @staticmethod
+    def make_key(conn, sql: str, params=None) -> tuple:
+        return database_id(conn), normalize_sql(sql), params_key(params)
+
+    def get(self, key) -> pd.DataFrame:
+        """
+        Cached result as a DataFrame, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return entry.to_frame()
+
+    def put(self, key, df: pd.DataFrame, tables) -> None:
+        """
+        Stores a result; `tables` are the tables it was read from
+        """
+        entry = CachedResult(df, tuple(t.lower() for t in tables))
+        if entry.nbytes > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old.nbytes
+
+            self._entries[key] = entry
+            self.bytes += entry.nbytes
+
+            while self.bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.bytes -= evicted.nbytes
+                self.evictions += 1
+
+    def invalidate(self, table_name: str = None) -> int:
+        """
+        Drops every result read from `table_name` (everything if None)
+        Returns the number of dropped entries
+        """
+        with self._lock:
+            if table_name is None:
+                stale = list(self._entries)
+            else:
+                table = table_name.lower()
+                stale = [k for k, e in self._entries.items() if table in e.tables]
+
+            for key in stale:
+                self.bytes -= self._entries.pop(key).nbytes
+            self.invalidations += len(stale)
+
+        return len(stale)
+
+    def invalidate_after_write(self, conn, table_name: str) -> None:
+        """
+        Invalidates `table_name` once a write on `conn` is final: now, or
+        when the enclosing `transaction` commits or rolls back
+        """
+        self.invalidate(table_name)
+        if isinstance(conn, DeferredCommitConnection):
+            conn.on_finish(lambda: self.invalidate(table_name))
+
+    def clear(self) -> None:
+        self.invalidate()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+# Shared by fetch_filtered and the write functions of sql_handling
+QUERY_CACHE = QueryCache()
@@ -0,0 +1,394 @@
+"""
+File: rate_limiting.py
+Author: Khyati Sharma
+
+Purpose:
+--------
+Rate limiting helpers shared by the data collection pipelines.
+
+A fixed `time.sleep(REQUEST_DELAY)` after every request wastes the time
+the request itself already spent on the network. A token bucket instead
+allows requests to start as soon as the average rate permits, which is
+what makes concurrent collection both fast and polite.
+
+On top of the bucket, `AdaptiveController` retries failed requests with
+exponential backoff + jitter, honours 429/503 and Retry-After by slowing
+down, speeds back up while latency is healthy, and keeps a dead-letter
+list of requests that exhausted their retries.
+"""
+
+# =========================
+# 1. IMPORT LIBRARIES
+# =========================
+
+import asyncio
+import random
+import threading
+import time
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+
+
+# =========================
+# 2. GLOBAL CONFIGURATION
+# =========================
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}  # worth another attempt
+THROTTLE_STATUSES = {429, 503}              # server asks us to slow down
+
+MAX_RETRIES = 5
+BASE_BACKOFF = 0.5   # seconds, doubled on every attempt
+MAX_BACKOFF = 60.0   # seconds
+
+
+# =========================
+# 3. TOKEN BUCKET
+# =========================
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter usable from threads and asyncio tasks.
+
+    Tokens refill continuously at `rate` per second up to `capacity`.
+    Each request consumes one token; when the bucket is empty the caller
+    waits until the next token becomes available.
+
+    Parameters
+    ----------
+    rate : float
+        Average number of requests allowed per second
+    capacity : int
+        Maximum burst size (defaults to 1, i.e. no bursting)
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: float) -> float:
+        """
+        Takes `tokens` from the bucket and returns how long the caller
+        must wait before the reservation is honoured.
+        """
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def set_rate(self, rate: float) -> None:
+        """Changes the refill rate, keeping the tokens accrued so far."""
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self._reserve(0)
+        with self._lock:
+            self.rate = rate
+
+    def acquire(self, tokens: float = 1) -> float:
+        """
+        Blocks the current thread until `tokens` are available.
+
+        Returns
+        -------
+        float
+            Seconds spent waiting
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: float = 1) -> float:
+        """
+        Asyncio version of `acquire`; yields to the event loop while waiting.
+
+        Returns
+        -------
+        float
+            Seconds spent waiting
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+# =========================
+# 4. ADAPTIVE CONTROLLER
+# =========================
+
+def parse_retry_after(value) -> float:
+    """
+    Parses a Retry-After header (delta-seconds or HTTP-date) into seconds.
+
+    Returns None if the header is missing or malformed.
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveController:
+    """
+    Retry + adaptive rate / concurrency control for paginated crawls.
+
+    - Retryable failures (429, 5xx, network errors) are retried with
+      exponential backoff and full jitter, or after Retry-After if longer.
+    - Throttling responses (429 / 503) halve the request rate and the
+      concurrency limit and pause new requests until Retry-After.
+    - Every `increase_every` consecutive responses faster than
+      `target_latency` raise the rate by `rate_step` and the concurrency
+      limit by one, up to `max_rate` / `max_concurrency`.
+    - Requests that exhaust their retries (or fail with a non-retryable
+      error) are recorded in `dead_letters` instead of vanishing.
+
+    Parameters
+    ----------
+    rate : float
+        Initial requests per second
+    max_rate : float, optional
+        Ceiling for the rate (defaults to `rate`: recover, never exceed)
+    min_rate : float
+        Floor for the rate
+    max_concurrency : int
+        Ceiling (and initial value) for requests in flight in async mode
+    max_retries : int
+        Retries after the first attempt before a request is dead-lettered
+    target_latency : float
+        Latency in seconds below which a response counts as healthy
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        max_rate: float = None,
+        min_rate: float = 0.1,
+        max_concurrency: int = 1,
+        max_retries: int = MAX_RETRIES,
+        base_backoff: float = BASE_BACKOFF,
+        max_backoff: float = MAX_BACKOFF,
+        target_latency: float = 1.0,
+        increase_every: int = 10,
+        rate_step: float = None,
+    ):
+        self.max_rate = rate if max_rate is None else max_rate
+        self.min_rate = min(min_rate, rate)
+        self.max_concurrency = max_concurrency
+        self.concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.target_latency = target_latency
+        self.increase_every = increase_every
+        self.rate_step = rate / 10 if rate_step is None else rate_step
+
+        self.bucket = TokenBucket(rate, capacity=max_concurrency)
+        self.dead_letters = []
+        self.retries = 0
+        self.throttled = 0
+
+        self._healthy_streak = 0
+        self._paused_until = 0.0
+        self._in_flight = 0
+        self._slot_free = None  # asyncio.Condition, created inside the loop
+
+    @property
+    def rate(self) -> float:
+        return self.bucket.rate
+
+    # ---------- feedback ----------
+
+    def backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter for the given attempt (1-based)."""
+        cap = min(self.max_backoff, self.base_backoff * 2 ** (attempt - 1))
+        return random.uniform(0, cap)
+
+    def on_success(self, latency: float) -> None:
+        """Speeds up after a run of healthy responses."""
+        if latency > self.target_latency:
+            self._healthy_streak = 0
+            return
+
+        self._healthy_streak += 1
+        if self._healthy_streak >= self.increase_every:
+            self._healthy_streak = 0
+            self.bucket.set_rate(min(self.max_rate, self.rate + self.rate_step))
+            self.concurrency = min(self.max_concurrency, self.concurrency + 1)
+
+    def on_throttle(self, retry_after: float = None) -> None:
+        """Multiplicative decrease, plus a pause if the server asked for one."""
+        self.throttled += 1
+        self._healthy_streak = 0
+        self.bucket.set_rate(max(self.min_rate, self.rate / 2))
+        self.concurrency = max(1, self.concurrency // 2)
+
+        if retry_after:
+            self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+
+    def on_failure(self, key, error: Exception, attempt: int) -> float:
+        """
+        Classifies a failed attempt.
+
+        Returns
+        -------
+        float or None
+            Seconds to wait before retrying, or None if `key` was
+            dead-lettered
+        """
+        response = getattr(error, "response", None)
+        status = getattr(response, "status_code", None)
+
+        if status is not None:
+            retryable = status in RETRY_STATUSES
+        else:
+            # connection resets, timeouts, DNS failures, ...
+            retryable = isinstance(error, OSError)
+
+        retry_after = None
+        if status in THROTTLE_STATUSES:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            self.on_throttle(retry_after)
+
+        if not retryable or attempt > self.max_retries:
+            self.dead_letters.append({
+                "key": key,
+                "attempts": attempt,
+                "status": status,
+                "error": repr(error),
+            })
+            print(f"[ERROR] {key} failed after {attempt} attempt(s): {error}")
+            return None
+
+        self.retries += 1
+        delay = max(self.backoff(attempt), retry_after or 0.0)
+        print(f"[WARN] {key} failed ({error}); retry {attempt} in {delay:.1f}s")
+        return delay
+
+    # ---------- sync ----------
+
+    def _pause_remaining(self) -> float:
+        return max(self._paused_until - time.monotonic(), 0.0)
+
+    def call(self, key, func, *args, paced: bool = True):
+        """
+        Calls `func(*args)` with pacing and retries.
+
+        Parameters
+        ----------
+        key : hashable
+            Identifier used in logs and dead letters (e.g. page number)
+        paced : bool
+            If False the rate limiter is skipped (e.g. for cache hits)
+
+        Returns
+        -------
+        object or None
+            `func`'s result, or None if the call was dead-lettered
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            if paced:
+                time.sleep(self._pause_remaining())
+                self.bucket.acquire()
+
+            start = time.monotonic()
+            try:
+                result = func(*args)
+            except Exception as e:
+                delay = self.on_failure(key, e, attempt)
+                if delay is None:
+                    return None
+                time.sleep(delay)
+                continue
+
+            self.on_success(time.monotonic() - start)
+            return result
+
+    # ---------- async ----------
+
+    @asynccontextmanager
+    async def _slot(self):
+        """Holds one of the `concurrency` in-flight slots."""
+        if self._slot_free is None:
+            self._slot_free = asyncio.Condition()
+
+        async with self._slot_free:
+            await self._slot_free.wait_for(lambda: self._in_flight < self.concurrency)
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            async with self._slot_free:
+                self._in_flight -= 1
+                self._slot_free.notify_all()
+
+    async def call_async(self, key, func, *args, executor=None, paced: bool = True):
+        """
+        Asyncio version of `call`: runs blocking `func(*args)` on `executor`
+        while respecting the adaptive concurrency limit.
+        """
+        loop = asyncio.get_running_loop()
+        attempt = 0
+
+        while True:
+            attempt += 1
+            async with self._slot():
+                if paced:
+                    await asyncio.sleep(self._pause_remaining())
+                    await self.bucket.acquire_async()
+
+                start = time.monotonic()
+                try:
+                    result = await loop.run_in_executor(executor, func, *args)
+                except Exception as e:
+                    error = e
+                else:
+                    self.on_success(time.monotonic() - start)
+                    return result
+
+            delay = self.on_failure(key, error, attempt)
+            if delay is None:
+                return None
+            await asyncio.sleep(delay)
+
+    def summary(self) -> dict:
+        return {
+            "rate": round(self.rate, 3),
+            "concurrency": self.concurrency,
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "dead_letters": len(self.dead_letters),
+        }
+
+
+def report_dead_letters(controller: AdaptiveController) -> list:
+    """
+    Logs the requests (pages) that exhausted their retries plus the
+    controller summary, and returns their keys.
+    """
+    pages = [letter["key"] for letter in controller.dead_letters]
+    if pages:
+        print(f"[WARN] {len(pages)} page(s) exhausted their retries: {pages}")
+    print("[INFO] Rate controller:", controller.summary())
+    return pages
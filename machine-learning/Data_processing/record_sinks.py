@@ -0,0 +1,183 @@
+"""
+File: record_sinks.py
+Author: Khyati Sharma
+
+Purpose:
+--------
+Streaming record sinks for the collection pipelines.
+
+Building one big DataFrame at the end of a crawl means memory grows with
+every page and nothing reaches disk until the crawl finishes. A sink
+instead buffers a fixed number of records, converts them to a typed
+batch and flushes it to disk, so peak memory stays roughly constant no
+matter how many pages are fetched.
+
+Available sinks:
+----------------
+1. CSVSink     -> appends batches to a CSV file
+2. ParquetSink -> appends batches as Parquet row groups (needs pyarrow)
+"""
+
+# =========================
+# 1. IMPORT LIBRARIES
+# =========================
+
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet output is optional
+    pa = None
+    pq = None
+
+
+# =========================
+# 2. GLOBAL CONFIGURATION
+# =========================
+
+BATCH_SIZE = 5000  # records buffered before each flush
+
+
+# =========================
+# 3. BASE SINK
+# =========================
+
+class RecordSink:
+    """
+    Base class: buffers record dicts and flushes them in typed batches.
+
+    Subclasses implement `_write_batch(frame)`.
+
+    Parameters
+    ----------
+    schema : dict
+        Ordered mapping of column name -> pandas dtype
+    batch_size : int
+        Number of records per flushed batch
+    """
+
+    def __init__(self, schema: dict, batch_size: int = BATCH_SIZE):
+        self.schema = dict(schema)
+        self.batch_size = batch_size
+        self.rows_written = 0
+        self.batches_written = 0
+        self._buffer = []
+
+    def write(self, record: dict) -> None:
+        """Adds one record, flushing when the buffer is full."""
+        self._buffer.append(record)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def write_many(self, records) -> None:
+        """Adds an iterable of records."""
+        for record in records:
+            self.write(record)
+
+    def to_frame(self, records: list) -> pd.DataFrame:
+        """Converts a list of record dicts to a DataFrame typed by `schema`."""
+        frame = pd.DataFrame.from_records(records, columns=list(self.schema))
+        return frame.astype(self.schema)
+
+    def flush(self) -> None:
+        """Writes any buffered records to disk."""
+        if not self._buffer:
+            return
+
+        frame = self.to_frame(self._buffer)
+        self._buffer = []
+
+        self._write_batch(frame)
+        self.rows_written += len(frame)
+        self.batches_written += 1
+
+    def _write_batch(self, frame: pd.DataFrame) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Flushes remaining records and releases the output file."""
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+# =========================
+# 4. CSV SINK
+# =========================
+
+class CSVSink(RecordSink):
+    """
+    Appends typed record batches to a CSV file.
+
+    The header is written with the first batch; an existing file at
+    `path` is overwritten.
+    """
+
+    def __init__(self, path: str, schema: dict, batch_size: int = BATCH_SIZE):
+        super().__init__(schema, batch_size)
+        self.path = path
+        if os.path.exists(path):
+            os.remove(path)
+
+    def _write_batch(self, frame: pd.DataFrame) -> None:
+        frame.to_csv(
+            self.path,
+            mode="a",
+            header=self.batches_written == 0,
+            index=False,
+        )
+
+    def close(self) -> None:
+        super().close()
+        if self.batches_written == 0:
+            # keep the output readable even for an empty crawl
+            self.to_frame([]).to_csv(self.path, index=False)
+
+
+# =========================
+# 5. PARQUET SINK
+# =========================
+
+class ParquetSink(RecordSink):
+    """
+    Appends typed record batches to a Parquet file, one row group per batch.
+    """
+
+    def __init__(self, path: str, schema: dict, batch_size: int = BATCH_SIZE):
+        if pa is None:
+            raise ImportError("ParquetSink requires pyarrow (pip install pyarrow)")
+
+        super().__init__(schema, batch_size)
+        self.path = path
+        self.arrow_schema = pa.Schema.from_pandas(
+            self.to_frame([]), preserve_index=False
+        )
+        self._writer = pq.ParquetWriter(path, self.arrow_schema)
+
+    def _write_batch(self, frame: pd.DataFrame) -> None:
+        table = pa.Table.from_pandas(
+            frame, schema=self.arrow_schema, preserve_index=False
+        )
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        super().close()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+def open_sink(path: str, schema: dict, batch_size: int = BATCH_SIZE) -> RecordSink:
+    """
+    Returns a Parquet or CSV sink depending on the file extension of `path`.
+    """
+    if path.endswith((".parquet", ".pq")):
+        return ParquetSink(path, schema, batch_size)
+    return CSVSink(path, schema, batch_size)
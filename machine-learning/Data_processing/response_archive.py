@@ -0,0 +1,233 @@
+"""
+File: response_archive.py
+Author: Khyati Sharma
+
+Purpose:
+--------
+Append-only archive of raw HTTP responses, with a replay mode.
+
+Whenever parsing logic changes we want to re-run `extract_movie_fields`
+/ `extract_company_data` over historical crawls without hitting the
+network again. The crawlers append every downloaded body here, and the
+replay functions in the pipelines read them back from disk.
+
+Format:
+-------
+<path>.arc  -> concatenated zlib-compressed response bodies (append-only)
+<path>.idx  -> one JSON line per body: url, fetched_at, offset, length, meta
+
+The data file is read through `mmap`, so random access to a single page
+only touches the bytes of that page. Index lines are written after their
+body, and lines pointing past the end of the data file (a crash mid-write)
+are ignored on load.
+"""
+
+# =========================
+# 1. IMPORT LIBRARIES
+# =========================
+
+import json
+import mmap
+import os
+import threading
+import time
+import zlib
+from urllib.parse import urlencode
+
+
+# =========================
+# 2. GLOBAL CONFIGURATION
+# =========================
+
+COMPRESSION_LEVEL = 6
+
+# Query parameters that never end up in an archived URL and must not
+# change a page cache key (secrets, e.g. rotating API keys)
+IGNORED_PARAMS = {"api_key"}
+
+
+def canonical_url(endpoint: str, params: dict = None) -> str:
+    """
+    URL used as the archive key: sorted query string, secrets removed.
+    """
+    params = {k: v for k, v in (params or {}).items() if k not in IGNORED_PARAMS}
+    if not params:
+        return endpoint
+    return f"{endpoint}?{urlencode(sorted(params.items()))}"
+
+
+# =========================
+# 3. RESPONSE ARCHIVE
+# =========================
+
+class ResponseArchive:
+    """
+    Compressed, append-only, URL-indexed store of raw responses.
+
+    Parameters
+    ----------
+    path : str
+        Path prefix; `<path>.arc` and `<path>.idx` are created next to it
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.data_path = f"{path}.arc"
+        self.index_path = f"{path}.idx"
+
+        folder = os.path.dirname(os.path.abspath(self.data_path))
+        os.makedirs(folder, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._data = open(self.data_path, "ab")
+        self._index_file = open(self.index_path, "a", encoding="utf-8")
+        self._mmap = None
+        self._mapped_size = 0
+
+        self.entries = self._load_index()
+        self._by_url = {}
+        for entry in self.entries:
+            self._by_url.setdefault(entry["url"], []).append(entry)
+
+    def _load_index(self) -> list:
+        data_size = os.path.getsize(self.data_path)
+        entries = []
+        line = "\n"
+
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn line from an interrupted write
+                if entry["offset"] + entry["length"] <= data_size:
+                    entries.append(entry)
+
+        if not line.endswith("\n"):
+            # start new entries on a fresh line after a torn write
+            self._index_file.write("\n")
+            self._index_file.flush()
+
+        return entries
+
+    # ---------- writes ----------
+
+    def append(
+        self,
+        url: str,
+        body: bytes,
+        fetched_at: float = None,
+        meta: dict = None,
+    ) -> dict:
+        """
+        Compresses and appends one response body.
+
+        Parameters
+        ----------
+        url : str
+            Archive key (see `canonical_url`)
+        body : bytes
+            Raw response body
+        fetched_at : float, optional
+            Unix timestamp of the fetch (defaults to now)
+        meta : dict, optional
+            Extra JSON-serialisable info, e.g. {"page": 3}
+
+        Returns
+        -------
+        dict
+            Index entry of the archived body
+        """
+        compressed = zlib.compress(body, COMPRESSION_LEVEL)
+
+        with self._lock:
+            offset = self._data.tell()
+            self._data.write(compressed)
+            self._data.flush()
+
+            entry = {
+                "url": url,
+                "fetched_at": time.time() if fetched_at is None else fetched_at,
+                "offset": offset,
+                "length": len(compressed),
+                "size": len(body),
+                "meta": meta or {},
+            }
+            self._index_file.write(json.dumps(entry) + "\n")
+            self._index_file.flush()
+
+            self.entries.append(entry)
+            self._by_url.setdefault(url, []).append(entry)
+
+        return entry
+
+    # ---------- reads ----------
+
+    def _view(self, end: int):
+        """Returns an mmap covering at least the first `end` bytes."""
+        if self._mmap is None or end > self._mapped_size:
+            if self._mmap is not None:
+                self._mmap.close()
+            with open(self.data_path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mapped_size = len(self._mmap)
+        return self._mmap
+
+    def read(self, entry: dict) -> bytes:
+        """Decompresses the body referenced by an index entry."""
+        start = entry["offset"]
+        end = start + entry["length"]
+        with self._lock:
+            view = self._view(end)
+            return zlib.decompress(view[start:end])
+
+    def urls(self) -> list:
+        return list(self._by_url)
+
+    def latest(self, url: str, at: float = None) -> dict:
+        """
+        Index entry of the newest fetch of `url` (at or before `at`),
+        or None.
+        """
+        candidates = [
+            entry for entry in self._by_url.get(url, [])
+            if at is None or entry["fetched_at"] <= at
+        ]
+        if not candidates:
+            return None
+        return max(candidates, key=lambda entry: entry["fetched_at"])
+
+    def get(self, url: str, at: float = None) -> bytes:
+        """Body of the newest fetch of `url`, or None if never archived."""
+        entry = self.latest(url, at)
+        return None if entry is None else self.read(entry)
+
+    def iter_latest(self, prefix: str = "", at: float = None):
+        """
+        Yields (entry, body) for the newest fetch of every URL starting
+        with `prefix`, in first-archived order.
+        """
+        for url in self._by_url:
+            if url.startswith(prefix):
+                entry = self.latest(url, at)
+                if entry is not None:
+                    yield entry, self.read(entry)
+
+    # ---------- lifecycle ----------
+
+    def close(self) -> None:
+        with self._lock:
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+            self._data.close()
+            self._index_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self):
+        return len(self.entries)
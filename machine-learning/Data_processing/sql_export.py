@@ -0,0 +1,347 @@
+"""
+File: sql_export.py
+Author: Khyati Sharma
+
+Purpose:
+--------
+Parallel export of a large SQL table to Parquet for model training.
+
+`load_table` reads a whole table with one query on one connection and
+holds all of it in memory before anything is written. This module
+splits the table into primary-key ranges and reads them concurrently
+over pooled connections, writing every partition to Parquet as soon as
+it arrives, so only a bounded window of partitions is in memory.
+
+The main gain is peak memory. Speed depends on the server: on SQLite
+(rows decoded on the client under the GIL) the export measured about
+0.7x the speed of a single read_sql, and any speedup needs a server
+that runs the range queries in parallel (MySQL).
+
+Key Features:
+-------------
+1. Equal-width integer primary-key partitions (MIN / MAX of the key)
+2. Concurrent partition reads over `db_pool` connections
+3. One Parquet row group per partition in a single file, or one file
+   per partition in a directory
+4. Deterministic ordering: partitions written in key order, rows sorted
+   by key (optional; unordered mode writes partitions as they finish)
+5. Parquet schema taken from the SQL column types, so a column that is
+   NULL throughout the first partition keeps its type
+"""
+
+# =========================
+# 1. IMPORT LIBRARIES
+# =========================
+
+import sys
+import os
+
+# ========== PATH SETUP (MUST COME FIRST) ==========
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet output is optional
+    pa = None
+    pq = None
+
+from Data_processing.db_pool import get_pool, is_sqlite, managed_cursor
+
+
+# =========================
+# 2. GLOBAL CONFIGURATION
+# =========================
+
+EXPORT_WORKERS = 4            # concurrent partition reads (= pooled connections used)
+PARTITIONS_PER_WORKER = 4     # more partitions than workers evens out skewed key ranges
+
+# Declared SQL type (substring, first match wins) -> Arrow type name.
+# Date / time types are only typed on MySQL: SQLite stores them as text.
+SQL_ARROW_TYPES = [
+    ("INT", "int64"),
+    ("CHAR", "string"), ("TEXT", "string"), ("CLOB", "string"),
+    ("ENUM", "string"), ("SET", "string"), ("JSON", "string"),
+    ("REAL", "float64"), ("FLOA", "float64"), ("DOUB", "float64"),
+    ("DEC", "float64"), ("NUMERIC", "float64"),
+    ("BLOB", "binary"), ("BINARY", "binary"),
+]
+MYSQL_ARROW_TYPES = [
+    ("DATETIME", "timestamp"), ("TIMESTAMP", "timestamp"),
+    ("DATE", "date32"), ("TIME", "duration"), ("YEAR", "int64"),
+]
+
+
+# =========================
+# 3. PARTITIONING
+# =========================
+
+def key_range(conn, table_name: str, key: str) -> tuple:
+    """
+    (min, max) of an integer key column, or (None, None) for an empty table
+    """
+    with managed_cursor(conn) as cursor:
+        cursor.execute(f"SELECT MIN({key}), MAX({key}) FROM {table_name}")
+        low, high = cursor.fetchone()
+
+    if low is not None and not (isinstance(low, int) and isinstance(high, int)):
+        raise ValueError(f"Partitioning needs an integer key, '{key}' is {type(low).__name__}")
+    return low, high
+
+
+def partition_ranges(low: int, high: int, partitions: int) -> list:
+    """
+    Splits [low, high] into at most `partitions` half-open [start, end)
+    ranges of (nearly) equal width
+    """
+    if low is None:
+        return []
+
+    span = high - low + 1
+    partitions = max(1, min(partitions, span))
+    step, extra = divmod(span, partitions)
+
+    ranges = []
+    start = low
+    for i in range(partitions):
+        end = start + step + (1 if i < extra else 0)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def _arrow_type(declared: str, sqlite: bool):
+    """Arrow type for a declared SQL column type, or None if unknown"""
+    declared = (declared or "").upper()
+    rules = SQL_ARROW_TYPES if sqlite else MYSQL_ARROW_TYPES + SQL_ARROW_TYPES
+    for marker, name in rules:
+        if marker in declared:
+            if name == "timestamp":
+                return pa.timestamp("us")
+            if name == "duration":
+                return pa.duration("us")
+            return getattr(pa, name)()
+    return pa.string() if sqlite and declared.startswith(("DATE", "TIME")) else None
+
+
+def column_types(conn, table_name: str) -> dict:
+    """
+    {column: Arrow type} from the table's declared column types; columns
+    of an unknown type map to None (typed from the data instead)
+    """
+    sqlite = is_sqlite(conn)
+    with managed_cursor(conn) as cursor:
+        if sqlite:
+            cursor.execute(f"PRAGMA table_info({table_name})")
+            declared = [(row[1], row[2]) for row in cursor.fetchall()]
+        else:
+            cursor.execute(
+                "SELECT COLUMN_NAME, COLUMN_TYPE FROM information_schema.COLUMNS "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s ORDER BY ORDINAL_POSITION",
+                (table_name,),
+            )
+            declared = cursor.fetchall()
+
+    return {name: _arrow_type(sql_type, sqlite) for name, sql_type in declared}
+
+
+def read_partition(pool, table_name: str, key: str, start: int, end: int, ordered: bool = True) -> pd.DataFrame:
+    """
+    Reads the rows with start <= key < end on a pooled connection
+    """
+    with pool.connection() as conn:
+        marker = "?" if is_sqlite(conn) else "%s"
+        query = f"SELECT * FROM {table_name} WHERE {key} >= {marker} AND {key} < {marker}"
+        if ordered:
+            query += f" ORDER BY {key}"
+        return pd.read_sql(query, conn, params=(start, end))
+
+
+# =========================
+# 4. PARQUET OUTPUT
+# =========================
+
+class PartitionWriter:
+    """
+    Writes partitions to one Parquet file (a row group each) or to one
+    file per partition inside a directory.
+
+    The Arrow schema is fixed when the first non-empty partition arrives
+    and every partition is cast to it, so all parts stay compatible.
+    Column types come from `column_types` (the SQL schema) where known;
+    only the remaining columns are typed from that first partition.
+
+    Parameters
+    ----------
+    path : str
+        Output .parquet file ("row_groups") or directory ("files")
+    layout : str
+        "row_groups" or "files"
+    column_types : dict, optional
+        {column: Arrow type or None}, see `column_types()`
+    """
+
+    def __init__(self, path: str, layout: str = "row_groups", column_types: dict = None):
+        if pa is None:
+            raise ImportError("Parquet export requires pyarrow (pip install pyarrow)")
+        if layout not in ("row_groups", "files"):
+            raise ValueError(f"Unknown layout: {layout}")
+
+        self.path = path
+        self.layout = layout
+        self.column_types = column_types or {}
+        self.schema = None
+        self.rows = 0
+        self.parts = 0
+        self._writer = None
+
+        if layout == "files":
+            os.makedirs(path, exist_ok=True)
+
+    def write(self, index: int, df: pd.DataFrame) -> None:
+        if df.empty:
+            return
+
+        if self.schema is None:
+            self.schema = self._build_schema(df)
+        table = pa.Table.from_pandas(df, schema=self.schema, preserve_index=False)
+
+        if self.layout == "files":
+            pq.write_table(table, os.path.join(self.path, f"part-{index:05d}.parquet"))
+        else:
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, self.schema)
+            self._writer.write_table(table)
+
+        self.rows += len(df)
+        self.parts += 1
+
+    def _build_schema(self, df: pd.DataFrame):
+        """SQL column types where known, types of this partition otherwise"""
+        inferred = pa.Schema.from_pandas(df, preserve_index=False)
+
+        fields = []
+        for field in inferred:
+            sql_type = self.column_types.get(field.name)
+            if sql_type is not None:
+                field = field.with_type(sql_type)
+            elif pa.types.is_null(field.type):
+                logging.warning(
+                    f"Column '{field.name}' is all NULL in the first partition and its "
+                    f"SQL type is unknown; later non-NULL values cannot be written"
+                )
+            fields.append(field)
+        return pa.schema(fields, metadata=inferred.metadata)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+# =========================
+# 5. PARALLEL EXPORT
+# =========================
+
+def export_table(
+    table_name: str,
+    path: str,
+    key: str = "id",
+    workers: int = EXPORT_WORKERS,
+    partitions: int = None,
+    ordered: bool = True,
+    layout: str = "row_groups",
+    pool=None,
+) -> dict:
+    """
+    Exports a table to Parquet by reading primary-key ranges in parallel.
+
+    Parameters
+    ----------
+    table_name : str
+        Source table
+    path : str
+        Output .parquet file ("row_groups") or directory ("files")
+    key : str
+        Integer primary key used for partitioning
+    workers : int
+        Partitions read concurrently; the pool must allow this many
+        connections
+    partitions : int, optional
+        Number of key ranges (default: workers * PARTITIONS_PER_WORKER)
+    ordered : bool
+        True: rows sorted by key and partitions written in key order, so
+        the output is identical on every run. False: partitions are
+        written in completion order (faster when ranges are skewed)
+    layout : str
+        "row_groups" (one file) or "files" (one file per partition)
+    pool : ConnectionPool, optional
+        Connection pool to read from (default: the shared `get_pool()`)
+
+    Returns
+    -------
+    dict
+        rows, partitions, seconds and rows_per_second
+    """
+    pool = pool or get_pool()
+    partitions = partitions or workers * PARTITIONS_PER_WORKER
+
+    start_time = time.perf_counter()
+
+    with pool.connection() as conn:
+        low, high = key_range(conn, table_name, key)
+        types = column_types(conn, table_name)
+    ranges = partition_ranges(low, high, partitions)
+
+    writer = PartitionWriter(path, layout, types)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+
+            def submit(i):
+                start, end = ranges[i]
+                return executor.submit(read_partition, pool, table_name, key, start, end, ordered)
+
+            if ordered:
+                # bounded window of in-flight partitions, drained in key order
+                window = deque()
+                for i in range(len(ranges)):
+                    window.append((i, submit(i)))
+                    if len(window) >= workers * 2:
+                        index, future = window.popleft()
+                        writer.write(index, future.result())
+                for index, future in window:
+                    writer.write(index, future.result())
+            else:
+                futures = {submit(i): i for i in range(len(ranges))}
+                for future in as_completed(futures):
+                    writer.write(futures[future], future.result())
+    finally:
+        writer.close()
+
+    seconds = time.perf_counter() - start_time
+    stats = {
+        "rows": writer.rows,
+        "partitions": writer.parts,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(writer.rows / seconds) if seconds > 0 else None,
+    }
+    logging.info(f"Exported '{table_name}' to {path}: {stats}")
+    return stats
+
+
+# =========================
+# 6. MAIN EXECUTION
+# =========================
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    stats = export_table("employee", "employee.parquet", key="id")
+    print("[INFO] Export finished:", stats)
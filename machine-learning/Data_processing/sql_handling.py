@@ -4,41 +4,92 @@ Purpose: MySQL database handling for ML & backend projects
 Author: Khyati Sharma
 
 This file demonstrates:
-- Secure DB connection
+- Secure DB connection (settings from environment variables)
+- Connection pooling, managed cursors and batched transactions
 - Reading SQL tables into pandas
 - Data cleaning
 - CRUD operations
-- Bulk insert (fast)
+- Bulk insert (fast): batched multi-row VALUES or LOAD DATA LOCAL INFILE
+- Streaming reads / writes in chunks, for tables larger than RAM
+- Typed tables (INT / BIGINT / DOUBLE / DATETIME / VARCHAR(n)) with indexes
+- Incremental upsert sync with a high-water mark
+- Cached fetch_filtered results, invalidated by writes
 """
 
-import mysql.connector
+import sys
+import os
+
+# ========== PATH SETUP (MUST COME FIRST) ==========
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from mysql.connector import FieldType
 import pandas as pd
 import logging
+import tempfile
+import time
+
+from Data_processing.db_pool import (
+    DB_CONFIG,
+    connect,
+    get_pool,
+    is_sqlite,
+    managed_cursor,
+    transaction,
+)
+from Data_processing.query_cache import QUERY_CACHE
 
 
 # ---------------- LOGGING SETUP ----------------
 logging.basicConfig(level=logging.INFO)
 
 
+# ---------------- BULK LOAD SETTINGS ----------------
+BULK_BATCH_SIZE = 1000         # rows per multi-row INSERT statement
+SQLITE_MAX_VARIABLES = 999     # bound parameters allowed per SQLite statement
+
+# ---------------- STREAMING SETTINGS ----------------
+CHUNK_SIZE = 50000             # rows per streamed DataFrame chunk
+
+# MySQL column type -> pandas dtype of streamed chunks
+MYSQL_DTYPES = {
+    "TINY": "Int64", "SHORT": "Int64", "INT24": "Int64", "LONG": "Int64",
+    "LONGLONG": "Int64", "YEAR": "Int64",
+    "FLOAT": "float64", "DOUBLE": "float64",
+    "DECIMAL": "float64", "NEWDECIMAL": "float64",
+    "DATE": "datetime64[ns]", "DATETIME": "datetime64[ns]",
+    "TIMESTAMP": "datetime64[ns]",
+    "VARCHAR": "string", "VAR_STRING": "string", "STRING": "string",
+    "ENUM": "string", "JSON": "string",
+}
+
+# ---------------- SCHEMA SETTINGS ----------------
+INT32_MIN, INT32_MAX = -2**31, 2**31 - 1
+MAX_VARCHAR = 16383            # longest VARCHAR that fits a utf8mb4 row; longer -> TEXT
+INDEX_PREFIX = 255             # MySQL can only index a prefix of TEXT columns
+SCHEMA_HEADROOM = 2            # inferred INT / VARCHAR(n) fit values this many times larger / longer
+MIN_VARCHAR = 32               # shortest inferred VARCHAR
+
+# ---------------- SYNC SETTINGS ----------------
+ROW_HASH_COLUMN = "row_hash"   # per-row content hash stored in synced tables
+SYNC_STATE_TABLE = "sync_state"  # high-water marks of incremental syncs
+
+
 # ---------------- CONNECT ----------------
-def connect_db():
+def connect_db(allow_local_infile=False):
     """
     Connects to MySQL server and selects database
+
+    Host, user, password and database come from the MYSQL_* environment
+    variables (see db_pool.DB_CONFIG). For repeated short queries borrow
+    a pooled connection instead: `with get_pool().connection() as conn:`
+
+    allow_local_infile=True is needed for bulk_insert(..., use_infile=True)
     """
     try:
-        conn = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="YourStrongPassword@123",   
-            auth_plugin="mysql_native_password"
-        )
+        conn = connect(allow_local_infile=allow_local_infile)
 
         logging.info("Connected to MySQL successfully")
-
-        # Force database selection
-        cursor = conn.cursor()
-        cursor.execute("USE abc")
-        logging.info("Database 'abc' selected")
+        logging.info(f"Database '{DB_CONFIG['database']}' selected")
 
         return conn
 
@@ -48,17 +99,101 @@ def connect_db():
 
 
 # ---------------- LOAD TABLE ----------------
-def load_table(conn, table_name):
+def load_table(conn, table_name, watermark_column=None, since=None):
     """
     Loads SQL table into pandas DataFrame
+
+    With `watermark_column` and `since`, only rows where
+    watermark_column > since are read (see incremental_sync)
     """
     query = f"SELECT * FROM {table_name}"
-    df = pd.read_sql(query, conn)
+    params = None
+
+    if watermark_column is not None and since is not None:
+        query += f" WHERE {watermark_column} > {_placeholder(conn)} ORDER BY {watermark_column}"
+        params = (since,)
 
-    logging.info(f"Table '{table_name}' loaded")
+    df = pd.read_sql(query, conn, params=params)
+
+    logging.info(f"Table '{table_name}' loaded ({len(df)} rows)")
     return df
 
 
+# ---------------- STREAMING READ ----------------
+def _cursor_dtypes(cursor):
+    """
+    pandas dtypes from the cursor's column types (MySQL only; other
+    drivers, e.g. sqlite3, report no types and get an empty dict)
+    """
+    dtypes = {}
+    for column in cursor.description:
+        name, type_code = column[0], column[1]
+        if type_code is None:
+            continue
+        dtype = MYSQL_DTYPES.get(FieldType.get_info(type_code))
+        if dtype is not None:
+            dtypes[name] = dtype
+    return dtypes
+
+
+def stream_table(conn, table_name, chunk_size=CHUNK_SIZE, dtypes=None):
+    """
+    Yields the table as typed DataFrame chunks of `chunk_size` rows
+
+    Uses an unbuffered cursor, so rows are pulled from the server as each
+    chunk is built and only one chunk is held in memory. Every chunk gets
+    the same dtypes: `dtypes` if given, otherwise the column types the
+    server reports.
+
+    MySQL cannot run other statements on `conn` until the stream is
+    exhausted; write results through a second connection.
+    """
+    if is_sqlite(conn):
+        cursor = conn.cursor()  # sqlite3 cursors already step row by row
+    else:
+        cursor = conn.cursor(buffered=False)
+
+    try:
+        cursor.execute(f"SELECT * FROM {table_name}")
+
+        columns = [column[0] for column in cursor.description]
+        dtypes = dtypes if dtypes is not None else _cursor_dtypes(cursor)
+
+        n_chunks = 0
+        n_rows = 0
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+
+            chunk = pd.DataFrame.from_records(rows, columns=columns)
+            if dtypes:
+                chunk = chunk.astype(dtypes)
+
+            n_chunks += 1
+            n_rows += len(chunk)
+            yield chunk
+
+        logging.info(f"Table '{table_name}' streamed: {n_rows} rows in {n_chunks} chunks")
+
+    finally:
+        cursor.close()
+
+
+def transform_chunks(chunks, *transforms):
+    """
+    Applies DataFrame -> DataFrame transforms (e.g. handle_missing,
+    remove_duplicates) to every chunk of a stream, lazily
+
+    Note: transforms only see one chunk at a time, so remove_duplicates
+    drops duplicates within a chunk, not across chunks.
+    """
+    for chunk in chunks:
+        for transform in transforms:
+            chunk = transform(chunk)
+        yield chunk
+
+
 # ---------------- EDA ----------------
 def explore_data(df):
     """
@@ -100,31 +235,153 @@ def remove_duplicates(df):
 
 
 # ---------------- BULK INSERT ----------------
-def bulk_insert(df, conn, table_name):
+def _placeholder(conn):
+    """
+    Parameter marker of the driver: '?' for sqlite3, '%s' for MySQL
+    """
+    return "?" if is_sqlite(conn) else "%s"
+
+
+def _native_column(series):
+    """
+    Converts a column to a list of plain Python values (NaN/NA -> None)
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        # DatetimeArray.to_pydatetime: plain datetimes (sqlite3 rejects
+        # Timestamp), without the FutureWarning of Series.dt.to_pydatetime
+        values = list(series.array.to_pydatetime())
+    else:
+        values = series.tolist()
+
+    missing = series.isna().to_numpy()
+    if missing.any():
+        values = [None if m else v for v, m in zip(values, missing)]
+    return values
+
+
+def to_row_tuples(df):
+    """
+    Builds insert parameters column by column, without a Series per row
+    """
+    columns = [_native_column(df[col]) for col in df.columns]
+    return list(zip(*columns))
+
+
+def _insert_batches(df, conn, table_name, batch_size):
+    """
+    Inserts rows with one multi-row INSERT ... VALUES (...), (...) per batch
+    """
+    marker = _placeholder(conn)
+    n_cols = len(df.columns)
+
+    if marker == "?":
+        batch_size = min(batch_size, max(1, SQLITE_MAX_VARIABLES // n_cols))
+
+    row_sql = "(" + ", ".join([marker] * n_cols) + ")"
+    rows = to_row_tuples(df)
+
+    full_query = None
+
+    with managed_cursor(conn) as cursor:
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+
+            if len(batch) == batch_size and full_query is not None:
+                query = full_query
+            else:
+                query = f"INSERT INTO {table_name} VALUES " + ", ".join([row_sql] * len(batch))
+                if len(batch) == batch_size:
+                    full_query = query
+
+            cursor.execute(query, [value for row in batch for value in row])
+
+
+def _load_infile(df, conn, table_name):
+    """
+    Writes the frame to a temp CSV and loads it with LOAD DATA LOCAL INFILE
+    (the connection needs allow_local_infile=True)
+    """
+    fd, path = tempfile.mkstemp(suffix=".csv")
+    os.close(fd)
+
+    try:
+        # unquoted NULL is read back as SQL NULL when ESCAPED BY is empty
+        df.to_csv(
+            path, index=False, header=False, na_rep="NULL",
+            date_format="%Y-%m-%d %H:%M:%S", lineterminator="\n",
+        )
+
+        with managed_cursor(conn) as cursor:
+            cursor.execute(
+                f"LOAD DATA LOCAL INFILE '{path.replace(os.sep, '/')}' INTO TABLE {table_name} "
+                "CHARACTER SET utf8mb4 "
+                "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '' "
+                "LINES TERMINATED BY '\\n'"
+            )
+    finally:
+        os.remove(path)
+
+
+def bulk_insert(df, conn, table_name, batch_size=BULK_BATCH_SIZE, use_infile=False):
     """
     Inserts large data efficiently (production style)
+
+    Rows go out in batches of `batch_size` as multi-row VALUES statements,
+    or through LOAD DATA LOCAL INFILE when `use_infile` is set (MySQL only).
+    Works with MySQL and sqlite3 connections.
+
+    Returns a dict with rows, seconds and rows_per_second
     """
-    cursor = conn.cursor()
+    start = time.perf_counter()
 
-    placeholders = ", ".join(["%s"] * len(df.columns))
-    query = f"INSERT INTO {table_name} VALUES ({placeholders})"
+    if len(df):
+        if use_infile and is_sqlite(conn):
+            logging.warning("LOAD DATA INFILE is MySQL only, using batched INSERTs")
+            use_infile = False
 
-    data = [tuple(row) for _, row in df.iterrows()]
+        if use_infile:
+            _load_infile(df, conn, table_name)
+        else:
+            _insert_batches(df, conn, table_name, batch_size)
 
-    cursor.executemany(query, data)
     conn.commit()
+    QUERY_CACHE.invalidate_after_write(conn, table_name)
+
+    seconds = time.perf_counter() - start
+    stats = {
+        "rows": len(df),
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(len(df) / seconds) if seconds > 0 else None,
+    }
 
-    logging.info("Bulk insert completed")
+    logging.info(
+        f"Bulk insert completed: {stats['rows']} rows in {seconds:.2f}s "
+        f"({stats['rows_per_second']} rows/sec)"
+    )
+    return stats
 
 
 # ---------------- CRUD ----------------
-def fetch_filtered(conn, condition):
+def fetch_filtered(conn, condition, params=None, table_name="employee", use_cache=True):
     """
     Fetch rows using SQL condition
     Example: salary > 50000
+
+    Results are cached in QUERY_CACHE (keyed by database, normalized SQL
+    and params) until a write touches the table; every call returns its
+    own frame, so hits can be modified just like misses.
+    Reads through a `transaction` connection are never cached
     """
-    query = f"SELECT * FROM employee WHERE {condition}"
-    df = pd.read_sql(query, conn)
+    query = f"SELECT * FROM {table_name} WHERE {condition}"
+
+    if not use_cache or not QUERY_CACHE.usable(conn):
+        return pd.read_sql(query, conn, params=params)
+
+    key = QUERY_CACHE.make_key(conn, query, params)
+    df = QUERY_CACHE.get(key)
+    if df is None:
+        df = pd.read_sql(query, conn, params=params)
+        QUERY_CACHE.put(key, df, tables=[table_name])
     return df
 
 
@@ -132,10 +389,12 @@ def update_record(conn, column, old, new):
     """
     Updates records
     """
-    cursor = conn.cursor()
-    query = f"UPDATE employee SET {column}=%s WHERE {column}=%s"
-    cursor.execute(query, (new, old))
+    marker = _placeholder(conn)
+    query = f"UPDATE employee SET {column}={marker} WHERE {column}={marker}"
+    with managed_cursor(conn) as cursor:
+        cursor.execute(query, (new, old))
     conn.commit()
+    QUERY_CACHE.invalidate_after_write(conn, "employee")
     logging.info("Record updated")
 
 
@@ -143,29 +402,357 @@ def delete_record(conn, condition):
     """
     Deletes records
     """
-    cursor = conn.cursor()
     query = f"DELETE FROM employee WHERE {condition}"
-    cursor.execute(query)
+    with managed_cursor(conn) as cursor:
+        cursor.execute(query)
     conn.commit()
+    QUERY_CACHE.invalidate_after_write(conn, "employee")
     logging.info("Record deleted")
 
 
+# ---------------- SCHEMA INFERENCE ----------------
+def sql_type(series, exact=True):
+    """
+    SQL column type for a pandas column
+
+    exact=True sizes the type to the data (INT vs BIGINT, VARCHAR(n)),
+    with SCHEMA_HEADROOM so later rows a bit larger / longer than today's
+    still fit: VARCHAR lengths are rounded up to a power of two at least
+    twice the longest value. exact=False picks types that fit any row
+    (BIGINT, TEXT), for tables created from the first chunk of a stream.
+    Pass an explicit schema when the data has known bounds.
+    """
+    dtype = series.dtype
+
+    if pd.api.types.is_bool_dtype(dtype):
+        return "TINYINT(1)"
+
+    if pd.api.types.is_integer_dtype(dtype):
+        if not exact or series.isna().all():
+            return "BIGINT"
+        low, high = int(series.min()) * SCHEMA_HEADROOM, int(series.max()) * SCHEMA_HEADROOM
+        return "INT" if INT32_MIN <= low and high <= INT32_MAX else "BIGINT"
+
+    if pd.api.types.is_float_dtype(dtype):
+        return "DOUBLE"
+
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return "DATETIME"
+
+    if not exact:
+        return "TEXT"
+
+    values = series.dropna()
+    longest = int(values.astype(str).str.len().max()) if len(values) else 0
+    length = max(MIN_VARCHAR, 1 << (longest * SCHEMA_HEADROOM - 1).bit_length())
+    if length > MAX_VARCHAR:
+        return "TEXT"
+    return f"VARCHAR({length})"
+
+
+def infer_schema(df, exact=True):
+    """
+    Maps every column to an SQL type, e.g. {"salary": "DOUBLE"}
+    """
+    return {col: sql_type(df[col], exact) for col in df.columns}
+
+
+def create_indexes(conn, table_name, columns, schema=None):
+    """
+    Creates one index per column (prefix index for TEXT columns on MySQL)
+    """
+    schema = schema or {}
+    with managed_cursor(conn) as cursor:
+        for col in columns:
+            key = col
+            if schema.get(col, "TEXT") == "TEXT" and not is_sqlite(conn):
+                key = f"{col}({INDEX_PREFIX})"
+            cursor.execute(f"CREATE INDEX idx_{table_name}_{col} ON {table_name} ({key})")
+
+    logging.info(f"Indexes created on {table_name}: {list(columns)}")
+
+
 # ---------------- SAVE CLEAN DATA ----------------
-def save_to_db(df, conn, table_name):
+def create_table(df, conn, table_name, typed=True, exact=True, schema=None, primary_key=None):
     """
-    Creates new table & saves cleaned data
+    (Re)creates a table with the columns of the DataFrame
+
+    typed=False declares every column TEXT (the old behaviour); an
+    explicit `schema` overrides inference
+    Returns the column -> SQL type schema used
     """
-    cursor = conn.cursor()
+    if schema is None and typed:
+        schema = infer_schema(df, exact)
+    elif schema is None:
+        schema = {col: "TEXT" for col in df.columns}
+
+    cols = ", ".join([f"{c} {t}" for c, t in schema.items()])
+    if primary_key is not None:
+        cols += f", PRIMARY KEY ({primary_key})"
 
-    cursor.execute(f"DROP TABLE IF EXISTS {table_name}")
+    with managed_cursor(conn) as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {table_name}")
+        cursor.execute(f"CREATE TABLE {table_name} ({cols})")
+    QUERY_CACHE.invalidate_after_write(conn, table_name)
 
-    cols = ", ".join([f"{c} TEXT" for c in df.columns])
-    cursor.execute(f"CREATE TABLE {table_name} ({cols})")
+    return schema
+
+
+def save_to_db(df, conn, table_name, typed=True, indexes=None, mode="replace", key=None):
+    """
+    Creates new table & saves cleaned data
+
+    Column types are inferred from the DataFrame dtypes, so numeric
+    filters compare numbers (not strings) and can use `indexes`
+
+    mode="sync" upserts only the rows that changed (see sync_to_db)
+    instead of dropping and reloading the table
+    """
+    if mode == "sync":
+        return sync_to_db(df, conn, table_name, key=key, indexes=indexes)
+    if mode != "replace":
+        raise ValueError(f"Unknown save mode: {mode}")
+
+    schema = create_table(df, conn, table_name, typed)
 
     bulk_insert(df, conn, table_name)
+    if indexes:
+        create_indexes(conn, table_name, indexes, schema)
     logging.info(f"Cleaned data saved to '{table_name}'")
 
 
+def save_chunks_to_db(chunks, conn, table_name, batch_size=BULK_BATCH_SIZE, indexes=None):
+    """
+    Chunked writer: creates the table from the first chunk, then
+    bulk-inserts every chunk as it arrives
+
+    Returns the number of rows written
+    """
+    rows = 0
+    schema = {}
+    for i, chunk in enumerate(chunks):
+        if i == 0:
+            # later chunks may hold bigger ints / longer strings
+            schema = create_table(chunk, conn, table_name, exact=False)
+        bulk_insert(chunk, conn, table_name, batch_size=batch_size)
+        rows += len(chunk)
+
+    # indexing once after the load is cheaper than maintaining it per batch
+    if indexes and rows:
+        create_indexes(conn, table_name, indexes, schema)
+
+    logging.info(f"Streamed {rows} rows into '{table_name}'")
+    return rows
+
+
+# ---------------- INCREMENTAL SYNC ----------------
+def table_exists(conn, table_name):
+    """
+    True if the table exists in the current database
+    """
+    with managed_cursor(conn) as cursor:
+        if is_sqlite(conn):
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name = ?",
+                (table_name,),
+            )
+        else:
+            cursor.execute("SHOW TABLES LIKE %s", (table_name,))
+        return cursor.fetchone() is not None
+
+
+def row_hashes(df):
+    """
+    64-bit content hash per row, as signed ints so they fit a BIGINT
+
+    Hashes depend on dtypes: sync frames that went through the same
+    loading / cleaning steps
+    """
+    return pd.util.hash_pandas_object(df, index=False).to_numpy().view("int64")
+
+
+def _drop_temp_table(cursor, conn, name):
+    # plain DROP TABLE would implicitly commit on MySQL
+    keyword = "TABLE" if is_sqlite(conn) else "TEMPORARY TABLE"
+    cursor.execute(f"DROP {keyword} IF EXISTS {name}")
+
+
+def _upsert_sql(conn, table_name, staging, columns, key):
+    """
+    INSERT ... SELECT from the staging table that updates existing keys
+    """
+    col_list = ", ".join(columns)
+    insert = f"INSERT INTO {table_name} ({col_list}) SELECT {col_list} FROM {staging} s"
+
+    others = [col for col in columns if col != key]
+
+    if is_sqlite(conn):
+        # "WHERE true" keeps SQLite from reading ON as a join clause
+        updates = ", ".join(f"{col} = excluded.{col}" for col in others)
+        return f"{insert} WHERE true ON CONFLICT ({key}) DO UPDATE SET {updates}"
+
+    updates = ", ".join(f"{col} = s.{col}" for col in others)
+    return f"{insert} ON DUPLICATE KEY UPDATE {updates}"
+
+
+def sync_to_db(df, conn, table_name, key=None, delete_missing=True, indexes=None):
+    """
+    Incremental save: only inserted, updated or deleted rows hit the table
+
+    Rows are matched on `key` (primary key column) or, without a key, on
+    their content hash. Changed rows are staged in a temporary table and
+    upserted with INSERT ... ON DUPLICATE KEY UPDATE (ON CONFLICT on
+    SQLite); keys missing from `df` are deleted when `delete_missing`
+    (turn it off when `df` only holds new rows). Everything is applied in
+    one transaction.
+
+    Returns a dict with inserted, updated, deleted and unchanged counts
+    """
+    df = df.copy()
+    df[ROW_HASH_COLUMN] = row_hashes(df)
+
+    key = key or ROW_HASH_COLUMN
+    df = df.drop_duplicates(subset=key, keep="last")
+    columns = list(df.columns)
+
+    if not table_exists(conn, table_name):
+        schema = infer_schema(df, exact=False)
+        key_type = sql_type(df[key])
+        schema[key] = "VARCHAR(255)" if key_type.startswith(("VARCHAR", "TEXT")) else key_type
+
+        create_table(df, conn, table_name, schema=schema, primary_key=key)
+        bulk_insert(df, conn, table_name)
+        if indexes:
+            create_indexes(conn, table_name, indexes, schema)
+
+        stats = {"inserted": len(df), "updated": 0, "deleted": 0, "unchanged": 0}
+        logging.info(f"Sync created '{table_name}': {stats}")
+        return stats
+
+    # ---- diff against what the table holds ----
+    # without a key the hash column is the key: select it once
+    selected = key if key == ROW_HASH_COLUMN else f"{key}, {ROW_HASH_COLUMN}"
+    existing = pd.read_sql(f"SELECT {selected} FROM {table_name}", conn)
+    # nullable Int64 keeps the 64-bit hashes exact where keys are missing
+    lookup = pd.Series(
+        existing[ROW_HASH_COLUMN].to_numpy(), index=existing[key].to_numpy(), dtype="Int64"
+    )
+    old_hash = lookup.reindex(df[key].to_numpy())
+
+    inserted = old_hash.isna().to_numpy()
+    updated = ~inserted & (
+        old_hash.fillna(0).to_numpy(dtype="int64") != df[ROW_HASH_COLUMN].to_numpy()
+    )
+    changed = df[inserted | updated]
+
+    if delete_missing:
+        deleted = existing.loc[~existing[key].isin(df[key]), [key]]
+    else:
+        deleted = existing.iloc[0:0][[key]]
+
+    # ---- stage and apply in one transaction ----
+    staging = f"{table_name}_staging"
+    removals = f"{table_name}_deleted"
+
+    with transaction(conn) as tx:
+        with managed_cursor(tx) as cursor:
+            if len(changed):
+                _drop_temp_table(cursor, tx, staging)
+                cursor.execute(
+                    f"CREATE TEMPORARY TABLE {staging} AS SELECT {', '.join(columns)} "
+                    f"FROM {table_name} WHERE 1 = 0"
+                )
+                bulk_insert(changed, tx, staging)
+                cursor.execute(_upsert_sql(tx, table_name, staging, columns, key))
+                _drop_temp_table(cursor, tx, staging)
+
+            if len(deleted):
+                _drop_temp_table(cursor, tx, removals)
+                cursor.execute(
+                    f"CREATE TEMPORARY TABLE {removals} AS SELECT {key} "
+                    f"FROM {table_name} WHERE 1 = 0"
+                )
+                bulk_insert(deleted, tx, removals)
+                cursor.execute(
+                    f"DELETE FROM {table_name} WHERE {key} IN (SELECT {key} FROM {removals})"
+                )
+                _drop_temp_table(cursor, tx, removals)
+
+    QUERY_CACHE.invalidate_after_write(conn, table_name)
+
+    stats = {
+        "inserted": int(inserted.sum()),
+        "updated": int(updated.sum()),
+        "deleted": len(deleted),
+        "unchanged": len(df) - len(changed),
+    }
+    logging.info(f"Sync of '{table_name}': {stats}")
+    return stats
+
+
+def get_watermark(conn, table_name):
+    """
+    Last synced watermark value of a table (as stored, a string), or None
+    """
+    if not table_exists(conn, SYNC_STATE_TABLE):
+        return None
+
+    marker = _placeholder(conn)
+    with managed_cursor(conn) as cursor:
+        cursor.execute(
+            f"SELECT watermark FROM {SYNC_STATE_TABLE} WHERE table_name = {marker}",
+            (table_name,),
+        )
+        row = cursor.fetchone()
+    return None if row is None else row[0]
+
+
+def set_watermark(conn, table_name, watermark_column, value):
+    """
+    Records the high-water mark reached by the last sync of a table
+    """
+    marker = _placeholder(conn)
+    with managed_cursor(conn) as cursor:
+        cursor.execute(
+            f"CREATE TABLE IF NOT EXISTS {SYNC_STATE_TABLE} ("
+            "table_name VARCHAR(255) PRIMARY KEY, watermark_column VARCHAR(255), "
+            "watermark VARCHAR(255), updated_at DOUBLE)"
+        )
+        cursor.execute(
+            f"DELETE FROM {SYNC_STATE_TABLE} WHERE table_name = {marker}", (table_name,)
+        )
+        cursor.execute(
+            f"INSERT INTO {SYNC_STATE_TABLE} VALUES ({marker}, {marker}, {marker}, {marker})",
+            (table_name, watermark_column, str(value), time.time()),
+        )
+    conn.commit()
+
+
+def incremental_sync(source_conn, conn, source_table, table_name, key, watermark_column, transforms=()):
+    """
+    Reads only source rows past the stored high-water mark, applies
+    `transforms` (e.g. handle_missing) and upserts them into `table_name`
+
+    `watermark_column` must grow with every new or changed source row
+    (auto-increment id, updated_at timestamp, ...). Deletes are not
+    detected in this mode; run sync_to_db on a full load for that.
+    """
+    since = get_watermark(conn, table_name)
+    df = load_table(source_conn, source_table, watermark_column, since)
+
+    if df.empty:
+        logging.info(f"'{table_name}' is up to date (watermark {since})")
+        return {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+
+    watermark = df[watermark_column].max()
+    for transform in transforms:
+        df = transform(df)
+
+    stats = sync_to_db(df, conn, table_name, key=key, delete_missing=False)
+    set_watermark(conn, table_name, watermark_column, watermark)
+    return stats
+
+
 # ---------------- MAIN ----------------
 def main():
     table_name = "employee"
@@ -185,17 +772,34 @@ def main():
     df = remove_duplicates(df)
 
     # Save
-    save_to_db(df, conn, "cleaned_employee")
+    save_to_db(df, conn, "cleaned_employee", indexes=["salary"])
 
-    # Advanced operations demo
-    high_salary = fetch_filtered(conn, "salary > 50000")
+    # Sync mode keeps its own table (with a row_hash column); every run
+    # after the first upserts only what changed
+    # save_to_db(df, conn, "synced_employee", mode="sync", key="id")
+    # incremental_sync(conn, conn, table_name, "synced_employee", key="id",
+    #                  watermark_column="id", transforms=(handle_missing,))
+
+    # Advanced operations demo (repeated queries borrow pooled connections)
+    with get_pool().connection() as pooled:
+        high_salary = fetch_filtered(pooled, "salary > 50000")
     print("\nHigh salary employees:")
     print(high_salary.head())
+    logging.info(f"Query cache: {QUERY_CACHE.stats()}")
+
+    # Tables larger than RAM: stream, clean and write chunk by chunk
+    # (the writer needs its own connection while the reader streams)
+    # write_conn = connect_db()
+    # chunks = transform_chunks(stream_table(conn, table_name), handle_missing, remove_duplicates)
+    # save_chunks_to_db(chunks, write_conn, "cleaned_employee")
 
-    # update_record(conn, "department", "HR", "Human Resources")
-    # delete_record(conn, "salary < 20000")
+    # Batched CRUD: both statements share a single commit
+    # with transaction(conn) as tx:
+    #     update_record(tx, "department", "HR", "Human Resources")
+    #     delete_record(tx, "salary < 20000")
 
     conn.close()
+    get_pool().close()
     logging.info("Connection closed")
 
 
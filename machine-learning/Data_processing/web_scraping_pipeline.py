@@ -15,6 +15,14 @@ Key Learning Outcomes:
 4. Robust error handling for missing fields
 5. Pagination handling
 6. ML-ready DataFrame creation
+7. Connection reuse through a shared, pooled HTTP session
+8. Resumable crawls backed by an on-disk page cache
+9. Streaming records to disk in typed batches
+10. Retries with backoff and adaptive rate limiting
+11. Pipelined scraping: fetch threads + a process pool of parsers
+12. Compiled XPath extraction for fast re-parsing
+13. Raw-response archive and offline replay
+14. Per-stage latency and throughput metrics
 
 IMPORTANT:
 ----------
@@ -26,11 +34,31 @@ This script is for educational purposes only.
 # 1. IMPORT LIBRARIES
 # =========================
 
+import sys
+import os
+
+# ========== PATH SETUP (MUST COME FIRST) ==========
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import queue
+import threading
 import time
-import requests
+from collections import deque
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
 import numpy as np
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, UnicodeDammit
+from lxml import etree
+from lxml import html as lxml_html
+
+from Data_processing.crawl_metrics import CrawlMetrics, timed_get
+from Data_processing.http_session import connection_stats, get_session
+from Data_processing.page_cache import PageCache, cached_get
+from Data_processing.rate_limiting import AdaptiveController, report_dead_letters
+from Data_processing.response_archive import ResponseArchive
+from Data_processing.record_sinks import RecordSink
 
 
 # =========================
@@ -49,12 +77,38 @@ HEADERS = {
 
 REQUEST_DELAY = 1  # seconds (ethical scraping)
 
+CACHE_DIR = "cache/ambitionbox_pages"  # raw page checkpoints
+
+ARCHIVE_PATH = "archive/ambitionbox_companies"  # append-only raw response archive
+
+METRICS_PATH = "ambitionbox_crawl_metrics.json"  # per-run crawl metrics
+
+FETCH_WORKERS = 1  # fetcher threads (politeness first)
+PARSE_WORKERS = max(1, (os.cpu_count() or 2) - 1)  # parser processes
+PARSE_ENGINE = "lxml"  # "lxml" (compiled XPath) or "bs4" (BeautifulSoup)
+
+# Output schema: field -> pandas dtype (all fields are scraped text)
+COMPANY_SCHEMA = {
+    "name": "string",
+    "rating": "string",
+    "reviews": "string",
+    "company_type": "string",
+    "headquarters": "string",
+    "company_age": "string",
+    "employee_count": "string",
+}
+
 
 # =========================
 # 3. HELPER FUNCTION
 # =========================
 
-def get_soup(url: str) -> BeautifulSoup:
+def get_soup(
+    url: str,
+    cache: PageCache = None,
+    archive: ResponseArchive = None,
+    metrics: CrawlMetrics = None,
+) -> BeautifulSoup:
     """
     Downloads a webpage and returns a BeautifulSoup object.
 
@@ -62,6 +116,12 @@ def get_soup(url: str) -> BeautifulSoup:
     ----------
     url : str
         Target webpage URL
+    cache : PageCache, optional
+        Checkpoint store; cached pages are served from disk
+    archive : ResponseArchive, optional
+        Every downloaded page is also appended to this archive
+    metrics : CrawlMetrics, optional
+        Receives request timings, bytes and status codes
 
     Returns
     -------
@@ -72,9 +132,54 @@ def get_soup(url: str) -> BeautifulSoup:
     ------
     HTTPError if request fails
     """
-    response = requests.get(url, headers=HEADERS, timeout=10)
+    html = fetch_html(url, cache, archive, metrics)
+
+    if metrics is None:
+        return BeautifulSoup(html, "lxml")
+    with metrics.timer("parse"):
+        return BeautifulSoup(html, "lxml")
+
+
+def fetch_html(
+    url: str,
+    cache: PageCache = None,
+    archive: ResponseArchive = None,
+    metrics: CrawlMetrics = None,
+) -> bytes:
+    """
+    Downloads a webpage and returns its raw bytes, without parsing.
+
+    Parameters
+    ----------
+    url : str
+        Target webpage URL
+    cache : PageCache, optional
+        Checkpoint store; cached pages are served from disk
+    archive : ResponseArchive, optional
+        Every downloaded page is also appended to this archive
+    metrics : CrawlMetrics, optional
+        Receives request timings, bytes and status codes
+
+    Returns
+    -------
+    bytes
+        Raw HTML
+
+    Raises
+    ------
+    HTTPError if request fails
+    """
+    if cache is not None:
+        return cached_get(
+            get_session(), cache, url,
+            headers=HEADERS, archive=archive, metrics=metrics,
+        )
+
+    response = timed_get(get_session(), url, metrics, headers=HEADERS, timeout=10)
     response.raise_for_status()
-    return BeautifulSoup(response.text, "lxml")
+    if archive is not None:
+        archive.append(url, response.content)
+    return response.content
 
 
 # =========================
@@ -116,11 +221,275 @@ def extract_company_data(company_card) -> dict:
     }
 
 
+def _class_test(name: str) -> str:
+    """XPath predicate matching one class token, like bs4's `class_=`."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def page_encoding(html: bytes, declared: str = None) -> str:
+    """
+    Encoding of a raw page: `declared` (e.g. the response charset) if it
+    decodes the page, otherwise what BeautifulSoup would detect (BOM,
+    <meta charset>, then UTF-8 / windows-1252).
+    """
+    return UnicodeDammit(html, [declared] if declared else [], is_html=True).original_encoding
+
+
+@lru_cache(maxsize=None)
+def _html_parser(encoding: str):
+    return lxml_html.HTMLParser(encoding=encoding)
+
+
+def parse_html_tree(html, encoding: str = None):
+    """
+    lxml document of a raw page, decoded like the bs4 engine decodes it.
+
+    libxml2 falls back to Latin-1 for pages without a <meta charset>, so
+    raw bytes are never handed to it undecided.
+    """
+    if isinstance(html, str):
+        return lxml_html.document_fromstring(html)
+    parser = _html_parser(page_encoding(html, encoding))
+    return lxml_html.document_fromstring(html, parser=parser)
+
+
+class CompiledCompanyExtractor:
+    """
+    Fast alternative to `extract_company_data` built on compiled XPath.
+
+    All selectors are compiled once. Each `company-content-wrapper` card
+    is then scanned with a single union query that returns its heading,
+    rating, review link and info entities in document order, instead of
+    one full-subtree `find` per field. Output is identical to the
+    BeautifulSoup path (same fields, same order, NaN when missing).
+    """
+
+    INFO_FIELDS = ("company_type", "headquarters", "company_age", "employee_count")
+
+    def __init__(self):
+        self.cards = etree.XPath(f"//div[{_class_test('company-content-wrapper')}]")
+        self.card_nodes = etree.XPath(
+            ".//h2"
+            f" | .//p[{_class_test('rating')} or {_class_test('infoEntity')}]"
+            f" | .//a[{_class_test('review-count')}]"
+        )
+
+    @staticmethod
+    def _text(node) -> str:
+        return str(node.text_content()).strip()
+
+    def extract_card(self, card) -> dict:
+        """Extracts one company card (an lxml element)."""
+        name = rating = reviews = None
+        info_entities = []
+
+        for node in self.card_nodes(card):
+            if node.tag == "h2":
+                if name is None:
+                    name = self._text(node)
+            elif node.tag == "a":
+                if reviews is None:
+                    reviews = self._text(node)
+            else:
+                classes = (node.get("class") or "").split()
+                if "rating" in classes and rating is None:
+                    rating = self._text(node)
+                if "infoEntity" in classes:
+                    info_entities.append(node)
+
+        record = {
+            "name": np.nan if name is None else name,
+            "rating": np.nan if rating is None else rating,
+            "reviews": np.nan if reviews is None else reviews,
+        }
+        for i, field in enumerate(self.INFO_FIELDS):
+            if i < len(info_entities):
+                record[field] = self._text(info_entities[i])
+            else:
+                record[field] = np.nan
+
+        return record
+
+    def extract(self, html, encoding: str = None) -> list:
+        """
+        Extracts every company card of a raw HTML page.
+
+        Parameters
+        ----------
+        html : bytes or str
+            Raw page HTML
+        encoding : str, optional
+            Charset of the response, if known (see `page_encoding`)
+
+        Returns
+        -------
+        list
+            One record dict per company card
+        """
+        if not html or not html.strip():
+            return []
+        return self.extract_tree(parse_html_tree(html, encoding))
+
+    def extract_tree(self, root) -> list:
+        """Extracts every company card of an already parsed document."""
+        return [self.extract_card(card) for card in self.cards(root)]
+
+
+COMPANY_EXTRACTOR = CompiledCompanyExtractor()
+
+
+def parse_company_page(html: bytes, engine: str = PARSE_ENGINE, encoding: str = None) -> list:
+    """
+    Parses one raw HTML page into plain company records.
+
+    Kept at module level (and free of shared state) so it can run inside
+    a worker process.
+
+    Parameters
+    ----------
+    html : bytes
+        Raw page HTML
+    engine : str
+        "lxml" for the compiled XPath extractor, "bs4" for BeautifulSoup
+        + `extract_company_data`
+    encoding : str, optional
+        Charset of the response, if known; otherwise it is detected the
+        same way for both engines
+
+    Returns
+    -------
+    list
+        One `extract_company_data`-style dict per company card
+    """
+    if engine == "lxml":
+        return COMPANY_EXTRACTOR.extract(html, encoding)
+    if engine != "bs4":
+        raise ValueError(f"Unknown parse engine: {engine}")
+
+    soup = BeautifulSoup(html, "lxml", from_encoding=encoding)
+    company_cards = soup.find_all("div", class_="company-content-wrapper")
+    return [extract_company_data(card) for card in company_cards]
+
+
+def parse_company_page_timed(html: bytes, engine: str = PARSE_ENGINE, encoding: str = None) -> tuple:
+    """
+    `parse_company_page` that also reports where its time went.
+
+    Returns
+    -------
+    tuple
+        (records, parse_seconds, extract_seconds): document parsing and
+        card extraction timed separately, so worker processes can send
+        their timings back to the parent's CrawlMetrics
+    """
+    start = time.perf_counter()
+
+    if engine == "lxml":
+        if not html or not html.strip():
+            return [], 0.0, 0.0
+        root = parse_html_tree(html, encoding)
+        parsed = time.perf_counter()
+        records = COMPANY_EXTRACTOR.extract_tree(root)
+    elif engine == "bs4":
+        soup = BeautifulSoup(html, "lxml", from_encoding=encoding)
+        parsed = time.perf_counter()
+        company_cards = soup.find_all("div", class_="company-content-wrapper")
+        records = [extract_company_data(card) for card in company_cards]
+    else:
+        raise ValueError(f"Unknown parse engine: {engine}")
+
+    return records, parsed - start, time.perf_counter() - parsed
+
+
+def iter_parsed_pages(
+    html_pages,
+    workers: int = PARSE_WORKERS,
+    engine: str = PARSE_ENGINE,
+    metrics: CrawlMetrics = None,
+):
+    """
+    Parses pages in a process pool while preserving their order.
+
+    Parameters
+    ----------
+    html_pages : iterable
+        (page, html_bytes) pairs in page order; html may be None for a
+        page that could not be fetched
+    workers : int
+        Parser processes (1 = parse in the current process)
+    engine : str
+        Extraction engine passed to `parse_company_page`
+    metrics : CrawlMetrics, optional
+        Receives the parse / extract time of every page
+
+    Yields
+    ------
+    tuple
+        (page, records) in the same order as `html_pages`
+    """
+
+    def result(parsed):
+        if parsed is None:
+            return []
+        records, parse_seconds, extract_seconds = parsed
+        if metrics is not None:
+            metrics.observe("parse", parse_seconds)
+            metrics.observe("extract", extract_seconds)
+        return records
+
+    if workers <= 1:
+        for page, html in html_pages:
+            yield page, result(
+                None if html is None else parse_company_page_timed(html, engine)
+            )
+        return
+
+    max_backlog = workers * 4  # bounds raw HTML held in memory
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        backlog = deque()
+
+        for page, html in html_pages:
+            if html is None:
+                future = None
+            else:
+                future = pool.submit(parse_company_page_timed, html, engine)
+            backlog.append((page, future))
+
+            # emit every page at the head of the queue that is already done
+            while backlog and (backlog[0][1] is None or backlog[0][1].done()):
+                head_page, head = backlog.popleft()
+                yield head_page, result(None if head is None else head.result())
+
+            if len(backlog) >= max_backlog:
+                head_page, head = backlog.popleft()
+                yield head_page, result(None if head is None else head.result())
+
+        for page, future in backlog:
+            yield page, result(None if future is None else future.result())
+
+
+def companies_frame(records: list, schema: dict = COMPANY_SCHEMA) -> pd.DataFrame:
+    """
+    Builds the company DataFrame, typed by `schema`; missing fields are
+    <NA> and the columns exist even when no company was scraped.
+    """
+    return pd.DataFrame(records, columns=list(schema)).astype(schema)
+
+
 # =========================
 # 5. PAGINATION SCRAPER
 # =========================
 
-def scrape_companies(start_page: int = 1, end_page: int = 5) -> pd.DataFrame:
+def scrape_companies(
+    start_page: int = 1,
+    end_page: int = 5,
+    cache: PageCache = None,
+    sink: RecordSink = None,
+    controller: AdaptiveController = None,
+    archive: ResponseArchive = None,
+    metrics: CrawlMetrics = None,
+) -> pd.DataFrame:
     """
     Scrapes company data across multiple pages.
 
@@ -130,49 +499,297 @@ def scrape_companies(start_page: int = 1, end_page: int = 5) -> pd.DataFrame:
         Starting page number
     end_page : int
         Ending page number (inclusive)
+    cache : PageCache, optional
+        Checkpoint store; pages already cached cost no network request,
+        so a crashed crawl resumes from the first missing page
+    sink : RecordSink, optional
+        If given, records are streamed to the sink page by page instead
+        of being accumulated in memory
+    controller : AdaptiveController, optional
+        Retry / rate controller; pages that exhaust their retries end up
+        in `controller.dead_letters` (one is created if not given)
+    archive : ResponseArchive, optional
+        Raw-response archive every downloaded page is appended to
+    metrics : CrawlMetrics, optional
+        Collects per-stage timings and throughput for this crawl
 
     Returns
     -------
-    pd.DataFrame
-        Consolidated company dataset
+    pd.DataFrame or None
+        Consolidated company dataset, typed by COMPANY_SCHEMA (None when
+        a sink is used)
     """
 
     all_records = []
 
+    if controller is None:
+        controller = AdaptiveController(rate=1 / REQUEST_DELAY)
+
+    if metrics is not None:
+        metrics.attach(get_session())
+
+    if cache is not None:
+        pages = range(start_page, end_page + 1)
+        done = cache.first_missing([(BASE_URL.format(page),) for page in pages])
+        if 0 < done < len(pages):
+            print(f"[INFO] Resuming from page {pages[done]} ({done} pages cached)")
+
     for page in range(start_page, end_page + 1):
         print(f"[INFO] Scraping page {page}")
+        url = BASE_URL.format(page)
+        from_disk = cache is not None and cache.is_fresh(url)
 
-        try:
-            soup = get_soup(BASE_URL.format(page))
-        except Exception as e:
-            print(f"[ERROR] Failed to fetch page {page}: {e}")
+        soup = controller.call(
+            page, get_soup, url, cache, archive, metrics, paced=not from_disk
+        )
+        if soup is None:
             continue
 
+        extract_start = time.perf_counter()
         company_cards = soup.find_all("div", class_="company-content-wrapper")
 
-        for card in company_cards:
-            record = extract_company_data(card)
-            all_records.append(record)
+        page_records = [extract_company_data(card) for card in company_cards]
+        if metrics is not None:
+            metrics.observe("extract", time.perf_counter() - extract_start)
+            metrics.record_page(len(page_records))
+
+        if sink is not None:
+            sink.write_many(page_records)
+        else:
+            all_records.extend(page_records)
+
+    report_dead_letters(controller)
+
+    if metrics is not None:
+        metrics.finish()
+
+    if sink is not None:
+        sink.flush()
+        return None
+
+    return companies_frame(all_records)
+
+
+# =========================
+# 6. PIPELINED SCRAPER
+# =========================
+
+def scrape_companies_pipelined(
+    start_page: int = 1,
+    end_page: int = 5,
+    cache: PageCache = None,
+    sink: RecordSink = None,
+    controller: AdaptiveController = None,
+    fetch_workers: int = FETCH_WORKERS,
+    parse_workers: int = PARSE_WORKERS,
+    engine: str = PARSE_ENGINE,
+    archive: ResponseArchive = None,
+    metrics: CrawlMetrics = None,
+) -> pd.DataFrame:
+    """
+    Scrapes company data with fetching and parsing overlapped.
+
+    Fetcher threads only do I/O and push raw HTML bytes onto a bounded
+    queue; a process pool runs `parse_company_page` on them, so CPU spent
+    in BeautifulSoup no longer delays the next request. Output matches
+    `scrape_companies`.
+
+    Parameters
+    ----------
+    start_page : int
+        Starting page number
+    end_page : int
+        Ending page number (inclusive)
+    cache : PageCache, optional
+        Checkpoint store for raw pages
+    sink : RecordSink, optional
+        If given, records are streamed to the sink in page order
+    controller : AdaptiveController, optional
+        Retry / rate controller shared by the fetcher threads
+    fetch_workers : int
+        Number of fetcher threads
+    parse_workers : int
+        Number of parser processes
+    engine : str
+        Extraction engine: "lxml" (compiled XPath) or "bs4"
+    archive : ResponseArchive, optional
+        Raw-response archive every downloaded page is appended to
+    metrics : CrawlMetrics, optional
+        Collects per-stage timings and throughput for this crawl
+
+    Returns
+    -------
+    pd.DataFrame or None
+        Consolidated company dataset, typed by COMPANY_SCHEMA (None when
+        a sink is used)
+    """
+
+    if controller is None:
+        controller = AdaptiveController(rate=1 / REQUEST_DELAY)
+
+    if metrics is not None:
+        metrics.attach(get_session())
+
+    todo = queue.Queue()
+    for page in range(start_page, end_page + 1):
+        todo.put(page)
+
+    fetched = queue.Queue(maxsize=max(parse_workers, 1) * 4)
+
+    def fetcher():
+        while True:
+            try:
+                page = todo.get_nowait()
+            except queue.Empty:
+                return
+
+            print(f"[INFO] Scraping page {page}")
+            url = BASE_URL.format(page)
+            from_disk = cache is not None and cache.is_fresh(url)
+            html = controller.call(
+                page, fetch_html, url, cache, archive, metrics, paced=not from_disk
+            )
+            fetched.put((page, html))
+
+    threads = [
+        threading.Thread(target=fetcher, daemon=True)
+        for _ in range(max(fetch_workers, 1))
+    ]
+    for thread in threads:
+        thread.start()
+
+    def fetched_in_order():
+        # several fetchers may finish out of order; restore page order
+        early = {}
+        for page in range(start_page, end_page + 1):
+            while page not in early:
+                fetched_page, html = fetched.get()
+                early[fetched_page] = html
+            yield page, early.pop(page)
+
+    all_records = []
+
+    parsed = iter_parsed_pages(fetched_in_order(), parse_workers, engine, metrics)
+
+    for page, page_records in parsed:
+        if metrics is not None:
+            metrics.record_page(len(page_records))
+        if sink is not None:
+            sink.write_many(page_records)
+        else:
+            all_records.extend(page_records)
+
+    for thread in threads:
+        thread.join()
+
+    report_dead_letters(controller)
+
+    if metrics is not None:
+        metrics.finish()
+
+    if sink is not None:
+        sink.flush()
+        return None
+
+    return companies_frame(all_records)
+
+
+# =========================
+# 7. OFFLINE REPLAY
+# =========================
+
+def replay_companies(
+    archive: ResponseArchive,
+    start_page: int = 1,
+    end_page: int = 5,
+    at: float = None,
+    parse_workers: int = PARSE_WORKERS,
+    engine: str = PARSE_ENGINE,
+    metrics: CrawlMetrics = None,
+) -> pd.DataFrame:
+    """
+    Re-runs the extraction pipeline over archived pages, without network.
+
+    Pages are read from the memory-mapped archive and parsed by the same
+    process pool as `scrape_companies_pipelined`, so replay runs at full
+    CPU speed.
+
+    Parameters
+    ----------
+    archive : ResponseArchive
+        Archive written by a previous crawl
+    start_page : int
+        First page to replay
+    end_page : int
+        Last page to replay (inclusive)
+    at : float, optional
+        Replay the crawl as it was at this Unix time (default: newest)
+    parse_workers : int
+        Number of parser processes
+    engine : str
+        Extraction engine: "lxml" (compiled XPath) or "bs4"
+    metrics : CrawlMetrics, optional
+        Collects parse / extract timings, e.g. to benchmark a parser change
 
-        time.sleep(REQUEST_DELAY)
+    Returns
+    -------
+    pd.DataFrame
+        Consolidated company dataset, typed by COMPANY_SCHEMA
+    """
 
-    return pd.DataFrame(all_records)
+    missing = []
+
+    def archived_pages():
+        for page in range(start_page, end_page + 1):
+            html = archive.get(BASE_URL.format(page), at)
+            if html is None:
+                missing.append(page)
+            yield page, html
+
+    all_records = []
+    parsed = iter_parsed_pages(archived_pages(), parse_workers, engine, metrics)
+    for page, page_records in parsed:
+        if metrics is not None:
+            metrics.record_page(len(page_records))
+        all_records.extend(page_records)
+
+    if metrics is not None:
+        metrics.finish()
+
+    if missing:
+        print(f"[WARN] {len(missing)} page(s) not in archive: {missing}")
+
+    return companies_frame(all_records)
 
 
 # =========================
-# 6. MAIN EXECUTION
+# 8. MAIN EXECUTION
 # =========================
 
 if __name__ == "__main__":
 
-    df = scrape_companies(start_page=1, end_page=10)
+    cache = PageCache(CACHE_DIR, evict_after=7 * 24 * 3600)
+    cache.evict()
+
+    metrics = CrawlMetrics("ambitionbox_companies")
+
+    with ResponseArchive(ARCHIVE_PATH) as archive:
+        df = scrape_companies_pipelined(
+            start_page=1, end_page=10, cache=cache, archive=archive,
+            metrics=metrics,
+        )
 
     print("\n[INFO] Dataset preview:")
     print(df.head())
 
     print("\n[INFO] Dataset shape:", df.shape)
+    print("[INFO] HTTP connections:", connection_stats())
+
+    metrics.to_json(METRICS_PATH)
+    print("\n[INFO] Crawl metrics (Prometheus format):")
+    print(metrics.to_prometheus())
 
     # Dataset is now ML-ready:
     # - Rows = samples
     # - Columns = features
-    # - Missing values handled as NaN
+    # - Missing values handled as <NA> (string columns, see COMPANY_SCHEMA)
@@ -10,7 +10,6 @@ import os
 # ========== PATH SETUP ==========
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-import pandas as pd
 import numpy as np
 
 from sklearn.model_selection import train_test_split
@@ -21,13 +20,14 @@ from Data_processing.preprocessing import (
     encode_extracurricular,
     scale_features
 )
+from Data_processing.dataset_cache import read_csv_cached
 
 # ========== PATH ==========
 BASE_DIR = os.path.dirname(__file__)
 DATA_PATH = os.path.join(BASE_DIR, "..", "Datasets", "StudentPerformance.csv")
 
 # ========== LOAD DATA ==========
-df = pd.read_csv(DATA_PATH)
+df = read_csv_cached(DATA_PATH)
 
 TARGET = "Performance Index"
 
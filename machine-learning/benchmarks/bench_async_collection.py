@@ -0,0 +1,69 @@
+"""
+File: bench_async_collection.py
+Author: Khyati Sharma
+
+Purpose:
+--------
+Throughput benchmark: serial `collect_movies` loop vs. the asyncio
+collection mode, both run against the local stub server.
+
+Both modes use the same average request rate, so the difference comes
+purely from overlapping network waits.
+
+Usage:
+    python benchmarks/bench_async_collection.py --pages 40 --latency 0.1
+"""
+
+import sys
+import os
+
+# ========== PATH SETUP (MUST COME FIRST) ==========
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import time
+
+import pandas as pd
+
+from Data_processing import api_data_collection_pipeline as api
+from benchmarks.stub_server import start_stub_server
+
+
+def run(pages: int, latency: float, rate: float, max_in_flight: int) -> None:
+    server, base_url = start_stub_server(latency=latency)
+    api.REQUEST_DELAY = 1 / rate
+
+    try:
+        start = time.perf_counter()
+        serial_df = api.collect_movies(1, pages, base_url=base_url)
+        serial_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        async_df = api.collect_movies(
+            1,
+            pages,
+            base_url=base_url,
+            max_in_flight=max_in_flight,
+            requests_per_second=rate,
+        )
+        async_time = time.perf_counter() - start
+    finally:
+        server.shutdown()
+
+    pd.testing.assert_frame_equal(serial_df, async_df)
+
+    print("\n[RESULT] pages:", pages, "| latency:", latency, "s | rate:", rate, "req/s")
+    print(f"[RESULT] serial: {serial_time:.2f}s ({pages / serial_time:.1f} pages/s)")
+    print(f"[RESULT] async : {async_time:.2f}s ({pages / async_time:.1f} pages/s)")
+    print(f"[RESULT] speedup: {serial_time / async_time:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--rate", type=float, default=20.0)
+    parser.add_argument("--max-in-flight", type=int, default=8)
+    args = parser.parse_args()
+
+    run(args.pages, args.latency, args.rate, args.max_in_flight)
@@ -0,0 +1,97 @@
+"""
+File: bench_bulk_insert.py
+Author: Khyati Sharma
+
+Purpose:
+--------
+Micro-benchmark: the old `iterrows` + single `executemany` insert vs.
+`sql_handling.bulk_insert` (column-wise tuples, batched multi-row VALUES).
+
+Runs against an in-memory SQLite database, so no MySQL server is needed.
+
+Usage:
+    python benchmarks/bench_bulk_insert.py --rows 1000000
+"""
+
+import sys
+import os
+
+# ========== PATH SETUP (MUST COME FIRST) ==========
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import sqlite3
+import time
+
+import numpy as np
+import pandas as pd
+
+from Data_processing.sql_handling import bulk_insert
+
+
+def make_frame(n_rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "id": np.arange(n_rows),
+        "name": [f"employee_{i}" for i in range(n_rows)],
+        "department": rng.choice(["HR", "IT", "Sales", "Ops"], n_rows),
+        "salary": rng.normal(50000, 15000, n_rows).round(2),
+        "age": rng.integers(20, 65, n_rows),
+    })
+    df.loc[df.sample(frac=0.01, random_state=0).index, "salary"] = np.nan
+    return df
+
+
+def fresh_db() -> sqlite3.Connection:
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE employee (id INTEGER, name TEXT, department TEXT, "
+        "salary REAL, age INTEGER)"
+    )
+    return conn
+
+
+def iterrows_insert(df: pd.DataFrame, conn: sqlite3.Connection) -> None:
+    placeholders = ", ".join(["?"] * len(df.columns))
+    # .item() turns numpy scalars into something sqlite3 accepts
+    data = [
+        tuple(v.item() if hasattr(v, "item") else v for v in row)
+        for _, row in df.iterrows()
+    ]
+    conn.executemany(f"INSERT INTO employee VALUES ({placeholders})", data)
+    conn.commit()
+
+
+def timed(func, df: pd.DataFrame) -> tuple:
+    conn = fresh_db()
+    start = time.perf_counter()
+    func(df, conn)
+    seconds = time.perf_counter() - start
+    count = conn.execute("SELECT COUNT(*) FROM employee").fetchone()[0]
+    conn.close()
+    return seconds, count
+
+
+def run(n_rows: int, batch_size: int) -> None:
+    df = make_frame(n_rows)
+
+    old_time, old_count = timed(iterrows_insert, df)
+    new_time, new_count = timed(
+        lambda frame, conn: bulk_insert(frame, conn, "employee", batch_size=batch_size),
+        df,
+    )
+    assert old_count == new_count == n_rows
+
+    print(f"[RESULT] rows: {n_rows}")
+    print(f"[RESULT] iterrows   : {old_time:.3f}s ({n_rows / old_time:,.0f} rows/s)")
+    print(f"[RESULT] bulk_insert: {new_time:.3f}s ({n_rows / new_time:,.0f} rows/s)")
+    print(f"[RESULT] speedup: {old_time / new_time:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    run(args.rows, args.batch_size)
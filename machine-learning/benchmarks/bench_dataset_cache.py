@@ -0,0 +1,102 @@
+"""
+File: bench_dataset_cache.py
+Author: Khyati Sharma
+
+Purpose:
+--------
+Benchmark: `pd.read_csv` vs. `dataset_cache.read_csv_cached`, cold
+(parse + write the Feather copy) and warm (memory-mapped copy), for
+every CSV in `Datasets/`.
+
+The bundled datasets are small; `--rows` adds a synthetic CSV of that
+size to show how the gap grows with the file. Copies are written to a
+temporary directory, so the real `.dataset_cache` is left untouched.
+
+Usage:
+    python benchmarks/bench_dataset_cache.py
+    python benchmarks/bench_dataset_cache.py --rows 1000000 --repeat 5
+"""
+
+import sys
+import os
+
+# ========== PATH SETUP (MUST COME FIRST) ==========
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import glob
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from Data_processing.dataset_cache import clear_cache, read_csv_cached
+
+DATASETS_DIR = os.path.join(os.path.dirname(__file__), "..", "Datasets")
+
+
+def build_csv(path: str, n_rows: int) -> None:
+    rng = np.random.default_rng(0)
+    pd.DataFrame({
+        "id": np.arange(n_rows),
+        "city": rng.choice(["Delhi", "Mumbai", "Pune", "Chennai"], n_rows),
+        "score": rng.normal(60, 15, n_rows).round(2),
+        "hours": rng.integers(1, 10, n_rows),
+        "passed": rng.random(n_rows) > 0.3,
+    }).to_csv(path, index=False)
+
+
+def best_of(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def run(path: str, cache_dir: str, repeat: int) -> None:
+    plain = best_of(lambda: pd.read_csv(path), repeat)
+
+    def cold():
+        clear_cache(path, cache_dir)
+        read_csv_cached(path, cache_dir)
+
+    cold_time = best_of(cold, repeat)
+    warm_time = best_of(lambda: read_csv_cached(path, cache_dir), repeat)
+
+    # touched file: same content, new mtime -> re-hash but no re-parse
+    os.utime(path)
+    touched_time = best_of(lambda: (os.utime(path), read_csv_cached(path, cache_dir)), repeat)
+
+    pd.testing.assert_frame_equal(pd.read_csv(path), read_csv_cached(path, cache_dir))
+
+    name = os.path.basename(path)
+    size_mb = os.path.getsize(path) / 1e6
+    print(f"[RESULT] {name} ({size_mb:.2f} MB)")
+    print(f"[RESULT]   read_csv       : {plain * 1000:8.1f} ms")
+    print(f"[RESULT]   cached (cold)  : {cold_time * 1000:8.1f} ms")
+    print(f"[RESULT]   cached (warm)  : {warm_time * 1000:8.1f} ms  ({plain / warm_time:.1f}x)")
+    print(f"[RESULT]   cached (touched): {touched_time * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=0, help="also benchmark a synthetic CSV")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for source in sorted(glob.glob(os.path.join(DATASETS_DIR, "*.csv"))):
+            paths.append(shutil.copy2(source, tmp))
+        if args.rows:
+            synthetic = os.path.join(tmp, "synthetic.csv")
+            build_csv(synthetic, args.rows)
+            paths.append(synthetic)
+
+        cache_dir = os.path.join(tmp, "cache")
+        for path in paths:
+            run(path, cache_dir, args.repeat)
@@ -0,0 +1,93 @@
+"""
+File: bench_datetime_parsing.py
+Author: Khyati Sharma
+
+Purpose:
+--------
+Benchmark: per-column `pd.to_datetime(errors="coerce")` without a
+format (the old `convert_datetime`) vs. `json_handling.convert_datetime`
+with cached per-column formats, sequential / thread pool / process pool.
+
+The frame has `created_at` (ISO-like) and `updated_at` (day-first,
+"%d/%m/%Y %H:%M") string columns of --rows values each.
+
+Usage:
+    python benchmarks/bench_datetime_parsing.py --rows 1000000
+"""
+
+import sys
+import os
+
+# ========== PATH SETUP (MUST COME FIRST) ==========
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from Data_processing import json_handling
+from Data_processing.json_handling import convert_datetime
+
+COLUMNS = ["created_at", "updated_at"]
+
+
+def build_frame(n_rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    start = pd.Timestamp("2020-01-01").value // 10**9
+    created = pd.to_datetime(rng.integers(start, start + 4 * 365 * 86400, n_rows), unit="s")
+    updated = created + pd.to_timedelta(rng.integers(0, 30 * 86400, n_rows), unit="s")
+    return pd.DataFrame({
+        "created_at": created.strftime("%Y-%m-%d %H:%M:%S"),
+        "updated_at": updated.strftime("%d/%m/%Y %H:%M"),
+    })
+
+
+def baseline(df: pd.DataFrame) -> pd.DataFrame:
+    for col in COLUMNS:
+        df[col] = pd.to_datetime(df[col], errors="coerce")
+    return df
+
+
+def timed(fn, df: pd.DataFrame):
+    df = df.copy()
+    start = time.perf_counter()
+    result = fn(df)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    df = build_frame(args.rows)
+    print(f"[INFO] {args.rows} rows x {len(COLUMNS)} columns")
+
+    try:
+        ref, base_time = timed(baseline, df)
+        print(f"[RESULT] to_datetime, no format : {base_time:.3f}s")
+    except (ValueError, TypeError) as e:   # pandas 2 refuses mixed inference
+        ref, base_time = None, None
+        print(f"[RESULT] to_datetime, no format : failed ({e.__class__.__name__})")
+
+    json_handling.DATETIME_FORMATS.clear()
+    first, infer_time = timed(lambda d: convert_datetime(d, COLUMNS, workers=1), df)
+    print(f"[RESULT] cached format (cold)   : {infer_time:.3f}s  {json_handling.DATETIME_FORMATS}")
+
+    runs = [
+        ("cached format, sequential", dict(workers=1)),
+        ("cached format, threads", dict(executor="thread")),
+        ("cached format, processes", dict(executor="process")),
+    ]
+    for name, kwargs in runs:
+        result, seconds = timed(lambda d: convert_datetime(d, COLUMNS, **kwargs), df)
+        pd.testing.assert_frame_equal(result, first)
+        speedup = f"  ({base_time / seconds:.1f}x)" if base_time else ""
+        print(f"[RESULT] {name:<25}: {seconds:.3f}s{speedup}")
+
+    if ref is not None:
+        # day-first updated_at is where format-less parsing goes wrong
+        mismatches = (ref["updated_at"] != first["updated_at"]).sum()
+        print(f"[RESULT] updated_at values parsed differently without a format: {mismatches}")
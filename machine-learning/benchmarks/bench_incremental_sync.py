@@ -0,0 +1,107 @@
+"""
+File: bench_incremental_sync.py
+Author: Khyati Sharma
+
+Purpose:
+--------
+Benchmark: full reload (`save_to_db(mode="replace")`) vs. incremental
+`save_to_db(mode="sync")` when only a few rows change between runs.
+
+Both sync modes are run twice on the same table: matched on the `id`
+key, and without a key (rows matched on their content hash). The
+script checks the reported counts and the table contents after every
+second sync before reporting timings.
+
+Runs against on-disk SQLite databases, so no MySQL server is needed.
+
+Usage:
+    python benchmarks/bench_incremental_sync.py --rows 200000 --changed 1000
+"""
+
+import sys
+import os
+
+# ========== PATH SETUP (MUST COME FIRST) ==========
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import sqlite3
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from Data_processing.sql_handling import ROW_HASH_COLUMN, save_to_db
+
+
+def make_frame(n_rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "id": np.arange(n_rows),
+        "name": [f"employee_{i}" for i in range(n_rows)],
+        "department": rng.choice(["HR", "IT", "Sales", "Ops"], n_rows),
+        "salary": rng.normal(50000, 15000, n_rows).round(2),
+    })
+
+
+def change_rows(df: pd.DataFrame, n_changed: int) -> pd.DataFrame:
+    changed = df.copy()
+    changed.loc[changed.index[:n_changed], "salary"] += 1000
+    return changed
+
+
+def timed(fn) -> tuple:
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def stored(conn: sqlite3.Connection, table: str) -> pd.DataFrame:
+    df = pd.read_sql(f"SELECT * FROM {table}", conn)
+    return df.drop(columns=[ROW_HASH_COLUMN], errors="ignore").sort_values("id").reset_index(drop=True)
+
+
+def run(n_rows: int, n_changed: int) -> None:
+    first = make_frame(n_rows)
+    second = change_rows(first, n_changed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, "sync.db"))
+
+        save_to_db(first, conn, "employee_full")
+        _, full_time = timed(lambda: save_to_db(second, conn, "employee_full"))
+
+        save_to_db(first, conn, "employee_keyed", mode="sync", key="id")
+        keyed, keyed_time = timed(
+            lambda: save_to_db(second, conn, "employee_keyed", mode="sync", key="id")
+        )
+        assert keyed == {"inserted": 0, "updated": n_changed, "deleted": 0,
+                         "unchanged": n_rows - n_changed}, keyed
+
+        # no key: a changed row is a new hash (inserted) and its old hash is deleted
+        save_to_db(first, conn, "employee_hashed", mode="sync")
+        hashed, hashed_time = timed(
+            lambda: save_to_db(second, conn, "employee_hashed", mode="sync")
+        )
+        assert hashed == {"inserted": n_changed, "updated": 0, "deleted": n_changed,
+                          "unchanged": n_rows - n_changed}, hashed
+
+        expected = stored(conn, "employee_full")
+        pd.testing.assert_frame_equal(stored(conn, "employee_keyed"), expected, check_dtype=False)
+        pd.testing.assert_frame_equal(stored(conn, "employee_hashed"), expected, check_dtype=False)
+        conn.close()
+
+    print(f"[RESULT] rows: {n_rows}, changed: {n_changed}")
+    print(f"[RESULT] full reload   : {full_time:.3f}s")
+    print(f"[RESULT] sync on key   : {keyed_time:.3f}s ({full_time / keyed_time:.1f}x)")
+    print(f"[RESULT] sync on hash  : {hashed_time:.3f}s ({full_time / hashed_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--changed", type=int, default=1_000)
+    args = parser.parse_args()
+
+    run(args.rows, args.changed)
@@ -0,0 +1,98 @@
+"""
+File: bench_json_flatten.py
+Author: Khyati Sharma
+
+Purpose:
+--------
+Benchmark: the current nested-JSON path (`pd.read_json` + `to_dict` +
+`pd.json_normalize`) vs. the schema-driven `json_handling.flatten_json`,
+on synthetic nested recipe records (JSON Lines).
+
+Reports wall time, throughput (records/s, MB/s) and peak traced memory
+(tracemalloc) for each path.
+
+Usage:
+    python benchmarks/bench_json_flatten.py --rows 200000
+"""
+
+import sys
+import os
+
+# ========== PATH SETUP (MUST COME FIRST) ==========
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import json
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from Data_processing.json_handling import flatten_json
+
+CUISINES = ["greek", "southern_us", "filipino", "indian", "jamaican", "spanish", "italian", "mexican"]
+INGREDIENTS = ["salt", "olive oil", "garlic", "onions", "water", "sugar", "butter", "eggs",
+               "tomatoes", "black pepper", "flour", "milk", "ginger", "cumin", "lime"]
+
+
+def build_json(path: str, n_rows: int) -> None:
+    rng = np.random.default_rng(0)
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(n_rows):
+            k = int(rng.integers(1, 12))
+            record = {
+                "id": i,
+                "cuisine": CUISINES[i % len(CUISINES)],
+                "ingredients": [INGREDIENTS[j] for j in rng.integers(0, len(INGREDIENTS), k)],
+                "meta": {
+                    "rating": round(float(rng.random()) * 5, 2),
+                    "author": {"name": f"user_{i % 997}", "verified": bool(i % 3)},
+                },
+            }
+            f.write(json.dumps(record) + "\n")
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def current_path(path: str) -> pd.DataFrame:
+    df = pd.read_json(path, lines=True)
+    return pd.json_normalize(df.to_dict("records"))
+
+
+def report(name: str, rows: int, size_mb: float, seconds: float, peak: int) -> None:
+    print(f"[RESULT] {name:<22}: {seconds:7.3f}s  {rows / seconds:>10,.0f} rec/s  "
+          f"{size_mb / seconds:6.1f} MB/s  peak {peak / 1e6:8.1f} MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "recipes.json")
+        build_json(path, args.rows)
+        size_mb = os.path.getsize(path) / 1e6
+        print(f"[INFO] {args.rows} records, {size_mb:.1f} MB")
+
+        ref, ref_time, ref_peak = measure(lambda: current_path(path))
+        flat, flat_time, flat_peak = measure(lambda: flatten_json(path))
+
+        # same flat columns; list lengths match row for row
+        assert set(ref.columns) == set(flat.schema)
+        assert (flat.lists["ingredients"].lengths() == ref["ingredients"].str.len().to_numpy()).all()
+
+        report("read_json+normalize", args.rows, size_mb, ref_time, ref_peak)
+        report("flatten_json", args.rows, size_mb, flat_time, flat_peak)
+        print(f"[RESULT] speedup: {ref_time / flat_time:.1f}x, "
+              f"peak memory: {ref_peak / flat_peak:.1f}x lower")
@@ -0,0 +1,82 @@
+"""
+File: bench_parallel_parsing.py
+Author: Khyati Sharma
+
+Purpose:
+--------
+Benchmark of the parallel HTML parsing stage: pages/sec of
+`iter_parsed_pages` for an increasing number of parser processes,
+measured on locally saved HTML fixtures (no network).
+
+If `--fixtures` is not given, synthetic AmbitionBox-like pages are
+written to a temporary directory first.
+
+Usage:
+    python benchmarks/bench_parallel_parsing.py --pages 200 --workers 1 2 4 8
+    python benchmarks/bench_parallel_parsing.py --fixtures path/to/html_dir
+"""
+
+import sys
+import os
+
+# ========== PATH SETUP (MUST COME FIRST) ==========
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import glob
+import tempfile
+import time
+
+from Data_processing.web_scraping_pipeline import iter_parsed_pages
+from benchmarks.stub_server import make_company_page
+
+
+def write_fixtures(folder: str, n_pages: int) -> None:
+    for page in range(1, n_pages + 1):
+        with open(os.path.join(folder, f"page_{page:05d}.html"), "w", encoding="utf-8") as f:
+            f.write(make_company_page(page))
+
+
+def load_fixtures(folder: str) -> list:
+    pages = []
+    for page, path in enumerate(sorted(glob.glob(os.path.join(folder, "*.html"))), 1):
+        with open(path, "rb") as f:
+            pages.append((page, f.read()))
+    return pages
+
+
+def run(pages: list, worker_counts: list) -> None:
+    baseline = None
+    reference = None
+
+    for workers in worker_counts:
+        start = time.perf_counter()
+        parsed = list(iter_parsed_pages(pages, workers))
+        elapsed = time.perf_counter() - start
+
+        if reference is None:
+            reference = parsed
+        else:
+            assert repr(parsed) == repr(reference), "parallel output differs"
+
+        rate = len(pages) / elapsed
+        baseline = baseline or rate
+        print(f"[RESULT] workers={workers:2d}: {rate:7.1f} pages/s ({rate / baseline:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--fixtures", help="directory of saved *.html pages")
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    if args.fixtures:
+        html_pages = load_fixtures(args.fixtures)
+    else:
+        with tempfile.TemporaryDirectory() as folder:
+            write_fixtures(folder, args.pages)
+            html_pages = load_fixtures(folder)
+
+    print(f"[INFO] {len(html_pages)} fixture pages")
+    run(html_pages, args.workers)
@@ -0,0 +1,93 @@
+"""
+File: bench_typed_filters.py
+Author: Khyati Sharma
+
+Purpose:
+--------
+Micro-benchmark: `fetch_filtered(conn, "salary > 50000")` latency on an
+all-TEXT table (old `save_to_db`) vs. a typed table with an index on
+`salary` (`save_to_db(..., typed=True, indexes=["salary"])`).
+
+Runs against on-disk SQLite databases, so no MySQL server is needed.
+The TEXT table also shows the correctness problem: "salary > 50000"
+compares strings there, so the row counts differ.
+
+Usage:
+    python benchmarks/bench_typed_filters.py --rows 500000
+"""
+
+import sys
+import os
+
+# ========== PATH SETUP (MUST COME FIRST) ==========
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import sqlite3
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from Data_processing.sql_handling import fetch_filtered, infer_schema, save_to_db
+
+
+def make_frame(n_rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "id": np.arange(n_rows),
+        "name": [f"employee_{i}" for i in range(n_rows)],
+        "department": rng.choice(["HR", "IT", "Sales", "Ops"], n_rows),
+        # mostly low salaries, so the filter is selective
+        "salary": rng.exponential(15000, n_rows).round(2),
+        "joined": pd.Timestamp("2015-01-01")
+        + pd.to_timedelta(rng.integers(0, 3650, n_rows), unit="D"),
+    })
+
+
+def build_db(path: str, df: pd.DataFrame, typed: bool) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    save_to_db(df, conn, "employee", typed=typed, indexes=["salary"] if typed else None)
+    return conn
+
+
+def best_of(conn: sqlite3.Connection, condition: str, repeat: int) -> tuple:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fetch_filtered(conn, condition, use_cache=False)
+        best = min(best, time.perf_counter() - start)
+    return best, len(result)
+
+
+def run(n_rows: int, repeat: int) -> None:
+    df = make_frame(n_rows)
+    condition = "salary > 50000"
+    expected = int((df["salary"] > 50000).sum())
+
+    print(f"[INFO] Inferred schema: {infer_schema(df)}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        text_conn = build_db(os.path.join(tmp, "text.db"), df, typed=False)
+        typed_conn = build_db(os.path.join(tmp, "typed.db"), df, typed=True)
+
+        text_time, text_rows = best_of(text_conn, condition, repeat)
+        typed_time, typed_rows = best_of(typed_conn, condition, repeat)
+
+        text_conn.close()
+        typed_conn.close()
+
+    print(f"[RESULT] rows: {n_rows}, expected matches: {expected}")
+    print(f"[RESULT] TEXT table : {text_time * 1000:.1f} ms ({text_rows} rows returned)")
+    print(f"[RESULT] typed table: {typed_time * 1000:.1f} ms ({typed_rows} rows returned)")
+    print(f"[RESULT] speedup: {text_time / typed_time:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    run(args.rows, args.repeat)
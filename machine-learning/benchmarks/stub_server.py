@@ -0,0 +1,126 @@
+"""
+File: stub_server.py
+Author: Khyati Sharma
+
+Purpose:
+--------
+Local stub HTTP server used to exercise the collection pipelines without
+touching the real APIs / websites.
+
+It serves TMDB-style JSON pages at any path (`?page=N` selects the page)
+and adds a configurable artificial latency, so network-bound behaviour
+can be reproduced on localhost.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def make_movie_page(page: int, per_page: int = 20) -> dict:
+    """Builds a deterministic TMDB-like payload for `page`."""
+    results = []
+    for i in range(per_page):
+        movie_id = (page - 1) * per_page + i + 1
+        results.append({
+            "id": movie_id,
+            "title": f"Movie {movie_id}",
+            "overview": f"Overview of movie {movie_id}",
+            "release_date": f"20{movie_id % 25:02d}-01-01",
+            "popularity": movie_id * 1.5,
+            "vote_average": (movie_id % 100) / 10,
+            "vote_count": movie_id * 3,
+        })
+    return {"page": page, "results": results}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Request handler serving `make_movie_page` payloads after a delay."""
+
+    latency = 0.05
+    per_page = 20
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        page = int(query.get("page", ["1"])[0])
+
+        time.sleep(self.latency)
+
+        body = json.dumps(make_movie_page(page, self.per_page)).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # keep benchmark output readable
+        pass
+
+
+def start_stub_server(handler=StubHandler, latency: float = 0.05):
+    """
+    Starts a threaded stub server on a free localhost port.
+
+    Parameters
+    ----------
+    handler : type
+        Request handler class to serve with
+    latency : float
+        Artificial per-request latency in seconds
+
+    Returns
+    -------
+    tuple
+        (server, base_url); call `server.shutdown()` when done
+    """
+    handler = type("ConfiguredStubHandler", (handler,), {"latency": latency})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    host, port = server.server_address
+    return server, f"http://{host}:{port}/3/movie/top_rated"
+
+
+COMPANY_CITIES = ["Bengaluru", "Zürich", "São Paulo", "Kraków", "मुंबई"]
+
+
+def make_company_page(page: int, n_cards: int = 30) -> str:
+    """
+    Builds an AmbitionBox-like listing page with `n_cards` company cards.
+
+    Some city names are non-ASCII and the page has no <meta charset>, so
+    the page's bytes only parse correctly when decoded before parsing.
+    """
+    cards = []
+    for i in range(n_cards):
+        company_id = (page - 1) * n_cards + i + 1
+        # every 7th card misses its rating to exercise the NaN paths
+        rating = "" if company_id % 7 == 0 else (
+            f'<p class="rating"> {3 + company_id % 20 / 10:.1f} </p>'
+        )
+        cards.append(f"""
+        <div class="company-content-wrapper">
+          <div class="company-header">
+            <h2> Company {company_id} <span>Pvt Ltd</span></h2>
+            {rating}
+            <a class="review-count" href="/reviews/{company_id}"> {company_id * 13} Reviews </a>
+          </div>
+          <div class="company-info">
+            <p class="infoEntity"> {"Public" if company_id % 2 else "Private"} </p>
+            <p class="infoEntity"> {COMPANY_CITIES[company_id % len(COMPANY_CITIES)]} {company_id % 50} </p>
+            <p class="infoEntity"> {company_id % 60 + 1} yrs old </p>
+            <p class="infoEntity"> {company_id * 100}+ Employees </p>
+          </div>
+        </div>""")
+
+    return (
+        "<!DOCTYPE html><html><head><title>Companies</title></head><body>"
+        '<div class="companies-list">' + "".join(cards) + "</div>"
+        "</body></html>"
+    )
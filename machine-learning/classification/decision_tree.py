@@ -10,20 +10,19 @@ import os
 # ========== PATH SETUP (MUST COME FIRST) ==========
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-import pandas as pd
-
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report, confusion_matrix
 from sklearn.tree import DecisionTreeClassifier
 
 from Data_processing.preprocessing import encode_extracurricular
+from Data_processing.dataset_cache import read_csv_cached
 
 # ========== PATH ==========
 BASE_DIR = os.path.dirname(__file__)
 DATA_PATH = os.path.join(BASE_DIR, "..", "Datasets", "StudentPerformance.csv")
 
 # ========== LOAD DATA ==========
-df = pd.read_csv(DATA_PATH)
+df = read_csv_cached(DATA_PATH)
 
 # ========== CREATE CLASS LABEL ==========
 def categorize_performance(score):
@@ -16,11 +16,17 @@ Datasets Used:
 - Flights (seaborn)
 """
 
+import sys
 import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 
+from Data_processing.dataset_cache import read_csv_cached
+
 sns.set(style="whitegrid")
 
 # ============================================================
@@ -29,8 +35,8 @@ sns.set(style="whitegrid")
 
 # Titanic (local dataset)
 BASE_DIR = os.path.dirname(__file__)
-TITANIC_PATH = os.path.join(BASE_DIR, "..", "datasets", "train.csv")
-titanic = pd.read_csv(TITANIC_PATH)
+TITANIC_PATH = os.path.join(BASE_DIR, "..", "..", "Datasets", "train.csv")
+titanic = read_csv_cached(TITANIC_PATH)
 
 # Seaborn datasets
 tips = sns.load_dataset("tips")
@@ -10,14 +10,18 @@ Dataset: Titanic (train.csv)
 Target Variable: Survived
 """
 
+import sys
 import os
-import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from Data_processing.dataset_cache import read_csv_cached
 
 # ========== LOAD DATA ==========
 BASE_DIR = os.path.dirname(__file__)
-DATA_PATH = os.path.join(BASE_DIR, "..", "datasets", "train.csv")
+DATA_PATH = os.path.join(BASE_DIR, "..", "..", "Datasets", "train.csv")
 
-df = pd.read_csv(DATA_PATH)
+df = read_csv_cached(DATA_PATH)
 
 # ============================================================
 # QUESTION 1: How big is the dataset?
@@ -10,16 +10,21 @@ Dataset: Titanic (train.csv)
 Target Variable: Survived
 """
 
+import sys
 import os
-import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+from Data_processing.dataset_cache import read_csv_cached
+
 # ========== LOAD DATA (PORTABLE PATH) ==========
 BASE_DIR = os.path.dirname(__file__)
-DATA_PATH = os.path.join(BASE_DIR, "..", "datasets", "train.csv")
+DATA_PATH = os.path.join(BASE_DIR, "..", "..", "Datasets", "train.csv")
 
-df = pd.read_csv(DATA_PATH)
+df = read_csv_cached(DATA_PATH)
 
 # ============================================================
 # UNIVARIATE ANALYSIS – CATEGORICAL VARIABLES
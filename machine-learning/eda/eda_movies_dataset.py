@@ -7,6 +7,8 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+# not on read_csv_cached: expects an IMDB-style CSV (title_year, budget,
+# gross, ...) that is not in Datasets/ (only the headerless movie_titles_metadata.tsv)
 df = pd.read_csv("datasets/movie_titles_metadata.csv")
 
 # Overview
@@ -4,10 +4,15 @@ Author: Khyati Sharma
 Purpose: Understand the dataset and save visual insights
 """
 
-import pandas as pd
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
 import matplotlib.pyplot as plt
 import seaborn as sns
-import os
+
+from Data_processing.dataset_cache import read_csv_cached
 
 # ========== PATH SETUP ==========
 BASE_DIR = os.path.dirname(__file__)
@@ -17,7 +22,7 @@ VISUALS_PATH = os.path.join(BASE_DIR, "visuals")
 os.makedirs(VISUALS_PATH, exist_ok=True)
 
 # ========== LOAD DATA ==========
-df = pd.read_csv(DATA_PATH)
+df = read_csv_cached(DATA_PATH)
 
 print("Dataset Loaded Successfully")
 print(df.head())
@@ -4,13 +4,19 @@ Author: Khyati Sharma
 Purpose: Perform structured exploratory data analysis on any dataset
 """
 
-import pandas as pd
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+from Data_processing.dataset_cache import read_csv_cached
+
 
 def load_data(path):
-    return pd.read_csv(path)
+    return read_csv_cached(path)
 
 
 def basic_overview(df):
@@ -2,11 +2,22 @@
 Feature Engineering: Encoding Utilities
 Author: Khyati Sharma
 Purpose: Encode categorical features for ML models
+
+EncoderRegistry fits category -> code mappings once, saves them to a
+compact .npz file (category types and column names preserved) and applies them to new data (e.g. at serving time)
+with a vectorized hash lookup. Unseen or missing values get the
+reserved code UNSEEN_CODE.
 """
 
+import json
+
+import numpy as np
 import pandas as pd
 
 
+UNSEEN_CODE = -1    # unseen / missing categories (same as pandas cat.codes)
+
+
 def binary_encode(df, column, mapping=None):
     """
     Encode binary categorical column (e.g., Yes/No).
@@ -26,3 +37,281 @@ def binary_encode(df, column, mapping=None):
 
     df[column] = df[column].map(mapping)
     return df
+
+
+def smallest_code_dtype(n_categories):
+    """
+    Smallest signed integer dtype holding codes 0..n-1 and UNSEEN_CODE.
+
+    Args:
+        n_categories (int)
+
+    Returns:
+        numpy dtype (int8 / int16 / int32 / int64)
+    """
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories - 1 <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+class CategoryEncoder:
+    """
+    Fixed category -> code mapping for one column.
+
+    Codes are 0..n-1 in sorted category order; anything else (unseen
+    values, missing values) maps to UNSEEN_CODE.
+
+    Args:
+        categories (array-like): Known categories
+    """
+
+    def __init__(self, categories):
+        self.categories = pd.Index(categories)
+        if isinstance(self.categories, pd.CategoricalIndex):
+            self.categories = pd.Index(self.categories.to_numpy())
+        if not self.categories.is_unique:
+            raise ValueError("Categories must be unique")
+        self.dtype = smallest_code_dtype(len(self.categories))
+
+    @classmethod
+    def fit(cls, values):
+        """
+        Learn the categories of a column.
+
+        Args:
+            values (Series or array)
+
+        Returns:
+            CategoryEncoder
+        """
+        uniques = pd.unique(pd.Series(values).dropna())
+        try:
+            uniques = np.sort(uniques)
+        except TypeError:   # mixed types: keep order of appearance
+            pass
+        return cls(uniques)
+
+    def transform(self, values):
+        """
+        Encode values with one vectorized hash-table lookup.
+
+        Args:
+            values (Series or array)
+
+        Returns:
+            numpy array of codes (self.dtype)
+        """
+        return self.categories.get_indexer(values).astype(self.dtype, copy=False)
+
+    def inverse_transform(self, codes):
+        """
+        Decode codes back to categories (UNSEEN_CODE -> None).
+
+        Args:
+            codes (array)
+
+        Returns:
+            numpy object array
+        """
+        codes = np.asarray(codes)
+        categories = np.append(self.categories.to_numpy(dtype=object), None)
+        return categories[np.where(codes == UNSEEN_CODE, len(self.categories), codes)]
+
+    def mapping(self):
+        """code -> category dict (the format encode_categorical used to return)"""
+        return dict(enumerate(self.categories))
+
+
+class EncoderRegistry:
+    """
+    Named CategoryEncoders, fitted once and reused.
+
+    Persisted with save() / load() as an .npz file: numpy numeric / bool
+    categories as typed arrays, datetimes as int64 nanoseconds, anything
+    else (str / int / float / bool / None in object or extension arrays,
+    also mixed) as one UTF-8 blob + offsets + type codes per column (no
+    pickle).
+    """
+
+    def __init__(self):
+        self.encoders = {}
+
+    def __contains__(self, column):
+        return column in self.encoders
+
+    def __getitem__(self, column):
+        return self.encoders[column]
+
+    def fit(self, df, columns=None, refit=False):
+        """
+        Fit encoders for columns that have none yet.
+
+        Args:
+            df (DataFrame)
+            columns (list): Columns to encode (default: object / string /
+                category columns)
+            refit (bool): Re-learn columns that already have an encoder
+
+        Returns:
+            self
+        """
+        if columns is None:
+            columns = df.select_dtypes(include=["object", "string", "category"]).columns
+
+        for col in columns:
+            if refit or col not in self.encoders:
+                self.encoders[col] = CategoryEncoder.fit(df[col])
+        return self
+
+    def transform(self, df, columns=None):
+        """
+        Encode columns with their fitted encoders.
+
+        Args:
+            df (DataFrame)
+            columns (list): Columns to encode (default: all fitted ones
+                present in df)
+
+        Returns:
+            DataFrame (copy)
+        """
+        if columns is None:
+            columns = [col for col in self.encoders if col in df.columns]
+
+        df = df.copy()
+        for col in columns:
+            df[col] = self.encoders[col].transform(df[col])
+        return df
+
+    def fit_transform(self, df, columns=None):
+        return self.fit(df, columns).transform(df, columns)
+
+    def save(self, path):
+        """
+        Write all mappings to a compressed .npz file.
+
+        Every column gets a kind tag so load() restores the original
+        category types: "numeric" (numpy bool / int / float array),
+        "datetime" (int64 nanoseconds + time zone) or "scalar" (UTF-8
+        blob + offsets, with a per-category type code for str / int /
+        float / bool / None).
+
+        Args:
+            path (str)
+
+        Raises:
+            TypeError: for column names that are not str / int / float /
+                bool, or category types other than the ones above
+        """
+        arrays, meta = {}, []
+
+        for i, (col, encoder) in enumerate(self.encoders.items()):
+            if not isinstance(col, (str, int, float, bool)):
+                raise TypeError(f"Cannot save encoder for column name {col!r} ({type(col).__name__})")
+
+            key = f"c{i}"
+            entry = {"column": col, "key": key}
+            entry.update(_save_categories(encoder.categories, key, arrays))
+            meta.append(entry)
+
+        arrays["meta"] = np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8)
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read mappings written by save().
+
+        Args:
+            path (str)
+
+        Returns:
+            EncoderRegistry
+        """
+        registry = cls()
+
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(data["meta"].tobytes().decode("utf-8"))
+
+            for entry in meta:
+                categories = _load_categories(entry, data)
+                registry.encoders[entry["column"]] = CategoryEncoder(categories)
+
+        return registry
+
+
+# Type codes of "scalar" categories in a saved registry (4 = missing)
+_SCALAR_PARSERS = {0: str, 1: int, 2: float, 3: lambda text: text == "True", 4: lambda text: None}
+
+
+def _scalar_code(category):
+    """Type code of a category (numpy scalars count as their Python type)"""
+    if category is None or category is pd.NA:
+        return 4
+    if isinstance(category, str):
+        return 0
+    if isinstance(category, (bool, np.bool_)):
+        return 3
+    if isinstance(category, (int, np.integer)):
+        return 1
+    if isinstance(category, (float, np.floating)):
+        return 2
+    return None
+
+
+def _save_categories(categories, key, arrays):
+    """Stores one column's categories in `arrays`; returns its meta fields"""
+    if isinstance(categories, pd.DatetimeIndex):
+        tz = str(categories.tz) if categories.tz is not None else None
+        naive = categories.tz_convert("UTC").tz_localize(None) if tz else categories
+        arrays[key] = naive.to_numpy(dtype="datetime64[ns]").view(np.int64)
+        return {"kind": "datetime", "tz": tz}
+
+    # numpy bool / int / float only: object or extension arrays would be pickled
+    if isinstance(categories.dtype, np.dtype) and categories.dtype.kind in "biuf":
+        arrays[key] = categories.to_numpy()
+        return {"kind": "numeric"}
+
+    types, encoded = [], []
+    for category in categories:
+        code = _scalar_code(category)
+        if code is None:
+            raise TypeError(
+                f"Cannot save category {category!r} ({type(category).__name__}); "
+                "supported: str, int, float, bool, None, datetime64"
+            )
+        types.append(code)
+        if code == 4:
+            text = ""
+        else:
+            text = category if code == 0 else repr(category.item() if isinstance(category, np.generic) else category)
+        encoded.append(text.encode("utf-8"))
+
+    arrays[key] = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    arrays[f"{key}_offsets"] = np.cumsum([0] + [len(e) for e in encoded], dtype=np.int64)
+    arrays[f"{key}_types"] = np.array(types, dtype=np.uint8)
+    return {"kind": "scalar"}
+
+
+def _load_categories(entry, data):
+    """Inverse of _save_categories"""
+    values = data[entry["key"]]
+
+    if entry["kind"] == "numeric":
+        return values
+
+    if entry["kind"] == "datetime":
+        index = pd.DatetimeIndex(values.view("datetime64[ns]"))
+        return index.tz_localize("UTC").tz_convert(entry["tz"]) if entry["tz"] else index
+
+    blob = values.tobytes()
+    offsets = data[f"{entry['key']}_offsets"]
+    types = data[f"{entry['key']}_types"]
+    return pd.Index(
+        [
+            _SCALAR_PARSERS[int(t)](blob[a:b].decode("utf-8"))
+            for a, b, t in zip(offsets[:-1], offsets[1:], types)
+        ],
+        dtype=object,
+    )
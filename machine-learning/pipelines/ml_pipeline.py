@@ -11,13 +11,19 @@ Steps:
 5. Save model
 """
 
-import pandas as pd
+import sys
+import os
+
+# ========== PATH SETUP (MUST COME FIRST) ==========
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
 import joblib
 
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import accuracy_score, classification_report
 
-from ML_d2.Data_processing.preprocessing import (
+from Data_processing.dataset_cache import read_csv_cached
+from Data_processing.preprocessing import (
     split_data,
     scale_features,
     encode_target,
@@ -31,7 +37,7 @@ def load_data(path):
     """
     Load dataset
     """
-    df = pd.read_csv(path)
+    df = read_csv_cached(path)
     print("Dataset loaded")
     return df
 